@@ -0,0 +1,103 @@
+'''Compare time and memory of a ``List[float]`` param, which argparse converts value by value,
+with an ``array`` param, which is converted in a single pass.
+
+Each measurement runs a CLI in a separate process with ``Cliar.run``, since hundreds
+of thousands of values don't fit into the commandline, and reports the best time of a few
+runs and the peak resident set size of the process. The ``@file`` rows read the same values
+from a text file and from a binary file. Unix only.
+
+Run with: ``python benchmarks/arrays.py``
+'''
+
+import subprocess
+import sys
+from array import array
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+SCRIPT = '''
+import resource
+import sys
+from array import array
+from time import perf_counter
+from typing import List
+
+from cliar import Cliar
+
+
+class Stats(Cliar):
+    def listed(self, values: List[float]):
+        return sum(values)
+
+    def arrayed(self, values: array):
+        return sum(values)
+
+
+if __name__ == '__main__':
+    count, engine, command, source = sys.argv[1:]
+    values = [str(value / 4) for value in range(int(count))] if source == '-' else [source]
+
+    stats = Stats(engine=engine)
+    times = []
+
+    for _ in range(3):
+        start = perf_counter()
+        stats.run([command, *values])
+        times.append(perf_counter() - start)
+
+    print(min(times), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def measure(script: Path, count: int, engine: str, command: str, source: str) -> tuple:
+    '''Return best time in seconds and peak RSS in MB.'''
+
+    result = subprocess.run(
+        [sys.executable, str(script), str(count), engine, command, source],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    time, max_rss = result.stdout.split()
+    max_rss = int(max_rss)
+
+    if sys.platform != 'darwin':
+        max_rss *= 1024
+
+    return float(time), max_rss / 2**20
+
+
+def main():
+    with TemporaryDirectory() as tmp_dir:
+        script = Path(tmp_dir)/'stats.py'
+        script.write_text(SCRIPT)
+
+        print(f'{"values":>8} {"engine":>9} {"param":>16} {"time, ms":>10} {"peak RSS, MB":>14}')
+
+        for count in (10**4, 10**5, 5 * 10**5):
+            text_path = Path(tmp_dir)/f'values_{count}.txt'
+            text_path.write_text(' '.join(str(value / 4) for value in range(count)))
+
+            binary_path = Path(tmp_dir)/f'values_{count}.bin'
+
+            with binary_path.open('wb') as binary:
+                array('d', (value / 4 for value in range(count))).tofile(binary)
+
+            for engine in ('argparse', 'fast'):
+                for label, command, source in (
+                        ('List[float]', 'listed', '-'),
+                        ('array', 'arrayed', '-'),
+                        ('array @file.txt', 'arrayed', f'@{text_path}'),
+                        ('array @file.bin', 'arrayed', f'@{binary_path}'),
+                    ):
+                    time, max_rss = measure(script, count, engine, command, source)
+
+                    print(
+                        f'{count:>8} {engine:>9} {label:>16} {time * 1000:>10.1f} {max_rss:>14.1f}'
+                    )
+
+
+if __name__ == '__main__':
+    main()
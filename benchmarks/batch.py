@@ -0,0 +1,93 @@
+'''Measure the throughput of batch mode in calls per second.
+
+Separate processes started from a shell loop are compared with batch mode
+for commandline and JSON calls and for different numbers of worker threads.
+
+Run with: ``python benchmarks/batch.py``
+'''
+
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_cli  # pylint: disable=wrong-import-position
+
+
+CALLS = 20000
+PROCESS_CALLS = 20
+
+SCRIPT = '''
+import sys
+
+sys.path.insert(0, {benchmarks_dir!r})
+
+from synthetic import make_cli
+
+make_cli(50, args=4)().parse()
+'''
+
+
+def measure_processes() -> float:
+    '''Return calls per second for one process per call.'''
+
+    with TemporaryDirectory() as tmp_dir:
+        script = Path(tmp_dir)/'synthetic_cli.py'
+        script.write_text(SCRIPT.format(benchmarks_dir=str(Path(__file__).parent)))
+
+        start = perf_counter()
+
+        for index in range(PROCESS_CALLS):
+            subprocess.run(
+                [sys.executable, str(script), 'command-7', str(index), '--opt-2', '5'],
+                stdout=subprocess.DEVNULL,
+                check=True
+            )
+
+        return PROCESS_CALLS / (perf_counter() - start)
+
+
+def measure_batch(lines, workers: int) -> float:
+    '''Return calls per second for a batch of calls.'''
+
+    cli = make_cli(50, args=4)()
+
+    start = perf_counter()
+    cli.batch(lines, workers)
+
+    return len(lines) / (perf_counter() - start)
+
+
+def main():
+    args_lines = [f'command-7 {index} --opt-2 5' for index in range(CALLS)]
+    json_lines = [
+        f'{{"command": "command-7", "args": {{"arg_0": {index}, "opt_2": 5}}}}'
+        for index in range(CALLS)
+    ]
+
+    results = [('process per call', measure_processes())]
+
+    stdout = sys.stdout
+
+    try:
+        sys.stdout = StringIO()
+
+        for workers in (1, 4):
+            results.append((f'batch, args, {workers} workers', measure_batch(args_lines, workers)))
+            results.append((f'batch, JSON, {workers} workers', measure_batch(json_lines, workers)))
+
+    finally:
+        sys.stdout = stdout
+
+    print(f'{"mode":>30} {"calls/s":>12}')
+
+    for mode, rate in results:
+        print(f'{mode:>30} {rate:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+'''Compare the latency of cold process starts and calls to a warm server.
+
+The served CLI simulates a heavy import that takes ``IMPORT_DELAY`` seconds.
+
+Run with: ``python benchmarks/daemon.py``
+'''
+
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from textwrap import dedent
+from time import monotonic, sleep
+from timeit import repeat
+
+
+IMPORT_DELAY = 0.2
+
+SCRIPT = dedent(f'''
+    import sys
+    from time import sleep
+
+    sleep({IMPORT_DELAY})
+
+    from cliar import Cliar
+
+
+    class Heavy(Cliar):
+        def add(self, x: int, y: int):
+            print(x + y)
+
+
+    if __name__ == '__main__':
+        if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+            Heavy().serve(sys.argv[2], idle_timeout=None)
+
+        else:
+            Heavy().parse()
+''')
+
+
+def measure(command) -> float:
+    '''Return the best time of running a command, in ms.'''
+
+    return min(
+        repeat(lambda: subprocess.run(command, stdout=subprocess.DEVNULL), number=1, repeat=10)
+    ) * 1000
+
+
+def main():
+    with TemporaryDirectory() as tmp_dir:
+        script = Path(tmp_dir)/'heavy.py'
+        script.write_text(SCRIPT)
+        socket_path = Path(tmp_dir)/'heavy.sock'
+
+        server = subprocess.Popen([sys.executable, str(script), '--serve', str(socket_path)])
+
+        try:
+            deadline = monotonic() + 10
+
+            while not socket_path.exists() and monotonic() < deadline:
+                sleep(0.05)
+
+            cold = measure([sys.executable, str(script), 'add', '1', '2'])
+            warm = measure([sys.executable, '-m', 'cliar.client', str(socket_path), 'add', '1', '2'])
+
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f'{"cold, ms":>12} {"warm, ms":>12}')
+    print(f'{cold:>12.2f} {warm:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
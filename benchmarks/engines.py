@@ -0,0 +1,54 @@
+'''Compare parse time of the argparse and fast engines.
+
+Two workloads are measured: a command with many options, and a command with a list arg
+of many values.
+
+Run with: ``python benchmarks/engines.py``
+'''
+
+import sys
+from pathlib import Path
+from timeit import repeat
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_cli  # pylint: disable=wrong-import-position
+
+from cliar import Cliar  # pylint: disable=wrong-import-position
+from cliar.engine import parse_args  # pylint: disable=wrong-import-position
+
+
+class Numbers(Cliar):
+    def summ(self, numbers: List[int]):
+        return sum(numbers)
+
+
+def measure(cli: Cliar, args: List[str]) -> tuple:
+    '''Return the best parse time in ms for argparse and for the fast engine.'''
+
+    argparse_time = min(repeat(lambda: cli._parser.parse_args(args), number=10, repeat=5)) / 10
+    fast_time = min(repeat(lambda: parse_args(cli, args), number=10, repeat=5)) / 10
+
+    return argparse_time * 1000, fast_time * 1000
+
+
+def main():
+    print(f'{"workload":>30} {"argparse, ms":>14} {"fast, ms":>10}')
+
+    options_cli = make_cli(1, args=60)()
+    options_args = ['command-0', '1', *(f'--opt-{index}={index}' for index in range(1, 60))]
+
+    argparse_time, fast_time = measure(options_cli, options_args)
+
+    print(f'{"60 options":>30} {argparse_time:>14.3f} {fast_time:>10.3f}')
+
+    for count in (1000, 100000):
+        numbers_args = ['summ', *map(str, range(count))]
+        argparse_time, fast_time = measure(Numbers(), numbers_args)
+
+        print(f'{f"list arg, {count} values":>30} {argparse_time:>14.3f} {fast_time:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+'''Compare memory and time of a ``MappedFile`` param with reading the whole file
+with ``read()``.
+
+Each measurement runs a CLI in a separate process that counts lines with a pattern
+in a log file and reports the anonymous resident memory of the process while the file
+contents are still in use. Pages of a mapped file are backed by the file, so the OS can drop
+them under memory pressure, and they're not counted as anonymous memory. Linux only.
+
+Run with: ``python benchmarks/files.py``
+'''
+
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+SCRIPT = '''
+from cliar import Cliar, MappedFile
+
+
+class Logs(Cliar):
+    def mapped(self, log: MappedFile):
+        count, position = 0, log.find(b'ERROR')
+
+        while position != -1:
+            count += 1
+            position = log.find(b'ERROR', position + 1)
+
+        print(count, rss_anon())
+
+    def eager(self, log: str):
+        with open(log, 'rb') as file:
+            data = file.read()
+
+        print(data.count(b'ERROR'), rss_anon())
+
+
+def rss_anon() -> int:
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('RssAnon:'):
+                return int(line.split()[1])
+
+
+if __name__ == '__main__':
+    Logs().parse()
+'''
+
+
+def measure(script: Path, args: list) -> tuple:
+    '''Return anonymous RSS in MB and time in seconds.'''
+
+    start = perf_counter()
+
+    result = subprocess.run(
+        [sys.executable, str(script), *args],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    rss_anon = int(result.stdout.split()[-1])
+
+    return rss_anon / 2**10, perf_counter() - start
+
+
+def main():
+    with TemporaryDirectory() as tmp_dir:
+        script = Path(tmp_dir)/'logs.py'
+        script.write_text(SCRIPT)
+
+        print(f'{"lines":>10} {"mode":>8} {"anon RSS, MB":>14} {"time, s":>9}')
+
+        for count in (10**5, 10**6, 10**7):
+            log_path = Path(tmp_dir)/f'log_{count}.txt'
+
+            with log_path.open('w') as log:
+                log.writelines(
+                    f'{"ERROR" if index % 100 == 0 else "INFO"} request {index}\n'
+                    for index in range(count)
+                )
+
+            for mode in ('mapped', 'eager'):
+                rss_anon, elapsed = measure(script, [mode, str(log_path)])
+
+                print(f'{count:>10} {mode:>8} {rss_anon:>14.1f} {elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+'''Compare rendering top-level help with argparse and serving it from the spec.
+
+Each measurement builds a lazy CLI and prints ``-h`` of the root command, which lists all
+commands. The first call renders the help with argparse and stores it in the spec, the following
+calls print the stored text without building the command parsers.
+
+Run with: ``python benchmarks/help.py``
+'''
+
+import io
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_cli  # pylint: disable=wrong-import-position
+
+
+def print_help(cli_class):
+    '''Print the root help, ignoring the exit.'''
+
+    sys.argv = ['synthetic', '-h']
+
+    with redirect_stdout(io.StringIO()):
+        try:
+            cli_class(lazy=True).parse()
+
+        except SystemExit:
+            pass
+
+
+def measure(commands: int, stored: bool) -> float:
+    '''Return the best time of printing the root help, in ms.'''
+
+    times = []
+
+    for _ in range(5):
+        cli_class = make_cli(commands, args=4)
+
+        if stored:
+            print_help(cli_class)
+
+        start = perf_counter()
+        print_help(cli_class)
+        times.append(perf_counter() - start)
+
+    return min(times) * 1000
+
+
+def main():
+    print(f'{"commands":>10} {"rendered, ms":>14} {"stored, ms":>12}')
+
+    for commands in (10, 100, 400, 1000):
+        print(
+            f'{commands:>10} '
+            f'{measure(commands, stored=False):>14.2f} '
+            f'{measure(commands, stored=True):>12.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
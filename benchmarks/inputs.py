@@ -0,0 +1,85 @@
+'''Compare peak memory and time of a lazy ``Iterator[int]`` input param with reading
+all of stdin at once.
+
+Each measurement runs a CLI in a separate process that sums IDs from a file passed
+to stdin and reports the peak resident set size of the process. Unix only.
+
+Run with: ``python benchmarks/inputs.py``
+'''
+
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+SCRIPT = '''
+import resource
+import sys
+from typing import Iterator
+
+from cliar import Cliar
+
+
+class Ids(Cliar):
+    def lazy(self, ids: Iterator[int]):
+        print(sum(ids))
+
+    def eager(self):
+        print(sum(map(int, sys.stdin.read().split())))
+
+
+if __name__ == '__main__':
+    try:
+        Ids().parse()
+
+    finally:
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)
+'''
+
+
+def measure(script: Path, ids_path: Path, args: list) -> tuple:
+    '''Return peak RSS in MB and time in seconds.'''
+
+    start = perf_counter()
+
+    with ids_path.open('rb') as ids:
+        result = subprocess.run(
+            [sys.executable, str(script), *args],
+            stdin=ids,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True
+        )
+
+    max_rss = int(result.stderr.split()[-1])
+
+    if sys.platform != 'darwin':
+        max_rss *= 1024
+
+    return max_rss / 2**20, perf_counter() - start
+
+
+def main():
+    with TemporaryDirectory() as tmp_dir:
+        script = Path(tmp_dir)/'ids.py'
+        script.write_text(SCRIPT)
+
+        print(f'{"ids":>10} {"mode":>8} {"peak RSS, MB":>14} {"time, s":>9}')
+
+        for count in (10**5, 10**6, 10**7):
+            ids_path = Path(tmp_dir)/f'ids_{count}.txt'
+
+            with ids_path.open('w') as ids:
+                ids.writelines(f'{index}\n' for index in range(count))
+
+            for mode, args in (('lazy', ['lazy', '-']), ('eager', ['eager'])):
+                max_rss, elapsed = measure(script, ids_path, args)
+
+                print(f'{count:>10} {mode:>8} {max_rss:>14.1f} {elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+'''Compare eager and lazy parser construction for CLIs of growing size.
+
+Each measurement builds a CLI and parses a call to a single command at the deepest level.
+
+Run with: ``python benchmarks/lazy_startup.py``
+'''
+
+import sys
+from pathlib import Path
+from timeit import repeat
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_cli  # pylint: disable=wrong-import-position
+
+
+def measure(cli_class, depth: int, lazy: bool) -> float:
+    '''Return the best time of building ``cli_class`` and parsing one command, in ms.'''
+
+    sys.argv = ['synthetic', *['sub'] * (depth - 1), 'command-0', '42']
+
+    return min(repeat(lambda: cli_class(lazy=lazy).parse(), number=1, repeat=5)) * 1000
+
+
+def main():
+    depth = 5
+
+    print(f'{"commands":>10} {"eager, ms":>12} {"lazy, ms":>12}')
+
+    for commands in (10, 50, 100, 400):
+        cli_class = make_cli(commands, args=4, depth=depth)
+
+        print(
+            f'{commands*depth:>10} '
+            f'{measure(cli_class, depth, lazy=False):>12.2f} '
+            f'{measure(cli_class, depth, lazy=True):>12.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
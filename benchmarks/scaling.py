@@ -0,0 +1,76 @@
+'''Measure how the command model scales with the number of commands.
+
+For each CLI size, the benchmark reports:
+
+-   time to inspect all handlers of a fresh CLI class
+-   memory taken by the inspected commands
+-   time to create another instance of the same class, which reuses the memoized spec
+-   time to build the parsers for all commands in the eager mode
+
+Run with: ``python benchmarks/scaling.py``
+'''
+
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from timeit import repeat
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_cli  # pylint: disable=wrong-import-position
+
+
+def inspect_all(cli_class: type):
+    '''Create a lazy CLI and inspect all its handlers.'''
+
+    cli = cli_class(lazy=True)
+
+    for handler_name in cli._spec.handler_names.values():
+        cli._get_command(handler_name)
+
+
+def measure(commands: int) -> tuple:
+    '''Return spec build time in ms, spec memory in MB, memoized instantiation time in ms,
+    and eager construction time in ms for a CLI with ``commands`` commands.
+    '''
+
+    cli_class = make_cli(commands, args=4)
+
+    start = perf_counter()
+    inspect_all(cli_class)
+    spec_time = perf_counter() - start
+
+    another_cli_class = make_cli(commands, args=4)
+
+    tracemalloc.start()
+    inspect_all(another_cli_class)
+    spec_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    memoized_time = min(repeat(lambda: cli_class(lazy=True), number=1, repeat=5))
+
+    start = perf_counter()
+    cli_class()
+    eager_time = perf_counter() - start
+
+    return spec_time * 1000, spec_memory / 2**20, memoized_time * 1000, eager_time * 1000
+
+
+def main():
+    print(
+        f'{"commands":>10} {"spec, ms":>12} {"spec, MB":>12} '
+        f'{"memoized, ms":>14} {"eager, ms":>12}'
+    )
+
+    for commands in (100, 1000, 10000):
+        spec_time, spec_memory, memoized_time, eager_time = measure(commands)
+
+        print(
+            f'{commands:>10} {spec_time:>12.2f} {spec_memory:>12.2f} '
+            f'{memoized_time:>14.2f} {eager_time:>12.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
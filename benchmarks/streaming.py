@@ -0,0 +1,79 @@
+'''Compare peak memory and time of streaming records from a generator handler
+with printing a materialized list.
+
+Each measurement runs a CLI in a separate process with stdout redirected to devnull
+and reports the peak resident set size of the process. Unix only.
+
+Run with: ``python benchmarks/streaming.py``
+'''
+
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+SCRIPT = '''
+import resource
+import sys
+
+from cliar import Cliar
+
+
+class Rows(Cliar):
+    def stream(self, count: int):
+        for index in range(count):
+            yield f'row {index}'
+
+    def materialize(self, count: int):
+        rows = [f'row {index}' for index in range(count)]
+        print('\\n'.join(rows))
+
+
+if __name__ == '__main__':
+    try:
+        Rows().parse()
+
+    finally:
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)
+'''
+
+
+def measure(script: Path, command: str, count: int) -> tuple:
+    '''Return peak RSS in MB and time in seconds.'''
+
+    start = perf_counter()
+
+    result = subprocess.run(
+        [sys.executable, str(script), command, str(count)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    max_rss = int(result.stderr.split()[-1])
+
+    if sys.platform != 'darwin':
+        max_rss *= 1024
+
+    return max_rss / 2**20, perf_counter() - start
+
+
+def main():
+    with TemporaryDirectory() as tmp_dir:
+        script = Path(tmp_dir)/'rows.py'
+        script.write_text(SCRIPT)
+
+        print(f'{"rows":>10} {"mode":>12} {"peak RSS, MB":>14} {"time, s":>9}')
+
+        for count in (10**5, 10**6, 10**7):
+            for command in ('stream', 'materialize'):
+                max_rss, elapsed = measure(script, command, count)
+
+                print(f'{count:>10} {command:>12} {max_rss:>14.1f} {elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
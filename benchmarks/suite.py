@@ -0,0 +1,245 @@
+'''Benchmark suite that tracks how Cliar scales, with baselines and regression checks.
+
+Each case is a synthetic CLI with ``commands`` commands per level, ``args`` params per command,
+``depth`` nesting levels, an optional list arg called with ``list_values`` values, and optional
+async handlers. Every case runs in a fresh process, which reports:
+
+-   ``import_ms``: time to import ``cliar``
+-   ``construct_ms``: time to create the CLI, inspecting the handlers and building all parsers
+-   ``construct_lazy_ms``: the same in the lazy mode
+-   ``parse_ms``: best time of ``parse`` calling a command at the deepest level
+-   ``peak_mb``: peak resident memory of the process, Unix only
+
+Each case runs ``--repeat`` times and the best values are kept.
+
+Run with:
+
+-   ``python benchmarks/suite.py`` to show the results
+-   ``python benchmarks/suite.py --save`` to store them as the baseline; with ``--cases``,
+    only the given cases are updated
+-   ``python benchmarks/suite.py --compare`` to compare them with the baseline; the exit status
+    is 1 if any metric is worse than the baseline by more than ``--threshold``
+
+Baselines depend on the machine, so store and compare them on the same one.
+'''
+
+import json
+import platform
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List
+
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+CASES = {
+    'small': {'commands': 10, 'args': 2, 'depth': 1, 'list_values': 0, 'async': False},
+    'wide': {'commands': 400, 'args': 4, 'depth': 1, 'list_values': 0, 'async': False},
+    'deep': {'commands': 50, 'args': 4, 'depth': 5, 'list_values': 0, 'async': False},
+    'many_args': {'commands': 20, 'args': 30, 'depth': 1, 'list_values': 0, 'async': False},
+    'list': {'commands': 10, 'args': 2, 'depth': 1, 'list_values': 10000, 'async': False},
+    'async': {'commands': 50, 'args': 4, 'depth': 1, 'list_values': 0, 'async': True},
+}
+
+METRICS = ('import_ms', 'construct_ms', 'construct_lazy_ms', 'parse_ms', 'peak_mb')
+
+# Differences below these values are noise and never count as regressions.
+NOISE_FLOORS = {'ms': 1.0, 'mb': 2.0}
+
+
+def run_case(case: Dict) -> Dict[str, float]:
+    '''Measure a case in the current process, which must not have imported ``cliar`` yet.'''
+
+    start = perf_counter()
+    import cliar  # pylint: disable=import-outside-toplevel, unused-import
+    import_time = perf_counter() - start
+
+    sys.path.insert(0, str(Path(__file__).parent))
+
+    from synthetic import make_cli  # pylint: disable=import-outside-toplevel
+
+    def make_case_cli():
+        return make_cli(
+            case['commands'],
+            case['args'],
+            case['depth'],
+            list_arg=case['list_values'] > 0,
+            is_async=case['async']
+        )
+
+    cli_class, lazy_cli_class = make_case_cli(), make_case_cli()
+
+    start = perf_counter()
+    cli = cli_class()
+    construct_time = perf_counter() - start
+
+    start = perf_counter()
+    lazy_cli_class(lazy=True)
+    construct_lazy_time = perf_counter() - start
+
+    values = [str(value) for value in range(max(case['list_values'], 1))]
+    sys.argv = ['synthetic', *['sub'] * (case['depth'] - 1), 'command-0', *values]
+
+    parse_times = []
+
+    for _ in range(20):
+        start = perf_counter()
+        cli.parse()
+        parse_times.append(perf_counter() - start)
+
+    metrics = {
+        'import_ms': import_time * 1000,
+        'construct_ms': construct_time * 1000,
+        'construct_lazy_ms': construct_lazy_time * 1000,
+        'parse_ms': min(parse_times) * 1000,
+    }
+
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+
+    except ImportError:
+        return metrics
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    metrics['peak_mb'] = peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+    return metrics
+
+
+def measure(case: Dict, repeat: int) -> Dict[str, float]:
+    '''Run a case in fresh processes and keep the best value of each metric.'''
+
+    best = {}
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', json.dumps(case)],
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True
+        ).stdout
+
+        for metric, value in json.loads(output).items():
+            best[metric] = min(value, best.get(metric, value))
+
+    return best
+
+
+def is_regression(metric: str, value: float, baseline: float, threshold: float) -> bool:
+    '''Check if a metric is worse than its baseline by more than the threshold and the noise.'''
+
+    unit = metric.rpartition('_')[2]
+
+    return value > baseline * (1 + threshold) and value - baseline > NOISE_FLOORS[unit]
+
+
+def compare(
+        results: Dict[str, Dict[str, float]],
+        baseline: Dict[str, Dict[str, float]],
+        threshold: float
+    ) -> List[str]:
+    '''Print the results next to the baseline.
+
+    :returns: regressions as ``case.metric`` names
+    '''
+
+    regressions = []
+
+    print(f'{"case":>10} {"metric":>18} {"baseline":>10} {"current":>10} {"change":>8}')
+
+    for case_name, metrics in results.items():
+        for metric, value in metrics.items():
+            baseline_value = baseline.get(case_name, {}).get(metric)
+
+            if baseline_value is None:
+                print(f'{case_name:>10} {metric:>18} {"-":>10} {value:>10.2f}')
+                continue
+
+            change = (value / baseline_value - 1) * 100 if baseline_value else 0.0
+            flag = ''
+
+            if is_regression(metric, value, baseline_value, threshold):
+                regressions.append(f'{case_name}.{metric}')
+                flag = '  REGRESSION'
+
+            print(
+                f'{case_name:>10} {metric:>18} {baseline_value:>10.2f} {value:>10.2f}'
+                f' {change:>+7.1f}%{flag}'
+            )
+
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description='Run the Cliar benchmark suite.')
+    parser.add_argument('--child', help='measure a single case given as JSON in this process')
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='compare with the baseline')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.25,
+        help='relative increase counted as a regression'
+    )
+
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(json.loads(args.child))))
+        return
+
+    results = {}
+
+    for case_name in args.cases:
+        results[case_name] = measure(CASES[case_name], args.repeat)
+
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text())
+
+        if baseline['python'] != platform.python_version():
+            print(
+                f'Baseline was recorded with Python {baseline["python"]},'
+                f' running {platform.python_version()}',
+                file=sys.stderr
+            )
+
+        regressions = compare(results, baseline['cases'], args.threshold)
+
+        if regressions:
+            print(f'\nRegressions: {", ".join(regressions)}', file=sys.stderr)
+            sys.exit(1)
+
+        return
+
+    print(f'{"case":>10} ' + ' '.join(f'{metric:>18}' for metric in METRICS))
+
+    for case_name, metrics in results.items():
+        print(
+            f'{case_name:>10} '
+            + ' '.join(f'{metrics.get(metric, float("nan")):>18.2f}' for metric in METRICS)
+        )
+
+    if args.save:
+        cases = json.loads(args.baseline.read_text())['cases'] if args.baseline.exists() else {}
+        cases.update(results)
+
+        args.baseline.write_text(json.dumps(
+            {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cases': cases
+            },
+            indent=4,
+            sort_keys=True
+        ) + '\n')
+
+
+if __name__ == '__main__':
+    main()
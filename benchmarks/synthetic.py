@@ -0,0 +1,71 @@
+'''Generate synthetic Cliar subclasses of arbitrary size for benchmarks.'''
+
+from typing import List
+
+from cliar import Cliar
+
+
+def make_handler(name: str, arg_count: int, list_arg: bool = False, is_async: bool = False):
+    '''Create a handler with one positional param and ``arg_count - 1`` optional ones.
+
+    The handler is compiled from source, so its signature and type hints are real.
+    Short option names are disabled since they would clash.
+
+    :param list_arg: make the positional param a ``List[int]``
+    :param is_async: make the handler a coroutine function
+    '''
+
+    params = [
+        'self',
+        'arg_0: List[int]' if list_arg else 'arg_0: int',
+        *(f'opt_{index}: int = {index}' for index in range(1, arg_count))
+    ]
+
+    source = (
+        f'{"async " if is_async else ""}def {name}({", ".join(params)}):\n'
+        f'    """Command {name}.\n\n    Longer description of {name}."""\n'
+        f'    return arg_0\n'
+    )
+
+    namespace = {'List': List}
+    exec(source, namespace)  # pylint: disable=exec-used
+
+    handler = namespace[name]
+    handler._sharg_map = {f'opt_{index}': None for index in range(1, arg_count)}
+
+    return handler
+
+
+def make_cli(
+        commands: int,
+        args: int = 2,
+        depth: int = 1,
+        name: str = 'Synthetic',
+        list_arg: bool = False,
+        is_async: bool = False
+    ) -> type:
+    '''Create a Cliar subclass with ``commands`` commands at each of ``depth`` nesting levels.
+
+    Each level except the deepest one has a nested CLI called ``sub``.
+
+    :param commands: number of commands per level
+    :param args: number of params per command
+    :param depth: number of nesting levels
+    :param name: class name
+    :param list_arg: make the positional param of each command a ``List[int]``
+    :param is_async: make the handlers coroutine functions
+    '''
+
+    namespace = {
+        '__doc__': f'{name} CLI.',
+        '__module__': __name__,
+    }
+
+    for index in range(commands):
+        handler_name = f'command_{index}'
+        namespace[handler_name] = make_handler(handler_name, args, list_arg, is_async)
+
+    if depth > 1:
+        namespace['sub'] = make_cli(commands, args, depth - 1, f'{name}Sub', list_arg, is_async)
+
+    return type(name, (Cliar,), namespace)
@@ -1,14 +1,51 @@
-from .cliar import Cliar
-from .utils import set_help, set_metavars, set_arg_map, set_sharg_map, set_name, add_aliases, ignore
-
-
-__all__ = [
-    'Cliar',
-    'set_help',
-    'set_metavars',
-    'set_arg_map',
-    'set_sharg_map',
-    'set_name',
-    'add_aliases',
-    'ignore'
-]
+'''Create CLIs with classes and type hints.
+
+The public names are imported on first access, so that ``cliar.client`` starts without
+importing the parser machinery.
+'''
+
+__version__ = '1.3.5'
+
+
+_exports = {
+    'Cliar': 'cliar',
+    'register_converter': 'converters',
+    'CliarError': 'errors',
+    'ParseError': 'errors',
+    'HelpRequested': 'errors',
+    'FanOutError': 'errors',
+    'MappedFile': 'files',
+    'set_help': 'utils',
+    'set_metavars': 'utils',
+    'set_choices': 'utils',
+    'set_arg_map': 'utils',
+    'set_sharg_map': 'utils',
+    'read_argfiles': 'utils',
+    'set_name': 'utils',
+    'add_aliases': 'utils',
+    'set_stream_options': 'utils',
+    'fan_out': 'utils',
+    'memoize': 'utils',
+    'ignore': 'utils'
+}
+
+
+__all__ = [*_exports]
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _exports[name]
+
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+    from importlib import import_module  # pylint: disable=import-outside-toplevel
+
+    value = globals()[name] = getattr(import_module(f'.{module_name}', __name__), name)
+
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_exports})
@@ -0,0 +1,97 @@
+'''Cliar commandline tool.
+
+Run it with ``python -m cliar`` or ``cliar``.
+'''
+
+import os
+import sys
+
+from .cliar import Cliar
+from .cache import get_cache_dir, clear_cache
+from .memo import clear_results
+from .utils import set_help
+
+
+class Cache(Cliar):
+    '''Manage the cache of command specs and results.'''
+
+    def clear(self, results=False):
+        '''Remove all cached command specs, and command results with --results.'''
+
+        print(f'Removed {clear_cache()} cached specs from {get_cache_dir()}')
+
+        if results:
+            print(f'Removed {clear_results()} cached results from {get_cache_dir()}')
+
+    def path(self):
+        '''Show the cache location.'''
+
+        print(get_cache_dir())
+
+
+class CliarTool(Cliar):
+    '''Cliar commandline tool.'''
+
+    cache = Cache
+
+    @set_help(
+        {
+            'target': 'CLI class as module:Class; the module is imported from the current dir',
+            'output': 'file to write the compiled module to instead of stdout',
+            'prog': 'program name in the help texts; the output file name by default',
+            'width': 'terminal width to render the help texts for',
+            'check': 'exit with 1 if the compiled module in this file is out of date'
+        }
+    )
+    def compile(self, target, output='', prog='', width=80, check=''):
+        '''Compile a CLI class into a module that starts without inspecting the class
+        and prints help without importing it.
+        '''
+
+        from .compiled import compile_cli  # pylint: disable=import-outside-toplevel
+
+        if os.getcwd() not in sys.path:
+            sys.path.insert(0, os.getcwd())
+
+        path = check or output
+        module_name = target.partition(':')[0].rpartition('.')[2]
+
+        try:
+            source = compile_cli(
+                target,
+                prog or os.path.basename(path or f'{module_name}.py'),
+                width
+            )
+
+        except Exception as error:  # pylint: disable=broad-except
+            print(f"Can't compile {target}: {error}", file=sys.stderr)
+            sys.exit(1)
+
+        if check:
+            try:
+                with open(check, encoding='utf-8') as compiled:
+                    is_stale = compiled.read() != source
+
+            except OSError:
+                is_stale = True
+
+            if is_stale:
+                print(f'{check} is out of date, compile {target} again', file=sys.stderr)
+                sys.exit(1)
+
+        elif output:
+            with open(output, 'w', encoding='utf-8') as compiled:
+                compiled.write(source)
+
+        else:
+            sys.stdout.write(source)
+
+
+def main():
+    '''Run the Cliar commandline tool.'''
+
+    CliarTool().parse()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+'''Argument files: values of list params read from a file given as ``@PATH``.
+
+A value of a list or dict param listed in ``read_argfiles`` that starts with ``@`` is replaced
+with the values from the file, or from stdin for ``@-``. The file has one value per line,
+or values separated by NUL chars, e.g. the output of ``find -print0``, if there's a NUL char
+in its first chunk. To pass a value that starts with ``@``, double it: ``@@name``. Array params
+always read ``@PATH`` values, since numbers never start with ``@``.
+
+The file is read in chunks of ``CHUNK_SIZE`` chars and the values are converted as they're
+read, so a list of any length doesn't have to fit into the commandline, and the file contents
+are never held in memory as a whole.
+
+Stdin can be read only once, so if the args may be parsed again, e.g. by argparse after
+the fast engine gives up or after a lazy CLI fails to parse them, the chunks read from stdin
+are kept until the args are parsed and replayed on the second pass. Otherwise, stdin is read
+straight.
+'''
+
+import sys
+from argparse import ArgumentTypeError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, List
+
+
+CHUNK_SIZE = 65536
+
+_stdin_chunks = ContextVar('stdin_chunks', default=None)
+
+
+class _ReplayedStdin:  # pylint: disable=too-few-public-methods
+    '''Stdin reader that returns the chunks read in the current parse before reading new ones.'''
+
+    def __init__(self, chunks: List[str]):
+        self._chunks = chunks
+        self._position = 0
+
+    def read(self, size: int) -> str:
+        '''Read a recorded chunk or, if all of them are read, a new chunk from stdin.'''
+
+        if self._position == len(self._chunks):
+            chunk = sys.stdin.read(size)
+
+            if not chunk:
+                return chunk
+
+            self._chunks.append(chunk)
+
+        self._position += 1
+
+        return self._chunks[self._position-1]
+
+
+@contextmanager
+def replaying_stdin():
+    '''Keep the chunks read from stdin while the block runs, so that every ``@-`` value
+    in it gets the same values. Nested blocks share the chunks of the outer one.
+    '''
+
+    if _stdin_chunks.get() is not None:
+        yield
+        return
+
+    token = _stdin_chunks.set([])
+
+    try:
+        yield
+
+    finally:
+        _stdin_chunks.reset(token)
+
+
+def get_stdin():
+    '''Get stdin to read ``@-`` values from, replaying the chunks read in the current parse.'''
+
+    chunks = _stdin_chunks.get()
+
+    return sys.stdin if chunks is None else _ReplayedStdin(chunks)
+
+
+def read_values(path: str) -> Iterator[str]:
+    '''Yield the values from a file, or from stdin for ``-``, skipping empty ones.
+
+    :raises ArgumentTypeError: if the file can't be opened
+    '''
+
+    if path == '-':
+        yield from _split(get_stdin())
+        return
+
+    try:
+        values = open(path, encoding='utf-8')  # pylint: disable=consider-using-with
+
+    except OSError as error:
+        raise ArgumentTypeError(f"can't open '{path}': {error}") from error
+
+    with values:
+        yield from _split(values)
+
+
+def _split(values) -> Iterator[str]:
+    separator = None
+    tail = ''
+
+    while True:
+        chunk = values.read(CHUNK_SIZE)
+
+        if not chunk:
+            break
+
+        if separator is None:
+            separator = '\0' if '\0' in chunk else '\n'
+
+        parts = (tail + chunk).split(separator)
+        tail = parts.pop()
+
+        for part in parts:
+            if part:
+                yield part
+
+    if tail:
+        yield tail
+
+
+def is_argfile(value: str) -> bool:
+    '''Check if a value is an ``@PATH`` reference rather than a literal value.'''
+
+    return value.startswith('@') and not value.startswith('@@')
+
+
+def expand(values: Iterable[str]) -> Iterator[str]:
+    '''Replace ``@PATH`` values with the values from the files and unescape ``@@`` values.'''
+
+    for value in values:
+        if not value.startswith('@'):
+            yield value
+
+        elif value.startswith('@@'):
+            yield value[1:]
+
+        else:
+            yield from read_values(value[1:])
@@ -0,0 +1,188 @@
+'''Numeric list params typed as ``array.array`` or ``numpy.ndarray``.
+
+Such a param takes many numbers, separated by spaces or commas, and the handler gets them
+as a compact array instead of a list of Python objects. The values are converted in a single
+pass when all of them are parsed, not one by one.
+
+The item type is taken from the default value, e.g. ``values: array = array('q')`` makes
+an array of 64-bit ints. Without a default, items are ``double``, i.e. ``float64``.
+
+Besides the numbers, pass ``@PATH`` to read them from a file, or ``@-`` to read them
+from stdin. Text files have numbers separated by commas, whitespace, or NUL chars. Files
+with ``.bin`` suffix have raw items in the native byte order, e.g. written with ``array.tofile``
+or ``numpy.ndarray.tofile``.
+
+NumPy is imported only when an ``ndarray`` param gets its values.
+'''
+
+import os
+from argparse import ArgumentTypeError
+from array import array
+from typing import Any, List
+
+from .argfiles import get_stdin, is_argfile
+from .converters import ValuesConverter
+
+
+_float_typecodes = ('f', 'd')
+
+_CHUNK_SIZE = 1048576
+
+
+def is_array_type(typ) -> bool:
+    '''Check if a type is ``array.array`` or ``numpy.ndarray``, without importing NumPy.'''
+
+    return typ is array or (
+        getattr(typ, '__module__', None) == 'numpy' and getattr(typ, '__name__', None) == 'ndarray'
+    )
+
+
+class ArrayReader(ValuesConverter):
+    '''Commandline arg type that converts all values of a list arg to an array at once.
+
+    :param typecode: ``array`` typecode of the items
+    :param numpy: return a NumPy array that shares the memory of the ``array``
+    '''
+
+    def __init__(self, typecode: str = 'd', numpy: bool = False):
+        self.typecode = typecode
+        self.numpy = numpy
+
+    @classmethod
+    def from_annotation(cls, typ, default: Any = None) -> 'ArrayReader':
+        '''Create a reader for an array type, with the item type of the default value.
+
+        :raises TypeError: if the default array has items that ``array`` doesn't support
+        '''
+
+        numpy = typ is not array
+
+        if default is None:
+            return cls(numpy=numpy)
+
+        typecode = default.dtype.char if numpy else default.typecode
+
+        if typecode not in 'bBhHiIlLqQfd':
+            raise TypeError(f'Unsupported array item type: {typecode!r}')
+
+        return cls(typecode, numpy)
+
+    def _convert(self, tokens: List[str]) -> array:
+        '''Convert number tokens to an array in a single pass.
+
+        :raises ValueError: if a token is not a number of the item type
+        '''
+
+        item_type = float if self.typecode in _float_typecodes else int
+
+        items = array(self.typecode)
+
+        try:
+            items.extend(map(item_type, tokens))
+
+        except (ValueError, OverflowError):
+            raise ValueError(
+                f'invalid {item_type.__name__} array item: {tokens[len(items)]!r}'
+            ) from None
+
+        return items
+
+    def _split(self, values: List[str]) -> array:
+        '''Convert numbers that may be comma-separated lists of numbers.'''
+
+        joined = ','.join(values)
+
+        if joined.count(',') != len(values) - 1:
+            values = [token for token in joined.split(',') if token]
+
+        return self._convert(values)
+
+    def _read_text(self, lines) -> array:
+        '''Read numbers separated by commas, whitespace, or NUL chars chunk by chunk.'''
+
+        items = array(self.typecode)
+        tail = ''
+
+        while True:
+            chunk = lines.read(_CHUNK_SIZE)
+
+            if not chunk:
+                break
+
+            chunk = (tail + chunk).replace(',', ' ').replace('\0', ' ')
+            tokens = chunk.split()
+            tail = tokens.pop() if tokens and not chunk[-1].isspace() else ''
+
+            items.extend(self._convert(tokens))
+
+        if tail:
+            items.extend(self._convert([tail]))
+
+        return items
+
+    def _read_binary(self, path: str) -> array:
+        '''Read raw items in the native byte order.'''
+
+        items = array(self.typecode)
+
+        with open(path, 'rb') as binary:
+            size = os.fstat(binary.fileno()).st_size
+
+            if size % items.itemsize:
+                raise ValueError(f'size of {path} is not a multiple of {items.itemsize} bytes')
+
+            count = size // items.itemsize
+            chunk_count = max(_CHUNK_SIZE // items.itemsize, 1)
+
+            while len(items) < count:
+                items.fromfile(binary, min(count - len(items), chunk_count))
+
+        return items
+
+    def read(self, path: str) -> array:
+        '''Read numbers from a file, or from stdin for ``-``.'''
+
+        if path == '-':
+            return self._read_text(get_stdin())
+
+        try:
+            if path.endswith('.bin'):
+                return self._read_binary(path)
+
+            with open(path, encoding='utf-8') as lines:
+                return self._read_text(lines)
+
+        except OSError as error:
+            raise ArgumentTypeError(f"can't open '{path}': {error}") from error
+
+    def __call__(self, values: List[str]) -> Any:
+        '''Convert the commandline values of the arg to an array.
+
+        :param values: numbers, comma-separated lists of numbers, or ``@PATH`` references
+        :raises ValueError: if a value is not a number of the item type
+        '''
+
+        if not any(map(is_argfile, values)):
+            items = self._split(values)
+
+        else:
+            items = array(self.typecode)
+            numbers = []
+
+            for value in values:
+                if is_argfile(value):
+                    items.extend(self._split(numbers))
+                    items.extend(self.read(value[1:]))
+                    numbers = []
+
+                else:
+                    numbers.append(value)
+
+            items.extend(self._split(numbers))
+
+        if self.numpy:
+            import numpy  # pylint: disable=import-outside-toplevel
+
+            return numpy.frombuffer(items, dtype=self.typecode)
+
+        return items
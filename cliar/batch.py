@@ -0,0 +1,265 @@
+'''Batch mode: run many commands read from a file or stdin in a single process.
+
+Each line is a single call, either commandline args quoted the way a shell does it,
+e.g. ``add 1 2``, or a JSON object with the command and the handler args, e.g.
+``{"command": "add", "args": {"x": 1, "y": 2}}``. Empty lines and lines starting with ``#``
+are skipped.
+
+Lines are parsed one by one. Sync handlers run in a thread pool, coroutine handlers run
+concurrently on an event loop. The output of each call is buffered and written in the order
+of the lines.
+'''
+
+import json
+import shlex
+import sys
+from asyncio import ensure_future, get_running_loop, sleep
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from inspect import iscoroutine, iscoroutinefunction
+from io import StringIO
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from .calls import get_command_path, prepare_call
+from .errors import ParseError, HelpRequested
+from .files import closing_files
+from .hooks import observe
+from .invocation import ExitStatus, redirect_streams
+from .runner import run_coroutine
+from .streaming import is_stream, write_records, write_records_async
+
+
+# pylint: disable=protected-access
+
+
+_CALLS_PER_WORKER = 16
+
+
+def _resolve_record(root, record: Dict[str, Any]) -> Tuple[Any, Callable, Dict[str, Any]]:
+    '''Find the handler for a JSON call and set the global args.
+
+    :param root: root CLI
+    :param record: call with the space-separated command path in ``command``, handler args
+        in ``args``, and global args in ``global_args``
+    :returns: CLI that owns the command, the handler, and the handler args
+    :raises ParseError: if the command or the args are unknown
+    '''
+
+    if not isinstance(record, dict):
+        raise ParseError(root._parser, 'call must be a JSON object')
+
+    cli = root
+    clis = [root]
+    command = root.root_command
+
+    names = record.get('command', '').split()
+
+    for position, name in enumerate(names):
+        spec = cli._spec
+
+        if name in cli._subcli_classes:
+            cli = cli._subclis.get(name) or cli._register_subcli(name)
+            clis.append(cli)
+
+        elif name in spec.handler_names and position == len(names) - 1:
+            command = cli._get_command(spec.handler_names[name])
+
+        else:
+            raise ParseError(cli._parser, f'invalid command: {name!r}')
+
+    if command is root.root_command:
+        command = cli.root_command
+
+    handler_args = record.get('args', {})
+    unknown_args = set(handler_args) - {arg.param_name for arg in command.args}
+
+    if unknown_args:
+        raise ParseError(cli._parser, f'unrecognized arguments: {" ".join(sorted(unknown_args))}')
+
+    global_args = {
+        arg.name: arg.default
+        for parent in clis
+        for arg in parent.root_command.args
+    }
+    global_args.update(record.get('global_args', {}))
+
+    for parent in clis:
+        parent.global_args = global_args
+
+    return cli, getattr(cli, command.handler_name), handler_args
+
+
+async def _consume_stream(records, handler: Callable, is_json: bool, executor: ThreadPoolExecutor):
+    '''Collect the records of a JSON call into a list or write the records of a regular call
+    to its stdout.
+    '''
+
+    if hasattr(records, '__anext__'):
+        if is_json:
+            return [record async for record in records]
+
+        await write_records_async(records, **getattr(handler, '_stream_options', {}))
+        return None
+
+    consume = list if is_json else partial(write_records, **getattr(handler, '_stream_options', {}))
+
+    return await get_running_loop().run_in_executor(executor, copy_context().run, consume, records)
+
+
+_Outcome = Tuple[bool, int, Any, str, str]
+
+
+async def _call(root, line: str, executor: ThreadPoolExecutor, streams) -> _Outcome:
+    '''Run a single call with its own streams.
+
+    :param root: root CLI
+    :param line: call from the batch
+    :param executor: thread pool for sync handlers
+    :param streams: stdin, stdout, and stderr proxies
+    :returns: whether the call is JSON, the exit status, the handler result, stdout, and stderr
+    '''
+
+    # pylint: disable=too-many-locals
+
+    stdin, stdout, stderr = StringIO(), StringIO(), StringIO()
+
+    for proxy, stream in zip(streams, (stdin, stdout, stderr)):
+        proxy.redirect(stream)
+
+    is_json = line.lstrip().startswith('{')
+    result = None
+
+    with ExitStatus() as status, closing_files(), observe(root._hooks, line) as invocation:
+        with invocation.phase('parse'):
+            if is_json:
+                try:
+                    record = json.loads(line)
+
+                except ValueError as error:
+                    raise ParseError(root._parser, f'invalid JSON: {error}') from error
+
+                cli, handler, handler_args = _resolve_record(root, record)
+                invocation.command = record.get('command', '').split()
+
+            else:
+                try:
+                    args = shlex.split(line)
+
+                except ValueError as error:
+                    raise ParseError(root._parser, f'invalid call: {error}') from error
+
+                parsed_args = root._parse_args(args)
+                invocation.command = get_command_path(parsed_args)
+                cli, handler, handler_args = prepare_call(root, parsed_args)
+
+        invocation.fire('after_parse')
+        invocation.handler_args = handler_args
+        invocation.fire('before_handler')
+
+        with invocation.phase('handler'):
+            if iscoroutinefunction(handler):
+                result = await handler(**handler_args)
+
+            else:
+                result = await get_running_loop().run_in_executor(
+                    executor,
+                    copy_context().run,
+                    partial(handler, **handler_args)
+                )
+
+                if iscoroutine(result):
+                    result = await result
+
+            if is_stream(result):
+                result = await _consume_stream(result, handler, is_json, executor)
+
+        invocation.result = result
+
+        if result is NotImplemented:
+            result = None
+
+            if cli._lazy:
+                cli._register_all()
+
+            raise HelpRequested(cli._parser)
+
+    return is_json, status.code, result, stdout.getvalue(), stderr.getvalue()
+
+
+def _write(output, errors, outcome: _Outcome):
+    '''Write the outcome of a call: JSON calls get a JSON line, other calls get their output.'''
+
+    is_json, status, result, stdout, stderr = outcome
+
+    if is_json:
+        output.write(
+            json.dumps(
+                {'status': status, 'result': result, 'stdout': stdout, 'stderr': stderr},
+                default=str
+            ) + '\n'
+        )
+
+    else:
+        output.write(stdout)
+        errors.write(stderr)
+
+
+async def _run(root, lines: Iterable[str], workers: int, output, errors) -> int:
+    '''Schedule calls as the lines are read and write their outcomes in order.
+
+    At most ``workers * _CALLS_PER_WORKER`` calls are in flight at a time.
+    '''
+
+    status = 0
+    pending = deque()
+
+    with redirect_streams() as streams, ThreadPoolExecutor(workers) as executor:
+        def write_next(outcome):
+            nonlocal status
+
+            _write(output, errors, outcome)
+
+            if outcome[1] and not status:
+                status = outcome[1]
+
+        for line in lines:
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+
+            pending.append(ensure_future(_call(root, line, executor, streams)))
+
+            await sleep(0)
+
+            while pending and (len(pending) >= workers * _CALLS_PER_WORKER or pending[0].done()):
+                write_next(await pending.popleft())
+
+            if not pending:
+                output.flush()
+                errors.flush()
+
+        while pending:
+            write_next(await pending.popleft())
+
+    output.flush()
+    errors.flush()
+
+    return status
+
+
+def run_batch(cli, lines: Iterable[str], workers: int = 4, output=None, errors=None) -> int:
+    '''Run calls from ``lines`` and write their outcomes in order.
+
+    :param cli: root CLI
+    :param lines: calls, one per line
+    :param workers: number of threads for sync handlers
+    :param output: stream for the output, ``sys.stdout`` by default
+    :param errors: stream for the errors, ``sys.stderr`` by default
+    :returns: 0 if all calls succeed, otherwise the exit status of the first failed call
+    '''
+
+    output = output or sys.stdout
+    errors = errors or sys.stderr
+
+    return run_coroutine(_run(cli, lines, workers, output, errors), cli._loop_factory)
@@ -0,0 +1,218 @@
+'''On-disk cache of command specs.
+
+Inspecting handler signatures and type hints on every call is wasteful when the CLI source
+doesn't change between calls. The spec of a CLI class is pickled into the user cache dir
+along with the modification times and sizes of the files it was built from, and is reused
+until any of these files changes.
+
+Set ``CLIAR_NO_CACHE`` env var to bypass the cache, and ``CLIAR_CACHE_DIR`` env var
+to store it in a custom location.
+'''
+
+import os
+import pickle
+import sys
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+
+_SPEC_FORMAT = 4
+
+
+def get_cache_dir() -> Path:
+    '''Get the directory where Cliar stores its cache.'''
+
+    if os.environ.get('CLIAR_CACHE_DIR'):
+        return Path(os.environ['CLIAR_CACHE_DIR'])
+
+    if sys.platform == 'win32':
+        base_dir = Path(os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local')
+
+    elif sys.platform == 'darwin':
+        base_dir = Path.home() / 'Library' / 'Caches'
+
+    else:
+        base_dir = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+
+    return base_dir / 'cliar'
+
+
+def is_disabled() -> bool:
+    '''Check if the cache is disabled with ``CLIAR_NO_CACHE`` env var.'''
+
+    return os.environ.get('CLIAR_NO_CACHE', '') not in ('', '0')
+
+
+def _get_source_path(obj: Any) -> str or None:
+    '''Get the path to the file where a class or a function is defined.'''
+
+    code = getattr(getattr(obj, '__func__', obj), '__code__', None)
+
+    if code:
+        return code.co_filename
+
+    module = sys.modules.get(getattr(obj, '__module__', None))
+
+    return getattr(module, '__file__', None)
+
+
+def _stat_sources(paths: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    '''Get modification times and sizes of files, skipping the ones that don't exist.'''
+
+    sources = {}
+
+    for path in paths:
+        try:
+            stat = os.stat(path)
+
+        except OSError:
+            continue
+
+        sources[path] = (stat.st_mtime_ns, stat.st_size)
+
+    return sources
+
+
+def get_sources(objects: Iterable[Any]) -> Dict[str, Tuple[int, int]]:
+    '''Get modification times and sizes of the files where classes and functions are defined.
+
+    :param objects: classes, functions, or methods
+    '''
+
+    return _stat_sources(
+        {path for path in map(_get_source_path, objects) if path}
+    )
+
+
+def _get_spec_path(cli_class: type) -> Path:
+    '''Get the path to the cached spec of a CLI class.
+
+    The path depends on the Cliar version, the spec format, and the class location,
+    so different versions of Cliar and different scripts don't share cache entries.
+    '''
+
+    from . import __version__  # pylint: disable=import-outside-toplevel, cyclic-import
+
+    module = sys.modules.get(cli_class.__module__)
+
+    key = ':'.join((
+        __version__,
+        str(_SPEC_FORMAT),
+        cli_class.__module__,
+        cli_class.__qualname__,
+        str(getattr(module, '__file__', ''))
+    ))
+
+    return get_cache_dir() / 'specs' / f'{sha256(key.encode()).hexdigest()}.pickle'
+
+
+def load_spec(cli_class: type) -> Any:
+    '''Load the cached spec of a CLI class.
+
+    :returns: the spec or ``None`` if there's no spec, it's stale, or the cache is disabled
+    '''
+
+    if is_disabled():
+        return None
+
+    try:
+        with _get_spec_path(cli_class).open('rb') as spec_file:
+            sources = pickle.load(spec_file)
+
+            if _stat_sources(sources) != sources:
+                return None
+
+            return pickle.load(spec_file)
+
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def save_spec(cli_class: type, spec: Any, sources: Dict[str, Tuple[int, int]]):
+    '''Store the spec of a CLI class in the cache.
+
+    Specs that can't be pickled, e.g. because of lambdas used as arg types, are not stored.
+
+    :param cli_class: CLI class
+    :param spec: spec to store
+    :param sources: modification times and sizes of the files the spec was built from
+    '''
+
+    if is_disabled():
+        return
+
+    spec_path = _get_spec_path(cli_class)
+
+    try:
+        spec_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with NamedTemporaryFile('wb', dir=spec_path.parent, delete=False) as spec_file:
+            try:
+                pickle.dump(sources, spec_file)
+                pickle.dump(spec, spec_file)
+
+            except Exception:  # pylint: disable=broad-except
+                spec_file.close()
+                os.remove(spec_file.name)
+                return
+
+        os.replace(spec_file.name, spec_path)
+
+    except OSError:
+        pass
+
+
+def evict(entry_paths: Iterable[Path], max_size: int, remove: Callable[[Path], None] = Path.unlink):
+    '''Remove the least recently used cache entries until they fit into ``max_size`` bytes.
+
+    :param entry_paths: paths to the entry files
+    :param max_size: total size of the entries in bytes
+    :param remove: function that removes an entry
+    '''
+
+    entries = []
+
+    for entry_path in entry_paths:
+        try:
+            stat = entry_path.stat()
+
+        except OSError:
+            continue
+
+        entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+    size = sum(entry_size for _, entry_size, _ in entries)
+
+    for _, entry_size, entry_path in sorted(entries):
+        if size <= max_size:
+            break
+
+        try:
+            remove(entry_path)
+
+        except OSError:
+            continue
+
+        size -= entry_size
+
+
+def clear_cache() -> int:
+    '''Remove all cached specs.
+
+    :returns: number of removed specs
+    '''
+
+    removed = 0
+
+    for spec_path in (get_cache_dir() / 'specs').glob('*.pickle'):
+        try:
+            spec_path.unlink()
+
+        except OSError:
+            continue
+
+        removed += 1
+
+    return removed
@@ -0,0 +1,198 @@
+'''Calls of the handlers of parsed commands.
+
+A coroutine returned by a handler is run in a new event loop or awaited, and iterators returned
+by generator handlers are written to stdout if the output is streamed. Hooks are fired
+around parsing and the handler call if the CLI has any.
+'''
+
+from contextlib import nullcontext
+from inspect import iscoroutine
+from typing import Any, Callable, Dict, List, Tuple
+
+from .hooks import observe
+from .streaming import is_stream, write_records, write_records_async
+
+
+# pylint: disable=protected-access
+
+
+def get_command_path(args) -> List[str]:
+    '''Get the names of the nested CLIs and the command of parsed commandline args.'''
+
+    command = args._command
+    names = [] if command.handler_name == '_root' else [command.name]
+
+    return [*args._cli._path, *names]
+
+
+def prepare_call(root, args) -> Tuple[Any, Callable, Dict[str, Any]]:
+    '''Get the handler of the parsed command and the args to call it with.
+
+    Global args are stored in ``global_args`` of the root CLI and its nested CLIs.
+
+    :param root: root CLI
+    :param args: parsed commandline args
+    :returns: CLI that owns the command, the handler, and the handler args
+    '''
+
+    cli, command = args._cli, args._command
+    handler_args = {arg.param_name: getattr(args, arg.name) for arg in command.args}
+
+    root.global_args = {
+        arg: value
+        for arg, value in vars(args).items()
+        if arg not in ['_cli', '_command', *(arg.name for arg in command.args)]
+    }
+    for subcli in root._subclis.values():
+        subcli.global_args = root.global_args
+
+    return cli, getattr(cli, command.handler_name), handler_args
+
+
+def _finish_call(cli, result):
+    '''Register all commands of a lazy CLI if its help will be shown.'''
+
+    if result is NotImplemented and cli._lazy:
+        with cli._parse_lock:
+            cli._register_all()
+
+
+def _call_handler(root, args, stream_output: bool = False, invocation=None) -> Tuple[Any, Any]:
+    '''Call the handler of the parsed command, running the result if it's a coroutine.
+
+    Coroutines run in a new event loop created with the loop factory.
+
+    :param root: root CLI
+    :param args: parsed commandline args
+    :param stream_output: if the handler returns an iterator or an async iterator,
+        write its records to stdout instead of returning it
+    :param invocation: invocation to fire ``before_handler`` for and to time the handler in
+    :returns: CLI that owns the command and the handler result
+    '''
+
+    cli, handler, handler_args = prepare_call(root, args)
+
+    if invocation:
+        invocation.handler_args = handler_args
+        invocation.fire('before_handler')
+
+    with invocation.phase('handler') if invocation else nullcontext():
+        result = handler(**handler_args)
+
+        if iscoroutine(result):
+            from .runner import run_coroutine  # pylint: disable=import-outside-toplevel
+
+            result = run_coroutine(result, root._loop_factory)
+
+        if stream_output and is_stream(result):
+            if hasattr(result, '__anext__'):
+                from .runner import run_coroutine  # pylint: disable=import-outside-toplevel
+
+                run_coroutine(
+                    write_records_async(result, **getattr(handler, '_stream_options', {})),
+                    root._loop_factory
+                )
+
+            else:
+                write_records(result, **getattr(handler, '_stream_options', {}))
+
+            result = None
+
+    _finish_call(cli, result)
+
+    return cli, result
+
+
+async def _call_handler_async(
+        root,
+        args,
+        stream_output: bool = False,
+        invocation=None
+    ) -> Tuple[Any, Any]:
+    '''Call the handler of the parsed command, awaiting the result if it's a coroutine.
+
+    :param root: root CLI
+    :param args: parsed commandline args
+    :param stream_output: if the handler returns an iterator or an async iterator,
+        write its records to stdout instead of returning it
+    :param invocation: invocation to fire ``before_handler`` for and to time the handler in
+    :returns: CLI that owns the command and the handler result
+    '''
+
+    cli, handler, handler_args = prepare_call(root, args)
+
+    if invocation:
+        invocation.handler_args = handler_args
+        invocation.fire('before_handler')
+
+    with invocation.phase('handler') if invocation else nullcontext():
+        result = handler(**handler_args)
+
+        if iscoroutine(result):
+            result = await result
+
+        if stream_output and is_stream(result):
+            if hasattr(result, '__anext__'):
+                await write_records_async(result, **getattr(handler, '_stream_options', {}))
+
+            else:
+                write_records(result, **getattr(handler, '_stream_options', {}))
+
+            result = None
+
+    _finish_call(cli, result)
+
+    return cli, result
+
+
+def call(root, args: List[str], stream_output: bool) -> Tuple[Any, Any]:
+    '''Parse args and call the handler, firing the hooks if there are any.
+
+    :param root: root CLI
+    :param args: commandline args without the program name
+    :param stream_output: write the records of a returned iterator to stdout
+    :returns: CLI that owns the command and the handler result
+    '''
+
+    if not root._hooks:
+        return _call_handler(root, root._parse_args(args), stream_output)
+
+    with observe(root._hooks, args) as invocation:
+        with invocation.phase('parse'):
+            parsed_args = root._parse_args(args)
+
+        invocation.command = get_command_path(parsed_args)
+        invocation.fire('after_parse')
+
+        cli, invocation.result = _call_handler(root, parsed_args, stream_output, invocation)
+
+    return cli, invocation.result
+
+
+async def call_async(root, args: List[str], stream_output: bool) -> Tuple[Any, Any]:
+    '''Parse args and await the handler, firing the hooks if there are any.
+
+    :param root: root CLI
+    :param args: commandline args without the program name
+    :param stream_output: write the records of a returned iterator to stdout
+    :returns: CLI that owns the command and the handler result
+    '''
+
+    if not root._hooks:
+        return await _call_handler_async(root, root._parse_args(args), stream_output)
+
+    with observe(root._hooks, args) as invocation:
+        with invocation.phase('parse'):
+            parsed_args = root._parse_args(args)
+
+        invocation.command = get_command_path(parsed_args)
+        invocation.fire('after_parse')
+
+        cli, invocation.result = await _call_handler_async(
+            root,
+            parsed_args,
+            stream_output,
+            invocation
+        )
+
+    return cli, invocation.result
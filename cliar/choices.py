@@ -0,0 +1,189 @@
+'''Choices computed at runtime by provider functions, e.g. cluster names or branches.
+
+A provider is called only when the choices are actually needed: to validate an arg value,
+to render help, or to complete a value in the shell. Its result is cached in memory
+and on disk for ``ttl`` seconds, so repeated TAB presses don't call it again. The disk cache
+is bounded by size: when it grows larger than ``MAX_CACHE_SIZE`` bytes, the least recently used
+entries are removed.
+
+Set ``CLIAR_NO_CACHE`` env var to bypass the disk cache.
+'''
+
+import json
+import os
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import time
+from typing import Any, Callable, Iterator, List
+
+from .cache import evict, get_cache_dir, is_disabled
+
+
+# pylint: disable=protected-access
+
+
+MAX_CACHE_SIZE = 2**20
+
+
+def _get_choices_dir() -> Path:
+    return get_cache_dir() / 'choices'
+
+
+class ChoiceProvider:
+    '''Lazy collection of choices returned by a provider function.
+
+    :param provider: function without args that returns the choices
+    :param ttl: seconds to reuse the provider result; 0 disables caching
+    '''
+
+    def __init__(self, provider: Callable[[], Any], ttl: float = 300.0):
+        self.provider = provider
+        self.ttl = ttl
+        self._choices = None
+        self._loaded_at = 0.0
+
+    def __getstate__(self):
+        return {'provider': self.provider, 'ttl': self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(state['provider'], state['ttl'])
+
+    @property
+    def key(self) -> str:
+        '''Name and line of the provider function, which identify its cache entry.'''
+
+        provider = self.provider
+        line = getattr(getattr(provider, '__code__', None), 'co_firstlineno', 0)
+
+        return f'{provider.__module__}.{getattr(provider, "__qualname__", provider)}:{line}'
+
+    def _get_entry_path(self) -> Path:
+        return _get_choices_dir() / f'{sha256(self.key.encode()).hexdigest()}.json'
+
+    def _load(self) -> List[str] or None:
+        '''Load the cached choices from disk.
+
+        :returns: the choices or ``None`` if there are none, they're stale, or the cache
+            is disabled
+        '''
+
+        if is_disabled():
+            return None
+
+        entry_path = self._get_entry_path()
+
+        try:
+            with entry_path.open(encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+
+            if time() - entry['time'] >= self.ttl:
+                return None
+
+            os.utime(entry_path)
+
+            self._loaded_at = entry['time']
+            return entry['choices']
+
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self, choices: List[str]):
+        '''Store the choices on disk and evict old entries if the cache is too large.'''
+
+        if is_disabled():
+            return
+
+        entry_path = self._get_entry_path()
+
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with NamedTemporaryFile(
+                    'w',
+                    encoding='utf-8',
+                    dir=entry_path.parent,
+                    delete=False
+                ) as entry_file:
+                json.dump(
+                    {'key': self.key, 'time': self._loaded_at, 'choices': choices},
+                    entry_file
+                )
+
+            os.replace(entry_file.name, entry_path)
+
+            evict(entry_path.parent.glob('*.json'), MAX_CACHE_SIZE)
+
+        except OSError:
+            pass
+
+    def get(self) -> List[str]:
+        '''Get the choices, calling the provider only if the cached ones are stale.'''
+
+        if self._choices is not None and time() - self._loaded_at < self.ttl:
+            return self._choices
+
+        choices = self._load() if self.ttl > 0 else None
+
+        if choices is None:
+            self._loaded_at = time()
+            choices = [str(choice) for choice in self.provider()]
+
+            if self.ttl > 0:
+                self._save(choices)
+
+        self._choices = choices
+
+        return choices
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.get())
+
+    def __contains__(self, value: Any) -> bool:
+        '''Check if a value is a valid choice; values converted to the arg type are compared
+        by their string form.
+        '''
+
+        return str(value) in self.get()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.key}, ttl={self.ttl!r})'
+
+
+def get_choices(cli, path: str, arg_name: str) -> List[str]:
+    '''Get the choices of an arg, building only the parsers of the nested CLIs on the path.
+
+    :param cli: root CLI
+    :param path: path to the command, e.g. ``/remote/add``; ``''`` or a path to a nested CLI
+        means its root command
+    :param arg_name: positional arg name, or option name with dashes
+    :returns: the choices, or an empty list if there's no such command, arg, or choices
+    '''
+
+    command = cli.root_command
+
+    for name in filter(None, path.split('/')):
+        if command is not cli.root_command:
+            return []
+
+        if name in cli._subcli_classes:
+            cli = cli._subclis.get(name) or cli._register_subcli(name)
+            command = cli.root_command
+
+        elif name in cli._spec.handler_names:
+            command = cli._get_command(cli._spec.handler_names[name])
+
+        else:
+            return []
+
+    for arg in command.args:
+        if arg.default is None:
+            names = {arg.name}
+
+        else:
+            names = {'--'+arg.name, *(['-'+arg.short_name] if arg.short_name else [])}
+
+        if arg_name in names and arg.choices is not None:
+            return list(arg.choices)
+
+    return []
@@ -1,22 +1,93 @@
-﻿from argparse import ArgumentParser, RawTextHelpFormatter
-from asyncio import get_event_loop
-from inspect import signature, getmembers, ismethod, isclass, iscoroutine
-from collections import OrderedDict
-from typing import List, Iterable, Callable, Set, Type, get_type_hints
+﻿from argparse import (
+    ArgumentError, ArgumentParser, ArgumentTypeError, RawTextHelpFormatter
+)
+from inspect import signature, getmembers, ismethod, isclass
+from shutil import get_terminal_size
+from collections import OrderedDict, abc
+from contextlib import nullcontext
+from contextvars import ContextVar
+import os
+import sys
+from typing import Any, List, Iterable, Callable, Set, Type, Dict, Tuple, get_type_hints
+from threading import RLock
+from weakref import WeakKeyDictionary
 
 from .utils import ignore
+from .argfiles import expand, replaying_stdin
+from .arrays import ArrayReader, is_array_type
+from .errors import ParseError, HelpRequested
+from .cache import load_spec, save_spec, get_sources
+from .calls import call, call_async
+from .choices import ChoiceProvider
+from .converters import (
+    EnumConverter, LiteralConverter, ValuesAction, ValuesConverter, get_converter, unwrap_optional
+)
+from .engine import Fallback, parse_args as fast_parse_args
+from .files import close_after, closing_files, get_file_type
+from .hooks import EVENTS
+from .inputs import LineReader
+from .lazy import register_required
+from .modes import run_mode
+from .plugins import Plugin, add_placeholder, discover, remove_placeholder
 
 
 # pylint: disable=too-few-public-methods, protected-access, too-many-instance-attributes
 
 
+class _ArgumentParser(ArgumentParser):
+    '''Argparser that raises ``ParseError`` and ``HelpRequested`` instead of printing
+    messages and exiting, and reads values of list args from argument files if they allow it.
+    '''
+
+    def error(self, message: str):
+        raise ParseError(self, message)
+
+    def print_help(self, file=None):
+        raise HelpRequested(self)
+
+    def _get_values(self, action, arg_strings: List[str]):
+        '''Read the values of list args from ``@PATH`` argument files, converting them
+        one by one as they're read.
+        '''
+
+        if (
+                not getattr(action, 'argfiles', False)
+                or isinstance(action, ValuesAction)
+                or not any(arg_string.startswith('@') for arg_string in arg_strings)
+            ):
+            return super()._get_values(action, arg_strings)
+
+        values = []
+
+        try:
+            for arg_string in expand(arg_strings):
+                value = self._get_value(action, arg_string)
+                self._check_value(action, value)
+                values.append(value)
+
+        except ArgumentTypeError as error:
+            raise ArgumentError(action, str(error)) from error
+
+        return values
+
+
 class _Arg:
     '''CLI command argument.
 
     Its attributes correspond to the homonymous params of the ``add_argument`` function.
+    ``name`` is the arg name without prefixing dashes, ``param_name`` is the name
+    of the corresponding handler param. ``argfiles`` is true for list and dict args
+    that read ``@PATH`` argument files.
     '''
 
-    def __init__(self):
+    __slots__ = (
+        'name', 'param_name', 'type', 'default', 'action', 'nargs', 'metavar', 'help', 'short_name',
+        'choices', 'argfiles'
+    )
+
+    def __init__(self, name: str, param_name: str):
+        self.name = name
+        self.param_name = param_name
         self.type = None
         self.default = None
         self.action = None
@@ -24,46 +95,76 @@ class _Arg:
         self.metavar = None
         self.help = None
         self.short_name = None
+        self.choices = None
+        self.argfiles = False
 
 
 class _Command:
     '''CLI command corresponding to a handler.
 
-    Command args correspond to its handler args.
+    Command args correspond to its handler args. The decorator maps of the handler are used
+    only to create the args, so the command doesn't keep them.
     '''
 
-    def __init__(self, handler: Callable):
-        self.handler = handler
+    __slots__ = (
+        'handler_name', 'name', 'aliases', 'formatter_class', 'description', 'help', 'args'
+    )
+
+    def __init__(self, handler: Callable, handler_name: str or None = None):
+        self.handler_name = handler_name or handler.__name__
+
+        self.name = self.get_name(handler)
+
+        self.aliases = tuple(self.get_aliases(handler))
 
-        self.arg_map = {}
-        if hasattr(handler, '_arg_map'):
-            self.arg_map = handler._arg_map
+        self.formatter_class = RawTextHelpFormatter
+        if hasattr(handler, '_formatter_class'):
+            self.formatter_class = handler._formatter_class
+
+        self.description = handler.__doc__
+        self.help = handler.__doc__.splitlines()[0] if handler.__doc__ else ''
+
+        self.args = self._get_args(handler)
+
+    @classmethod
+    def from_handler(cls, handler: Callable, handler_name: str) -> '_Command':
+        '''Create a command for a handler.
+
+        Commands are memoized per handler function, so a handler inherited by several CLI classes
+        is inspected only once.
+        '''
 
-        self.sharg_map = {}
-        if hasattr(handler, '_sharg_map'):
-            self.sharg_map = handler._sharg_map
+        function = getattr(handler, '__func__', handler)
+        command = _commands_by_function.get(function)
 
-        self.metavar_map = {}
-        if hasattr(handler, '_metavar_map'):
-            self.metavar_map = handler._metavar_map
+        if command is None or command.handler_name != handler_name:
+            command = cls(handler, handler_name)
+
+            try:
+                _commands_by_function[function] = command
+
+            except TypeError:
+                pass
+
+        return command
+
+    @staticmethod
+    def get_name(handler: Callable) -> str:
+        '''Get the command name for a handler without inspecting its signature.'''
 
-        self.name = handler.__name__.replace('_', '-')
         if hasattr(handler, '_command_name'):
-            self.name = handler._command_name
+            return handler._command_name
 
-        self.aliases = []
-        if hasattr(handler, '_command_aliases'):
-            self.aliases = handler._command_aliases
+        return handler.__name__.replace('_', '-')
 
-        self.help_map = {}
-        if hasattr(handler, '_help_map'):
-            self.help_map = handler._help_map
+    @staticmethod
+    def get_aliases(handler: Callable) -> List[str]:
+        '''Get the command aliases for a handler without inspecting its signature.'''
 
-        self.formatter_class = RawTextHelpFormatter
-        if hasattr(handler, '_formatter_class'):
-            self.formatter_class = handler._formatter_class
+        if hasattr(handler, '_command_aliases'):
+            return handler._command_aliases
 
-        self.args = self._get_args()
+        return []
 
     @staticmethod
     def _get_origins(typ) -> Set[Type]:
@@ -81,19 +182,30 @@ class _Command:
 
         return set((origin, *orig_bases))
 
-    def _get_args(self) -> OrderedDict:
+    def _get_args(self, handler: Callable) -> Tuple[_Arg, ...]:
         '''Get command arguments from the parsed signature of its handler.'''
 
-        args = OrderedDict()
+        # pylint: disable=too-many-branches, too-many-locals, too-many-statements
+
+        args = []
 
-        handler_signature = signature(self.handler)
+        arg_map = getattr(handler, '_arg_map', {})
+        sharg_map = getattr(handler, '_sharg_map', {})
+        metavar_map = getattr(handler, '_metavar_map', {})
+        help_map = getattr(handler, '_help_map', {})
+        choice_map = getattr(handler, '_choice_map', {})
+        argfile_params = getattr(handler, '_argfile_params', ())
+
+        handler_signature = signature(handler)
+        type_hints = get_type_hints(handler)
 
         for param_name, param_data in handler_signature.parameters.items():
-            arg = _Arg()
+            arg = _Arg(arg_map.get(param_name, param_name.replace('_', '-')), param_name)
 
-            arg.help = self.help_map.get(param_name, '')
+            arg.help = help_map.get(param_name, '')
 
-            arg.type = get_type_hints(self.handler).get(param_name)
+            # Optional is unwrapped first, so that Optional[List[int]] is a list of ints.
+            arg.type = unwrap_optional(type_hints.get(param_name))
 
             if param_data.default is not param_data.empty:
                 arg.default = param_data.default
@@ -104,26 +216,133 @@ class _Command:
             if arg.type == bool:
                 arg.action = 'store_true'
 
+            elif get_file_type(arg.type):
+                arg.type = get_file_type(arg.type)
+
+            elif self._get_origins(arg.type) & {abc.Iterator, abc.Iterable}:
+                item_types = getattr(arg.type, '__args__', None) or (str,)
+                arg.type = LineReader(get_converter(item_types[0]) or str)
+
+            elif is_array_type(arg.type):
+                arg.type = ArrayReader.from_annotation(arg.type, arg.default)
+                arg.nargs = '+'
+
             elif self._get_origins(arg.type) & {list, tuple}:
                 if arg.default:
                     arg.nargs = '*'
                 else:
                     arg.nargs = '+'
 
-                if arg.type.__args__:
-                    arg.type = arg.type.__args__[0]
+                item_types = getattr(arg.type, '__args__', None) or (str,)
+                arg.type = get_converter(item_types[0])
+                arg.argfiles = param_name in argfile_params
+
+            elif arg.type:
+                arg.type = get_converter(arg.type)
+
+                if isinstance(arg.type, ValuesConverter):
+                    arg.nargs = '*' if arg.default else '+'
+                    arg.argfiles = param_name in argfile_params
+
+            if not arg.action and param_name in metavar_map:
+                arg.metavar = metavar_map[param_name]
+
+            elif isinstance(arg.type, EnumConverter):
+                arg.metavar = '{' + ','.join(arg.type.enum.__members__) + '}'
+
+            if not arg.action and param_name in choice_map:
+                choices = choice_map[param_name]
+
+                if callable(choices):
+                    arg.choices = ChoiceProvider(choices, handler._choices_ttl)
+
+                else:
+                    arg.choices = tuple(choices)
+
+            elif isinstance(arg.type, LiteralConverter):
+                arg.choices = arg.type.values
+
+            arg.short_name = sharg_map.get(param_name, arg.name[0])
+
+            args.append(arg)
+
+        return tuple(args)
+
+
+_commands_by_function = WeakKeyDictionary()
+
+
+class _Spec:
+    '''Commands and nested CLIs of a CLI class.
+
+    Command objects are created on demand, so a spec can be used to look up a command
+    by its name without inspecting the signatures of all handlers.
+
+    Specs are memoized per CLI class and shared by all its instances. Help texts rendered
+    by argparse are stored in the spec too, so they're served without formatting them again.
+    '''
+
+    __slots__ = (
+        'root_command', 'handler_names', 'commands', 'subclis', 'help_texts', '__weakref__'
+    )
+
+    def __init__(
+            self,
+            root_command: _Command,
+            handlers: Dict[str, Callable],
+            subclis: Dict[str, Type]
+        ):
+        self.root_command = root_command
 
-            if not arg.action and param_name in self.metavar_map:
-                arg.metavar = self.metavar_map[param_name]
+        self.handler_names = OrderedDict()
 
-            if param_name not in self.arg_map:
-                self.arg_map[param_name] = param_name.replace('_', '-')
+        for handler_name, handler in handlers.items():
+            self.handler_names[_Command.get_name(handler)] = handler_name
 
-            arg.short_name = self.sharg_map.get(param_name, self.arg_map[param_name][0])
+            for alias in _Command.get_aliases(handler):
+                self.handler_names[alias] = handler_name
 
-            args[self.arg_map[param_name]] = arg
+        self.commands = {}
 
-        return args
+        self.subclis = subclis
+
+        self.help_texts = {}
+
+
+_specs = WeakKeyDictionary()
+
+
+def _is_profiling_requested() -> bool:
+    '''Check if profiling is enabled with ``--cliar-profile`` or ``--cliar-profile-output`` flag
+    or ``CLIAR_PROFILE`` env var.
+    '''
+
+    return (
+        os.environ.get('CLIAR_PROFILE', '') not in ('', '0')
+        or any(
+            arg.partition('=')[0] in ('--cliar-profile', '--cliar-profile-output')
+            for arg in sys.argv[1:]
+        )
+    )
+
+
+def get_help_key(prog: str, args: List[str]) -> Tuple or None:
+    '''Get the key of the help text for args that request help for a command, e.g.
+    ``remote add -h``.
+
+    The text depends on the program name and the terminal width, and the format changes
+    between Python versions, so these are part of the key.
+
+    :returns: the key or ``None`` if the args aren't a command path followed by a help flag
+    '''
+
+    if not args or args[-1] not in ('-h', '--help'):
+        return None
+
+    if any(arg.startswith('-') for arg in args[:-1]):
+        return None
+
+    return (prog, tuple(args[:-1]), get_terminal_size().columns, sys.version_info[:2])
 
 
 class Cliar:
@@ -137,13 +356,141 @@ class Cliar:
     -   Command args are generated from the corresponding method args.
     -   Methods that start with an underscore are ignored.
     -   ``self._root`` corresponds to the root command. Use it to define global args.
+
+    :param lazy: build parsers only for the commands that are actually invoked
+    :param cache: store the command spec on disk and reuse it while the CLI source is unchanged
+    :param engine: commandline parser engine: ``argparse`` or ``fast``; the fast engine
+        falls back to argparse for help, errors, and args it can't handle
+    :param loop_factory: function that creates the event loop for async handlers,
+        e.g. ``uvloop.new_event_loop``; ``asyncio.new_event_loop`` by default
+    :param metrics: file path or ``unix:PATH`` socket to write a JSON line with metrics
+        of every call to; ``CLIAR_METRICS`` env var by default
+    :param plugins: entry point group to add nested CLIs from; a plugin module is imported
+        only when its command is invoked
     '''
 
     def __init__(
             self,
             parser_name: str or None = None,
-            parent: Type['Cliar'] or None = None
+            parent: Type['Cliar'] or None = None,
+            *,
+            lazy: bool = False,
+            cache: bool = False,
+            engine: str = 'argparse',
+            loop_factory: Callable or None = None,
+            metrics: str or None = None,
+            plugins: str or None = None
         ):
+        # pylint: disable=too-many-arguments
+
+        if engine not in ('argparse', 'fast'):
+            raise ValueError(f'Unknown parser engine: {engine}')
+
+        self._lazy = parent._lazy if parent else lazy
+        self._cache = parent._cache if parent else cache
+        self._engine = parent._engine if parent else engine
+        self._loop_factory = parent._loop_factory if parent else loop_factory
+        self._hooks = parent._hooks if parent else {}
+        self._parse_lock = parent._parse_lock if parent else RLock()
+        self._path = (*parent._path, parser_name) if parent else ()
+
+        metrics = None if parent else metrics or os.environ.get('CLIAR_METRICS')
+
+        if metrics:
+            from .metrics import MetricsEmitter  # pylint: disable=import-outside-toplevel
+
+            emitter = MetricsEmitter(metrics)
+            self.add_hook('after_handler', emitter)
+            self.add_hook('on_error', emitter)
+
+        self._global_args = ContextVar('global_args', default={})
+
+        if parent or not plugins:
+            self._plugins = {}
+
+        else:
+            self._plugins = discover(plugins)
+
+        if parent:
+            self._profiler = parent._profiler
+            self._build_parser(parser_name, parent)
+
+        elif _is_profiling_requested():
+            from .profiling import get_profiler  # pylint: disable=import-outside-toplevel
+
+            self._profiler = get_profiler()
+
+            with self._profiler.phase('init'):
+                self._lazy = self._lazy or self._is_shortcut_requested()
+                self._build_parser(parser_name, parent)
+
+        else:
+            self._profiler = None
+            self._lazy = self._lazy or self._is_shortcut_requested()
+            self._build_parser(parser_name, parent)
+
+    @property
+    def global_args(self) -> Dict[str, Any]:
+        '''Global args of the running command, i.e. the parsed params of ``self._root``.
+
+        They're stored per thread and asyncio task, so commands run side by side
+        in batch or daemon mode don't see each other's global args.
+        '''
+
+        return self._global_args.get()
+
+    @global_args.setter
+    def global_args(self, value: Dict[str, Any]):
+        self._global_args.set(value)
+
+    @property
+    def root_command(self) -> _Command:
+        '''The root command, i.e. the command for ``self._root``.'''
+
+        return self._spec.root_command
+
+    @ignore
+    def add_hook(self, event: str, hook: Callable) -> Callable:
+        '''Call a function on an event of every call of this CLI and its nested CLIs.
+
+        :param event: ``before_parse``, ``after_parse``, ``before_handler``, ``after_handler``,
+            or ``on_error``
+        :param hook: function that takes the ``Invocation`` of the call
+        :returns: the hook
+        '''
+
+        if event not in EVENTS:
+            raise ValueError(f'Unknown hook event: {event}')
+
+        self._hooks.setdefault(event, []).append(hook)
+
+        return hook
+
+    def _is_shortcut_requested(self) -> bool:
+        '''Check if the commandline asks for the choices of an arg or for a stored help text.
+
+        Both are printed without the command parsers, so the CLI builds them lazily then,
+        even if it's not lazy.
+        '''
+
+        args = sys.argv[1:]
+
+        if self._profiler:
+            args = self._profiler.strip_args(args)
+
+        if args and args[0].partition('=')[0] == '--cliar-choices':
+            return True
+
+        if self._plugins:
+            return False
+
+        help_key = get_help_key(os.path.basename(sys.argv[0]), args)
+
+        return help_key is not None and help_key in self._get_spec().help_texts
+
+    def _build_parser(self, parser_name: str or None = None, parent: Type['Cliar'] or None = None):
+        '''Create the argparser for this CLI and, unless the CLI is lazy, for all its commands.'''
+
         if parent:
             self._parser = parent._command_parsers.add_parser(
                 parser_name,
@@ -152,47 +499,137 @@ class Cliar:
                 formatter_class=RawTextHelpFormatter
             )
         else:
-            self._parser = ArgumentParser(
+            self._parser = _ArgumentParser(
                 description=self.__doc__,
                 formatter_class=RawTextHelpFormatter
             )
 
+        self._parser.set_defaults(_cli=self)
+
+        self._spec = self._get_spec()
+        self._subcli_classes = {**self._plugins, **self._spec.subclis}
+
         self._register_root_args()
 
         self._commands = {}
-        self._subclis = []
+        self._subclis = {}
+        self._placeholders = set()
 
-        handlers, subclis = self._get_handlers(), self._get_subclis()
-
-        if handlers or subclis:
+        if self._spec.handler_names or self._subcli_classes:
             self._command_parsers = self._parser.add_subparsers(
                 title='commands'
             )
-            self._register_commands(handlers)
 
-            for subcli_name, subcli_class in subclis.items():
-                self._subclis.append(subcli_class(subcli_name, self))
+            if not self._lazy:
+                self._register_all()
+
+    def _get_spec(self) -> _Spec:
+        '''Get the spec of this CLI class from memory, from the cache, or by inspecting
+        its handlers.
 
-        self.global_args = {}
+        When the cache is enabled, the commands for all handlers are created right away
+        so that the spec can be stored.
+        '''
+
+        cli_class = type(self)
+
+        spec = _specs.get(cli_class)
+
+        if spec:
+            return spec
+
+        spec = load_spec(cli_class) if self._cache else None
+
+        if not spec:
+            handlers = self._get_handlers()
+
+            spec = _Spec(_Command.from_handler(self._root, '_root'), handlers, self._get_subclis())
+
+            if self._cache:
+                for handler_name, handler in handlers.items():
+                    spec.commands[handler_name] = _Command.from_handler(handler, handler_name)
+
+                save_spec(cli_class, spec, self._get_sources(handlers, spec.subclis))
+
+        _specs[cli_class] = spec
+
+        return spec
+
+    def _get_sources(self, handlers: Dict[str, Callable], subclis: Dict[str, Type]):
+        '''Get the files the spec is built from: the CLI class with its bases, the handlers,
+        and the nested CLIs, whose docstrings appear in the help.
+        '''
+
+        return get_sources((*type(self).__mro__, *handlers.values(), *subclis.values()))
+
+    def _get_help_key(self, args: List[str]) -> Tuple or None:
+        '''Get the key of the help text for args that request help for a command.
+
+        Help of CLIs with plugins is not stored, since it changes when plugins are installed.
+        '''
+
+        if self._plugins:
+            return None
+
+        return get_help_key(self._parser.prog, args)
+
+    def _print_help(self, help_key: Tuple or None, parser: ArgumentParser or None = None):
+        '''Print the help text for a help key, rendering it with the parser if it's not
+        stored yet.
+
+        Rendered help texts are stored in the spec, and in the spec cache if it's enabled.
+        '''
+
+        help_text = self._spec.help_texts.get(help_key)
+
+        if help_text is None:
+            help_text = parser.format_help()
+
+            if help_key:
+                self._spec.help_texts[help_key] = help_text
+
+                if self._cache:
+                    save_spec(
+                        type(self),
+                        self._spec,
+                        self._get_sources(self._get_handlers(), self._spec.subclis)
+                    )
+
+        sys.stdout.write(help_text)
+
+    def _get_command(self, handler_name: str) -> _Command:
+        '''Get the command for a handler, inspecting the handler if necessary.'''
+
+        if handler_name not in self._spec.commands:
+            self._spec.commands[handler_name] = _Command.from_handler(
+                getattr(self, handler_name),
+                handler_name
+            )
+
+        return self._spec.commands[handler_name]
 
     def _register_root_args(self):
         '''Register root args, i.e. params of ``self._root``, in the global argparser.'''
 
-        self.root_command = _Command(self._root)
         self._parser.set_defaults(_command=self.root_command)
 
-        for arg_name, arg in self.root_command.args.items():
-            self._register_arg(self._parser, arg_name, arg)
+        for arg in self.root_command.args:
+            self._register_arg(self._parser, arg)
 
     @staticmethod
-    def _register_arg(command_parser: ArgumentParser, arg_name: str, arg: _Arg):
+    def _register_arg(command_parser: ArgumentParser, arg: _Arg):
         '''Register an arg in the specified argparser.
 
         :param command_parser: global argparser or a subparser corresponding to a CLI command
-        :param str arg_name: handler param name without prefixing dashes
-        :param arg: arg type, default value, and action
+        :param arg: arg name, type, default value, and action
         '''
 
+        arg_name = arg.name
+        metavar = arg.metavar
+
+        if metavar is None and isinstance(arg.choices, ChoiceProvider):
+            metavar = arg_name if arg.default is None else arg_name.upper()
+
         if arg.default is None:
             arg_prefixed_names = []
 
@@ -211,16 +648,31 @@ class Cliar:
                 help=arg.help
             )
 
-        elif arg.nargs:
+        elif isinstance(arg.type, ValuesConverter):
             command_parser.add_argument(
+                *arg_prefixed_names,
+                dest=arg_name,
+                default=arg.default,
+                nargs=arg.nargs,
+                action=ValuesAction,
+                converter=arg.type,
+                argfiles=arg.argfiles,
+                metavar=metavar,
+                help=arg.help
+            )
+
+        elif arg.nargs:
+            action = command_parser.add_argument(
                 *arg_prefixed_names,
                 dest=arg_name,
                 type=arg.type,
                 default=arg.default,
                 nargs=arg.nargs,
-                metavar=arg.metavar,
+                choices=arg.choices,
+                metavar=metavar,
                 help=arg.help
             )
+            action.argfiles = arg.argfiles
 
         else:
             command_parser.add_argument(
@@ -228,15 +680,16 @@ class Cliar:
                 dest=arg_name,
                 type=arg.type,
                 default=arg.default,
-                metavar=arg.metavar,
+                choices=arg.choices,
+                metavar=metavar,
                 help=arg.help
             )
 
-    def _get_handlers(self) -> List[Callable]:
+    def _get_handlers(self) -> Dict[str, Callable]:
         '''Get all handlers except ``self._root``.'''
 
-        return (
-            method
+        return OrderedDict(
+            (method_name, method)
             for method_name, method in getmembers(self, predicate=ismethod)
             if not method_name.startswith('_') and not hasattr(method, '_ignore')
         )
@@ -250,55 +703,267 @@ class Cliar:
             if not member_name.startswith('_')
         }
 
-    def _register_commands(self, handlers: Iterable[Callable]):
+    def _register_commands(self, handler_names: Iterable[str]):
         '''Create parsers for commands from handlers (except for ``self._root``).'''
 
-        for handler in handlers:
-            command = _Command(handler)
+        for handler_name in handler_names:
+            command = self._get_command(handler_name)
 
             command_parser = self._command_parsers.add_parser(
                 command.name,
-                help=handler.__doc__.splitlines()[0] if handler.__doc__ else '',
-                description=handler.__doc__,
+                help=command.help,
+                description=command.description,
                 formatter_class=command.formatter_class,
                 aliases=command.aliases
             )
             command_parser.set_defaults(_command=command)
 
-            for arg_name, arg in command.args.items():
-                self._register_arg(command_parser, arg_name, arg)
+            for arg in command.args:
+                self._register_arg(command_parser, arg)
 
             self._commands[command.name] = command
 
             for alias in command.aliases:
                 self._commands[alias] = command
 
+    def _register_subcli(self, subcli_name: str) -> 'Cliar':
+        '''Create a nested CLI and register its parser as a command.
+
+        Plugins are imported at this point, and their placeholders are replaced.
+        '''
+
+        if subcli_name in self._placeholders:
+            remove_placeholder(self, subcli_name)
+
+        subcli = self._subcli_classes[subcli_name](subcli_name, self)
+        self._subclis[subcli_name] = subcli
+
+        return subcli
+
+    def _register_all(self, plugins: bool = False):
+        '''Register all the commands and nested CLIs that haven't been registered yet.
+
+        Plugins get placeholders that list them in the help, unless ``plugins`` is true.
+        '''
+
+        registered_handler_names = {command.handler_name for command in self._commands.values()}
+
+        self._register_commands(
+            handler_name
+            for handler_name in OrderedDict.fromkeys(self._spec.handler_names.values())
+            if handler_name not in registered_handler_names
+        )
+
+        for subcli_name, subcli_class in self._subcli_classes.items():
+            if subcli_name in self._subclis:
+                continue
+
+            if not isinstance(subcli_class, Plugin) or plugins:
+                self._register_subcli(subcli_name)
+
+            elif subcli_name not in self._placeholders:
+                add_placeholder(self, subcli_name)
+
+    def _parse_args(self, args: List[str]):
+        '''Parse commandline args, building the missing parsers in lazy mode.
+
+        If a lazy CLI fails to parse the args, the full parser tree is built and the args are
+        parsed again, so that error messages are the same as in the eager mode.
+
+        With the fast engine, argparse is used only if the fast engine gives up. Values read
+        from stdin for ``@-`` are kept and replayed when the args are parsed again, so they're
+        kept only if the CLI is lazy or uses the fast engine.
+
+        Args are parsed one call at a time, so that calls from many threads, e.g. in daemon
+        mode, don't build the same lazy parsers at once.
+        '''
+
+        replayed = self._lazy or self._engine == 'fast'
+
+        with self._parse_lock, replaying_stdin() if replayed else nullcontext():
+            if self._engine == 'fast':
+                try:
+                    return fast_parse_args(self, args)
+
+                except Fallback:
+                    pass
+
+            if self._lazy or self._plugins:
+                register_required(self, args)
+
+            try:
+                return self._parser.parse_args(args)
+
+            except ParseError:
+                if not self._lazy:
+                    raise
+
+                self._lazy = False
+                self._build_parser()
+
+                return self._parse_args(args)
+
+    def _run(self, args: Iterable[str], stream_output: bool) -> Any:
+        '''Parse args and call the handler, raising exceptions instead of exiting.'''
+
+        with closing_files():
+            cli, result = call(self, list(args), stream_output)
+            result = close_after(result)
+
+        if result is NotImplemented:
+            raise HelpRequested(cli._parser)
+
+        return result
+
+    @ignore
+    def run(self, args: Iterable[str]):
+        '''Run the CLI with the given commandline args and return the handler result.
+
+        Unlike ``parse``, this method doesn't print help or error messages and never exits,
+        so it can be called many times in a single process. Parsers are built only once.
+
+        Iterators returned by generator handlers are returned as is, not written to stdout.
+
+        :param args: commandline args without the program name
+        :raises ParseError: if the args can't be parsed
+        :raises HelpRequested: if help is requested with ``-h``
+            or the handler returns ``NotImplemented``
+        '''
+
+        return self._run(args, stream_output=False)
+
+    @ignore
+    def batch(self, lines: Iterable[str], workers: int = 4) -> int:
+        '''Run many commands in a single process and print their output in order.
+
+        Each line is a call: commandline args quoted the way a shell does it or a JSON object
+        with ``command``, ``args``, and ``global_args`` keys. Sync handlers run in a thread pool,
+        coroutine handlers run concurrently on an event loop.
+
+        :param lines: calls, one per line
+        :param workers: number of threads for sync handlers
+        :returns: 0 if all calls succeed, otherwise the exit status of the first failed call
+        '''
+
+        from .batch import run_batch  # pylint: disable=import-outside-toplevel
+
+        return run_batch(self, lines, workers)
+
+    @ignore
+    def shell(self) -> int:
+        '''Run an interactive shell that reads commands in a loop and runs them in-process.
+
+        The parsers are built once and the CLI objects are reused, so state stored in ``self``
+        survives between commands. Use ``cd`` to enter nested CLIs, ``help`` to show help,
+        and ``exit`` or Ctrl+D to leave.
+
+        :returns: exit status
+        '''
+
+        from .shell import run_shell  # pylint: disable=import-outside-toplevel
+
+        return run_shell(self)
+
+    @ignore
+    def completion(self, shell: str, prog: str or None = None) -> str:
+        '''Generate a static completion script with all commands, nested CLIs, options,
+        and choices of this CLI, so that completion doesn't run Python.
+
+        :param shell: ``bash``, ``zsh``, or ``fish``
+        :param prog: name of the command to complete; the program name of the CLI by default
+        :returns: script to be sourced by the shell
+        '''
+
+        from .completion import get_completion_script  # pylint: disable=import-outside-toplevel
+
+        return get_completion_script(self, shell, prog)
+
     @ignore
     def parse(self):
-        '''Parse commandline input, i.e. launch the CLI.'''
+        '''Parse commandline input, i.e. launch the CLI.
+
+        If the first arg is ``--batch`` or ``--shell`` and the root command has no such arg,
+        run the CLI in batch or shell mode. Likewise, ``--completion SHELL`` prints
+        the completion script for the shell.
+        '''
 
-        args = self._parser.parse_args()
+        args = sys.argv[1:]
 
-        command = args._command
-        command_args = {arg: vars(args)[arg] for arg in command.args}
-        inverse_arg_map = {arg: param for param, arg in command.arg_map.items()}
-        handler_args = {inverse_arg_map[arg]: value for arg, value in command_args.items()}
+        if self._profiler:
+            args = self._profiler.strip_args(args)
 
-        self.global_args = {
-            arg: value
-            for arg, value in vars(args).items()
-            if arg not in ['_command', *command_args.keys()]
-        }
-        for subcli in self._subclis:
-            subcli.global_args = self.global_args
+        run_mode(self, args)
+
+        help_key = self._get_help_key(args)
+
+        if help_key in self._spec.help_texts:
+            self._print_help(help_key)
+            sys.exit(0)
+
+        try:
+            with closing_files():
+                cli, result = call(self, args, stream_output=True)
+
+        except HelpRequested as help_requested:
+            self._print_help(help_key, help_requested.parser)
+            help_requested.parser.exit()
+
+        except ParseError as error:
+            ArgumentParser.error(error.parser, error.message)
+
+        if result is NotImplemented:
+            ArgumentParser.print_help(cli._parser)
+
+    @ignore
+    async def parse_async(self, args: Iterable[str] or None = None):
+        '''Parse commandline input and await the handler in the running event loop.
 
-        result = command.handler(**handler_args)
+        Use it to launch the CLI from async code, e.g. a web service or a notebook.
+        Help and errors are printed and exit the way they do in ``parse``.
+
+        :param args: commandline args without the program name; ``sys.argv[1:]`` by default
+        '''
+
+        args = sys.argv[1:] if args is None else list(args)
+
+        if self._profiler:
+            args = self._profiler.strip_args(args)
+
+        help_key = self._get_help_key(args)
+
+        if help_key in self._spec.help_texts:
+            self._print_help(help_key)
+            sys.exit(0)
+
+        try:
+            with closing_files():
+                cli, result = await call_async(self, args, stream_output=True)
+
+        except HelpRequested as help_requested:
+            self._print_help(help_key, help_requested.parser)
+            help_requested.parser.exit()
+
+        except ParseError as error:
+            ArgumentParser.error(error.parser, error.message)
+
+        if result is NotImplemented:
+            ArgumentParser.print_help(cli._parser)
+
+    @ignore
+    def serve(self, socket_path: str, idle_timeout: float or None = 600.0, workers: int = 4):
+        '''Serve the CLI over a Unix socket, i.e. launch it as a warm daemon.
+
+        Commands are sent to the server with ``python -m cliar.client SOCKET_PATH [ARGS...]``.
+
+        :param socket_path: path to the Unix socket
+        :param idle_timeout: seconds without requests after which the server stops;
+            ``None`` means never stop
+        :param workers: number of commands run concurrently
+        '''
 
-        if iscoroutine(result):
-            result = get_event_loop().run_until_complete(result)
+        from .server import serve  # pylint: disable=import-outside-toplevel
 
-        if result == NotImplemented:
-            command.handler.__self__._parser.print_help()
+        serve(self, socket_path, idle_timeout, workers)
 
     def _root(self):
         '''The root command, which corresponds to the script being called without any command.'''
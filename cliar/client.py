@@ -0,0 +1,156 @@
+'''Client for CLIs served with ``Cliar.serve``.
+
+The client forwards the commandline args, the working dir, the environment, and stdin
+to the server and streams stdout, stderr, and the exit status back. It doesn't import
+the CLI or its dependencies, so it starts fast.
+
+Run it with: ``python -m cliar.client SOCKET_PATH [ARGS...]``
+
+Messages in both directions are frames: one byte for the channel, four bytes for the payload
+length, and the payload.
+'''
+
+import json
+import os
+import socket
+import sys
+from struct import Struct
+from threading import Thread
+from typing import BinaryIO, List, Tuple
+
+
+REQUEST = b'r'
+STDIN = b'0'
+STDOUT = b'1'
+STDERR = b'2'
+EXIT = b'x'
+
+_header = Struct('>cI')
+
+_CHUNK_SIZE = 65536
+
+
+def send_frame(sock: socket.socket, channel: bytes, payload: bytes):
+    '''Send a frame with a payload to a channel.'''
+
+    sock.sendall(_header.pack(channel, len(payload)) + payload)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    '''Receive exactly ``size`` bytes.
+
+    :raises EOFError: if the connection is closed before all bytes are received
+    '''
+
+    chunks = []
+
+    while size:
+        chunk = sock.recv(min(size, _CHUNK_SIZE))
+
+        if not chunk:
+            raise EOFError('Connection closed')
+
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b''.join(chunks)
+
+
+def receive_frame(sock: socket.socket) -> Tuple[bytes, bytes]:
+    '''Receive a frame.
+
+    :returns: channel and payload
+    :raises EOFError: if the connection is closed
+    '''
+
+    channel, size = _header.unpack(_receive_exactly(sock, _header.size))
+
+    return channel, _receive_exactly(sock, size)
+
+
+def _read_chunk(stdin: BinaryIO) -> bytes:
+    '''Read whatever stdin has available, up to a chunk.
+
+    Real files are read with ``os.read`` to bypass the buffer lock, which would otherwise
+    block the interpreter shutdown while the forwarding thread waits for input.
+    '''
+
+    try:
+        return os.read(stdin.fileno(), _CHUNK_SIZE)
+
+    except (AttributeError, OSError, ValueError):
+        return stdin.read1(_CHUNK_SIZE) if hasattr(stdin, 'read1') else stdin.read(_CHUNK_SIZE)
+
+
+def _forward_stdin(sock: socket.socket, stdin: BinaryIO):
+    '''Send stdin to the server in chunks, finishing with an empty chunk.'''
+
+    try:
+        while True:
+            chunk = _read_chunk(stdin)
+
+            send_frame(sock, STDIN, chunk)
+
+            if not chunk:
+                break
+
+    except (OSError, ValueError):
+        pass
+
+
+def call(
+        socket_path: str,
+        args: List[str],
+        stdin: BinaryIO or None = None,
+        stdout: BinaryIO or None = None,
+        stderr: BinaryIO or None = None
+    ) -> int:
+    '''Run a command on the server and stream its output.
+
+    :param socket_path: path to the server's Unix socket
+    :param args: commandline args without the program name
+    :param stdin: stream to forward to the command's stdin, ``sys.stdin`` by default
+    :param stdout: stream to write the command's stdout to, ``sys.stdout`` by default
+    :param stderr: stream to write the command's stderr to, ``sys.stderr`` by default
+    :returns: exit status of the command
+    '''
+
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    stderr = stderr or sys.stderr.buffer
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+
+        request = {'args': args, 'cwd': os.getcwd(), 'env': dict(os.environ)}
+        send_frame(sock, REQUEST, json.dumps(request).encode())
+
+        Thread(target=_forward_stdin, args=(sock, stdin), daemon=True).start()
+
+        streams = {STDOUT: stdout, STDERR: stderr}
+
+        while True:
+            try:
+                channel, payload = receive_frame(sock)
+
+            except EOFError:
+                return 1
+
+            if channel == EXIT:
+                return int(payload)
+
+            streams[channel].write(payload)
+            streams[channel].flush()
+
+
+def main():
+    '''Forward the commandline args to the server and exit with the command's exit status.'''
+
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} SOCKET_PATH [ARGS...]')
+
+    sys.exit(call(sys.argv[1], sys.argv[2:]))
+
+
+if __name__ == '__main__':
+    main()
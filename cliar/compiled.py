@@ -0,0 +1,197 @@
+'''Ahead-of-time compiled CLIs.
+
+``cliar compile module:Class`` inspects a CLI class with all its commands and nested CLIs
+once and writes a Python module with:
+
+-   the specs of the CLI classes, pickled, so that the CLI starts without inspecting handler
+    signatures, type hints, and decorator maps
+-   help texts rendered for every command path, so that ``-h`` is printed without importing
+    the CLI module at all
+
+The compiled module imports the CLI module only when a command is called, installs the specs,
+and runs the CLI in lazy mode with the fast parser engine. If it was compiled with another
+version of Cliar, the specs are ignored and the CLI is inspected as usual.
+
+Help texts depend on the program name and the terminal width. They're rendered for the name
+of the compiled module and 80 columns by default and printed as is at any terminal width.
+
+Run ``cliar compile module:Class --check FILE`` to check that the compiled module is up to date
+with the CLI source.
+'''
+
+import os
+import pickle
+import sys
+from base64 import b64decode, b64encode
+from importlib import import_module
+from typing import Dict, Iterator, List, Tuple
+
+from . import __version__
+from .cache import _SPEC_FORMAT
+from .cliar import Cliar, _specs, get_help_key
+
+
+# pylint: disable=protected-access
+
+
+_TEMPLATE = """\'\'\'Compiled {target} CLI. Generated by ``cliar compile``, don't edit.
+
+Regenerate it with ``cliar compile {target} --output FILE`` when the CLI changes,
+and check it with ``cliar compile {target} --check FILE``.
+\'\'\'
+
+from cliar.compiled import launch
+
+
+TARGET = {target!r}
+
+FORMAT = {format!r}
+
+HELP_TEXTS = {{
+{help_texts}}}
+
+SPECS = (
+{specs}
+)
+
+
+def main():
+    launch(TARGET, FORMAT, HELP_TEXTS, SPECS)
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+def load_class(target: str) -> type:
+    '''Import a CLI class by its ``module:Class`` path.
+
+    :raises ValueError: if the path has no ``:``
+    :raises ImportError: if the module can't be imported
+    :raises AttributeError: if the module has no such class
+    '''
+
+    module_name, separator, qualname = target.partition(':')
+
+    if not separator:
+        raise ValueError(f'Expected module:Class, got {target}')
+
+    cli_class = import_module(module_name)
+
+    for name in qualname.split('.'):
+        cli_class = getattr(cli_class, name)
+
+    return cli_class
+
+
+def _walk(cli: Cliar, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], Cliar]]:
+    '''Yield the command paths and the parsers of a CLI, its commands, and its nested CLIs.'''
+
+    yield path, cli._parser
+
+    if not hasattr(cli, '_command_parsers'):
+        return
+
+    for name, parser in cli._command_parsers.choices.items():
+        if name in cli._placeholders:
+            continue
+
+        if name in cli._subclis:
+            yield from _walk(cli._subclis[name], (*path, name))
+
+        else:
+            yield (*path, name), parser
+
+
+def _walk_classes(cli: Cliar) -> Iterator[type]:
+    yield type(cli)
+
+    for subcli in cli._subclis.values():
+        yield from _walk_classes(subcli)
+
+
+def _get_help_key(prog: str, args: List[str]) -> Tuple or None:
+    '''Get the key of a compiled help text: the program name and the command path.
+
+    Compiled help texts are rendered for a fixed width, so unlike the stored help of a spec,
+    they're not keyed by the terminal width.
+    '''
+
+    help_key = get_help_key(prog, args)
+
+    return help_key and help_key[:2]
+
+
+def compile_cli(target: str, prog: str, width: int = 80) -> str:
+    '''Generate the source of the compiled module for a CLI class.
+
+    :param target: ``module:Class`` path to the CLI class
+    :param prog: program name used in the help texts
+    :param width: terminal width the help texts are rendered for
+    :raises pickle.PicklingError: if the specs can't be pickled, e.g. because of lambdas
+        used as arg types
+    '''
+
+    cli_class = load_class(target)
+
+    argv, columns = sys.argv[0], os.environ.get('COLUMNS')
+    sys.argv[0], os.environ['COLUMNS'] = prog, str(width)
+
+    try:
+        cli = cli_class()
+
+        help_texts = {
+            _get_help_key(prog, [*path, '-h']): parser.format_help()
+            for path, parser in _walk(cli)
+        }
+
+    finally:
+        sys.argv[0] = argv
+
+        if columns is None:
+            del os.environ['COLUMNS']
+
+        else:
+            os.environ['COLUMNS'] = columns
+
+    specs = {
+        spec_class: _specs[spec_class]
+        for spec_class in dict.fromkeys(_walk_classes(cli))
+    }
+
+    try:
+        pickled_specs = b64encode(pickle.dumps(specs, protocol=4)).decode()
+
+    except Exception as error:  # pylint: disable=broad-except
+        raise pickle.PicklingError(f"Can't pickle the specs of {target}: {error}")
+
+    return _TEMPLATE.format(
+        target=target,
+        format=(__version__, _SPEC_FORMAT),
+        help_texts=''.join(f'    {key!r}: {text!r},\n' for key, text in help_texts.items()),
+        specs='\n'.join(
+            f'    {pickled_specs[start:start+88]!r}'
+            for start in range(0, len(pickled_specs), 88)
+        )
+    )
+
+
+def launch(target: str, spec_format: tuple, help_texts: Dict[Tuple, str], specs: str):
+    '''Run a compiled CLI: print the help for the invoked command or import the CLI class,
+    install the compiled specs, and parse the commandline.
+    '''
+
+    help_text = help_texts.get(_get_help_key(os.path.basename(sys.argv[0]), sys.argv[1:]))
+
+    if help_text is not None:
+        sys.stdout.write(help_text)
+        sys.exit(0)
+
+    cli_class = load_class(target)
+
+    if spec_format == (__version__, _SPEC_FORMAT):
+        for spec_class, spec in pickle.loads(b64decode(specs)).items():
+            _specs.setdefault(spec_class, spec)
+
+    cli_class(lazy=True, engine='fast').parse()
@@ -0,0 +1,524 @@
+'''Static shell completion scripts generated from the command tree of a CLI.
+
+The script contains the whole tree: commands and their aliases, nested CLIs, options
+with their short names, and choices, so pressing TAB never starts Python. Values of file
+args are completed with file names.
+
+Each script has a fingerprint of the tree in its header. When the CLI changes, the fingerprint
+of the new tree doesn't match the one in the installed script, which tells that the script
+is stale and must be generated again.
+'''
+
+import json
+import re
+from argparse import ArgumentParser, FileType, _SubParsersAction
+from collections import OrderedDict
+from hashlib import sha256
+from pathlib import PurePath
+from typing import Any, Dict, List, Tuple
+
+from .choices import ChoiceProvider
+from .files import FileMapper, FileOpener
+from .inputs import LineReader
+
+
+# pylint: disable=protected-access
+
+
+SHELLS = ('bash', 'zsh', 'fish')
+
+_FORMAT_VERSION = 1
+
+_fingerprint_pattern = re.compile(r'^# cliar completion fingerprint: (\w+)$', re.MULTILINE)
+
+_file_types = (FileType, FileMapper, FileOpener, LineReader)
+
+
+def _get_value_kind(action) -> Any:
+    '''Get what an arg takes: a list of choices, ``'dynamic'`` for choices computed at runtime,
+    ``'file'``, or ``None`` for anything.
+    '''
+
+    if isinstance(action.choices, ChoiceProvider):
+        return 'dynamic'
+
+    if action.choices is not None:
+        return [str(choice) for choice in action.choices]
+
+    typ = action.type
+
+    if isinstance(typ, _file_types) or (isinstance(typ, type) and issubclass(typ, PurePath)):
+        return 'file'
+
+    return None
+
+
+def _register_tree(cli):
+    '''Register all commands of a CLI and its nested CLIs, however deep.'''
+
+    cli._register_all(plugins=True)
+
+    for subcli in cli._subclis.values():
+        _register_tree(subcli)
+
+
+def _add_nodes(parser: ArgumentParser, path: str, nodes: Dict[str, Dict]):
+    '''Describe a parser and its subparsers as nodes keyed by path, e.g. ``/remote/add``.
+
+    A node has its ``commands`` mapped to the names and aliases that invoke them,
+    ``options`` mapped to what they take (``False`` for flags), ``words`` that can be given
+    as positional args, positional args with ``dynamic`` choices, and the ``files`` flag
+    if a positional arg takes a file.
+    '''
+
+    node = {
+        'commands': OrderedDict(),
+        'options': OrderedDict(),
+        'words': [],
+        'dynamic': [],
+        'files': False
+    }
+    nodes[path] = node
+
+    for action in parser._actions:
+        if isinstance(action, _SubParsersAction):
+            names_by_parser = OrderedDict()
+
+            for name, subparser in action.choices.items():
+                names_by_parser.setdefault(subparser, []).append(name)
+
+            for subparser, names in names_by_parser.items():
+                node['commands'][names[0]] = names
+                _add_nodes(subparser, f'{path}/{names[0]}', nodes)
+
+        elif action.option_strings:
+            value_kind = _get_value_kind(action) if action.nargs != 0 else False
+
+            for option in action.option_strings:
+                node['options'][option] = value_kind
+
+        else:
+            value_kind = _get_value_kind(action)
+
+            if value_kind == 'file':
+                node['files'] = True
+
+            elif value_kind == 'dynamic':
+                node['dynamic'].append(action.dest)
+
+            elif value_kind:
+                node['words'].extend(value_kind)
+
+
+def get_tree(cli) -> Dict[str, Dict]:
+    '''Get the command tree of a CLI as nodes keyed by path; the root node's path is ``''``.
+
+    All commands of a lazy CLI are registered to get the full tree.
+    '''
+
+    _register_tree(cli)
+
+    nodes = OrderedDict()
+    _add_nodes(cli._parser, '', nodes)
+
+    return nodes
+
+
+def _get_fingerprint(tree: Dict[str, Dict], prog: str, shell: str) -> str:
+    data = json.dumps([_FORMAT_VERSION, shell, prog, tree], sort_keys=True)
+
+    return sha256(data.encode()).hexdigest()[:16]
+
+
+def _quote(word: str, shell: str) -> str:
+    '''Quote a word as a literal for the shell.'''
+
+    if shell == 'fish':
+        return "'" + word.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+    return "'" + word.replace("'", "'\\''") + "'"
+
+
+def _quote_all(words: List[str], shell: str) -> str:
+    return ' '.join(_quote(word, shell) for word in words)
+
+
+def _get_cases(tree: Dict[str, Dict]) -> Dict[str, List]:
+    '''Get the patterns and the lines of the case statements that walk the tree.
+
+    ``transitions`` enter nested commands and skip option values, ``values`` complete
+    option values, and ``nodes`` complete options, commands, and positional args.
+    '''
+
+    transitions, values, nodes = [], [], []
+
+    for path, node in tree.items():
+        for name, names in node['commands'].items():
+            patterns = [f'{path}/{alias}' for alias in names]
+            transitions.append((patterns, ('node', f'{path}/{name}')))
+
+        value_options = [
+            option for option, value_kind in node['options'].items() if value_kind is not False
+        ]
+
+        if value_options:
+            transitions.append(([f'{path}/{option}' for option in value_options], ('skip', '')))
+
+        for option in value_options:
+            value_kind = node['options'][option]
+
+            if value_kind == 'file':
+                value = ('files', '')
+
+            elif value_kind == 'dynamic':
+                value = ('dynamic', '')
+
+            elif value_kind:
+                value = ('words', value_kind)
+
+            else:
+                continue
+
+            if values and values[-1][1] == value and values[-1][0][0].startswith(f'{path}/-'):
+                values[-1][0].append(f'{path}/{option}')
+
+            else:
+                values.append(([f'{path}/{option}'], value))
+
+        words = [name for names in node['commands'].values() for name in names]
+
+        nodes.append((
+            [path],
+            (list(node['options']), [*words, *node['words']], node['dynamic'], node['files'])
+        ))
+
+    return {'transitions': transitions, 'values': values, 'nodes': nodes}
+
+
+def _get_function_name(prog: str) -> str:
+    return '_cliar_' + re.sub(r'\W', '_', prog)
+
+
+def _get_choices_command(prog: str, shell: str, arg: str) -> str:
+    '''Get the command that prints the choices computed at runtime for an arg of the current
+    node, ignoring errors.
+    '''
+
+    return f'{_quote(prog, shell)} --cliar-choices "$node" {arg} 2>/dev/null'
+
+
+def _get_bash_value_completion(action: str, value: List[str], prev_choices: str, zsh: bool) -> str:
+    '''Get the bash or zsh command that completes an option value.'''
+
+    if action == 'files':
+        return '_files' if zsh else 'COMPREPLY=($(compgen -f -- "$cur"))'
+
+    if action == 'dynamic' and zsh:
+        return f'compadd -- ${{(f)"$({prev_choices})"}}'
+
+    if action == 'dynamic':
+        return f'COMPREPLY=($(compgen -W "$({prev_choices})" -- "$cur"))'
+
+    if zsh:
+        return f'compadd -- {_quote_all(value, "zsh")}'
+
+    return f'COMPREPLY=($(compgen -W {_quote(" ".join(value), "bash")} -- "$cur"))'
+
+
+def _render_bash_cases(cases: Dict[str, List], prog: str, zsh: bool) -> List[str]:
+    '''Render the case statements that walk the tree and complete option values
+    for bash or zsh.
+    '''
+
+    shell = 'zsh' if zsh else 'bash'
+    prev_choices = _get_choices_command(prog, shell, '"$prev"')
+
+    def patterns(paths: List[str]) -> str:
+        return '|'.join(_quote(path, shell) for path in paths)
+
+    lines = [
+        '        prev="$word"',
+        '',
+        '        if ((skip)); then',
+        '            skip=0',
+        '            continue',
+        '        fi',
+        '',
+        '        case "$node/$word" in',
+    ]
+
+    for paths, (action, value) in cases['transitions']:
+        if action == 'node':
+            lines.append(f'            {patterns(paths)}) node={_quote(value, shell)} ;;')
+
+        else:
+            lines.append(f'            {patterns(paths)}) skip=1 ;;')
+
+    lines.extend([
+        '        esac',
+        '    done',
+        '',
+        '    if ((skip)); then',
+        '        case "$node/$prev" in',
+    ])
+
+    for paths, (action, value) in cases['values']:
+        completion = _get_bash_value_completion(action, value, prev_choices, zsh)
+        lines.append(f'            {patterns(paths)}) {completion} ;;')
+
+    lines.extend([
+        '        esac',
+        '',
+        '        return 0',
+        '    fi',
+        '',
+        '    case "$node" in',
+    ])
+
+    for paths, (options, words, dynamic, files) in cases['nodes']:
+        lines.append(
+            f'        {patterns(paths)}) opts=({_quote_all(options, shell)});'
+            f' cmds=({_quote_all(words, shell)}); dyn=({_quote_all(dynamic, shell)});'
+            f' files={int(files)} ;;'
+        )
+
+    lines.extend([
+        '    esac',
+        '',
+    ])
+
+    return lines
+
+
+def _render_bash(tree: Dict[str, Dict], prog: str, zsh: bool = False) -> List[str]:
+    '''Render the completion function for bash or zsh; they share the syntax used here.'''
+
+    shell = 'zsh' if zsh else 'bash'
+    function_name = _get_function_name(prog)
+    arg_choices = _get_choices_command(prog, shell, '"$arg"')
+
+    if zsh:
+        lines = [
+            f'#compdef {prog}',
+            '',
+            f'{function_name}() {{',
+            '    local node="" word prev cur="${words[CURRENT]}" skip=0 files=0 arg i',
+            '    local -a opts cmds dyn',
+            '',
+            '    for ((i = 2; i < CURRENT; i++)); do',
+            '        word="${words[i]}"',
+        ]
+
+    else:
+        lines = [
+            f'{function_name}() {{',
+            '    local node="" word prev cur="${COMP_WORDS[COMP_CWORD]}" skip=0 files=0 arg i',
+            '    local -a opts cmds dyn',
+            '    COMPREPLY=()',
+            '',
+            '    for ((i = 1; i < COMP_CWORD; i++)); do',
+            '        word="${COMP_WORDS[i]}"',
+        ]
+
+    lines.extend(_render_bash_cases(_get_cases(tree), prog, zsh))
+
+    if zsh:
+        lines.extend([
+            '    if [[ "$cur" == -* ]]; then',
+            '        compadd -- "${opts[@]}"',
+            '    else',
+            '        compadd -- "${cmds[@]}"',
+            '',
+            '        for arg in "${dyn[@]}"; do',
+            f'            compadd -- ${{(f)"$({arg_choices})"}}',
+            '        done',
+            '',
+            '        ((files)) && _files',
+            '    fi',
+            '}',
+            '',
+            f'compdef {function_name} {_quote(prog, shell)}',
+        ])
+
+    else:
+        lines.extend([
+            '    if [[ "$cur" == -* ]]; then',
+            '        COMPREPLY=($(compgen -W "${opts[*]}" -- "$cur"))',
+            '    else',
+            '        COMPREPLY=($(compgen -W "${cmds[*]}" -- "$cur"))',
+            '',
+            '        for arg in "${dyn[@]}"; do',
+            f'            COMPREPLY+=($(compgen -W "$({arg_choices})" -- "$cur"))',
+            '        done',
+            '',
+            '        ((files)) && COMPREPLY+=($(compgen -f -- "$cur"))',
+            '    fi',
+            '',
+            '    return 0',
+            '}',
+            '',
+            f'complete -o filenames -F {function_name} {_quote(prog, shell)}',
+        ])
+
+    return lines
+
+
+def _render_fish_node(node: Tuple, prog: str) -> List[str]:
+    '''Render the completion of the options, commands, and positional args of a node for fish.'''
+
+    options, words, dynamic, files = node
+
+    lines = ['            if string match -q -- "-*" "$cur"']
+
+    if options:
+        lines.append(f"                printf '%s\\n' {_quote_all(options, 'fish')}")
+
+    if words or dynamic or files:
+        lines.append('            else')
+
+    if words:
+        lines.append(f"                printf '%s\\n' {_quote_all(words, 'fish')}")
+
+    for arg in dynamic:
+        command = _get_choices_command(prog, 'fish', _quote(arg, 'fish'))
+        lines.append(f'                {command}')
+
+    if files:
+        lines.append('                __fish_complete_path "$cur"')
+
+    lines.append('            end')
+
+    return lines
+
+
+def _render_fish(tree: Dict[str, Dict], prog: str) -> List[str]:
+    '''Render the completion function for fish.'''
+
+    function_name = _get_function_name(prog)
+    cases = _get_cases(tree)
+
+    def patterns(paths: List[str]) -> str:
+        return _quote_all(paths, 'fish')
+
+    lines = [
+        f'function {function_name}',
+        '    set -l tokens (commandline -opc)',
+        '    set -l cur (commandline -ct)',
+        "    set -l node ''",
+        '    set -l skip 0',
+        '',
+        '    for word in $tokens[2..-1]',
+        '        if test $skip = 1',
+        '            set skip 0',
+        '            continue',
+        '        end',
+        '',
+        '        switch "$node/$word"',
+    ]
+
+    for paths, (action, value) in cases['transitions']:
+        lines.append(f'            case {patterns(paths)}')
+
+        if action == 'node':
+            lines.append(f"                set node {_quote(value, 'fish')}")
+
+        else:
+            lines.append('                set skip 1')
+
+    lines.extend([
+        '        end',
+        '    end',
+        '',
+        '    if test $skip = 1',
+        '        switch "$node/$tokens[-1]"',
+    ])
+
+    for paths, (action, value) in cases['values']:
+        lines.append(f'            case {patterns(paths)}')
+
+        if action == 'files':
+            lines.append('                __fish_complete_path "$cur"')
+
+        elif action == 'dynamic':
+            lines.append(f"                {_get_choices_command(prog, 'fish', '$tokens[-1]')}")
+
+        else:
+            lines.append(f"                printf '%s\\n' {_quote_all(value, 'fish')}")
+
+    lines.extend([
+        '        end',
+        '',
+        '        return',
+        '    end',
+        '',
+        '    switch "$node"',
+    ])
+
+    for paths, node in cases['nodes']:
+        lines.append(f'        case {patterns(paths)}')
+        lines.extend(_render_fish_node(node, prog))
+
+    lines.extend([
+        '    end',
+        'end',
+        '',
+        f"complete -c {_quote(prog, 'fish')} -f -a '({function_name})'",
+    ])
+
+    return lines
+
+
+def get_completion_script(cli, shell: str, prog: str or None = None) -> str:
+    '''Generate a completion script for a CLI.
+
+    :param cli: root CLI
+    :param shell: ``bash``, ``zsh``, or ``fish``
+    :param prog: name of the command to complete; the program name of the CLI by default
+    '''
+
+    if shell not in SHELLS:
+        raise ValueError(f'Unknown shell: {shell}')
+
+    prog = prog or cli._parser.prog
+    tree = get_tree(cli)
+
+    if shell == 'fish':
+        lines = _render_fish(tree, prog)
+
+    else:
+        lines = _render_bash(tree, prog, zsh=shell == 'zsh')
+
+    header = [
+        f'# {shell} completion for {prog}, generated by Cliar. Do not edit.',
+        f'# cliar completion fingerprint: {_get_fingerprint(tree, prog, shell)}',
+        '',
+    ]
+
+    if shell == 'zsh':
+        lines = [lines[0], *header, *lines[1:]]
+
+    else:
+        lines = [*header, *lines]
+
+    return '\n'.join(lines) + '\n'
+
+
+def is_stale(cli, script: str, shell: str, prog: str or None = None) -> bool:
+    '''Check if a completion script was generated for another version of the CLI.
+
+    :param cli: root CLI
+    :param script: contents of the installed completion script
+    :param shell: ``bash``, ``zsh``, or ``fish``
+    :param prog: name of the command the script completes; the program name of the CLI
+        by default
+    '''
+
+    if shell not in SHELLS:
+        raise ValueError(f'Unknown shell: {shell}')
+
+    match = _fingerprint_pattern.search(script)
+
+    if not match:
+        return True
+
+    return match.group(1) != _get_fingerprint(get_tree(cli), prog or cli._parser.prog, shell)
@@ -0,0 +1,242 @@
+'''Converters that turn commandline values into values of the param annotations.
+
+Each annotation is compiled into a converter once and the converter is shared by all params
+with the same annotation in all commands. Besides plain types, which are called
+with the value, these annotations are supported:
+
+-   ``Optional[T]``: converted as ``T``, e.g. ``Optional[List[int]]`` is a list of ints
+-   ``Union[T1, T2, ...]``: the first type that accepts the value wins
+-   ``Literal[...]``: one of the literal values; they're also the arg choices
+-   ``Enum`` subclasses: member name or value
+-   ``Dict[K, V]``: many ``KEY=VALUE`` pairs
+-   ``datetime``, ``date``, and ``time``: ISO 8601 strings
+
+Register a converter for any other type with ``register_converter``.
+
+Converters are classes rather than closures so that specs with them can be pickled
+into the spec cache.
+'''
+
+from argparse import Action, ArgumentError, ArgumentTypeError
+from datetime import date, datetime, time
+from enum import Enum
+from inspect import isclass
+from typing import Any, Callable, Dict, Iterable, List, Union
+
+from .argfiles import expand
+
+
+# pylint: disable=too-few-public-methods
+
+
+_NoneType = type(None)
+
+_registry = {}
+
+_compiled = {}
+
+
+def register_converter(typ: type, converter: Callable[[str], Any]):
+    '''Convert commandline values of params annotated with a type or its subclasses
+    with a function.
+
+    Registered converters take precedence over the built-in ones. Register them before
+    creating the CLI.
+
+    :param typ: type of the params
+    :param converter: function that takes the commandline value and returns the param value;
+        it raises ``ValueError`` or ``TypeError`` if the value is invalid
+    '''
+
+    _registry[typ] = converter
+    _compiled.clear()
+
+
+class ValuesConverter:
+    '''Converter that gets all values of a list arg at once rather than one by one.'''
+
+    def __call__(self, values: Iterable[str]) -> Any:
+        raise NotImplementedError
+
+
+class ValuesAction(Action):
+    '''Argparse action that stores all values of an arg converted with a ``ValuesConverter``.
+
+    :param argfiles: replace ``@PATH`` values with the values from the files
+    '''
+
+    def __init__(self, *args, converter: ValuesConverter, argfiles: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.converter = converter
+        self.argfiles = argfiles
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        try:
+            setattr(
+                namespace,
+                self.dest,
+                self.converter(expand(values) if self.argfiles else values)
+            )
+
+        except (ValueError, ArgumentTypeError) as error:
+            raise ArgumentError(self, str(error)) from error
+
+
+class IsoFormatConverter:
+    '''Converter for ``datetime``, ``date``, and ``time`` values in the ISO 8601 format.'''
+
+    def __init__(self, typ: type):
+        self.type = typ
+        self.__name__ = typ.__name__
+
+    def __call__(self, value: str) -> Any:
+        return self.type.fromisoformat(value)
+
+
+class UnionConverter:
+    '''Converter that tries the converters of the union members in order.'''
+
+    def __init__(self, converters: List[Callable]):
+        self.converters = converters
+        self.__name__ = ' or '.join(
+            getattr(converter, '__name__', 'str') for converter in converters
+        )
+
+    def __call__(self, value: str) -> Any:
+        for converter in self.converters:
+            try:
+                return converter(value)
+
+            except (TypeError, ValueError, ArgumentTypeError):
+                continue
+
+        raise ValueError(value)
+
+
+class LiteralConverter:
+    '''Converter that finds the literal value with the same string form.
+
+    Unknown values are returned as is, so that the arg choices report them.
+    '''
+
+    def __init__(self, values: tuple):
+        self.values = values
+        self.__name__ = 'literal'
+        self._by_string = {str(literal): literal for literal in values}
+
+    def __call__(self, value: str) -> Any:
+        return self._by_string.get(value, value)
+
+
+class EnumConverter:
+    '''Converter that finds the enum member by name or by the string form of its value.'''
+
+    def __init__(self, enum: type):
+        self.enum = enum
+        self.__name__ = enum.__name__
+        self._by_string = {str(member.value): member for member in enum}
+        self._by_string.update(enum.__members__)
+
+    def __call__(self, value: str) -> Enum:
+        try:
+            return self._by_string[value]
+
+        except KeyError:
+            raise ValueError(value) from None
+
+
+class DictConverter(ValuesConverter):
+    '''Converter that collects ``KEY=VALUE`` pairs into a dict.'''
+
+    def __init__(self, key_converter: Callable, value_converter: Callable):
+        self.key_converter = key_converter
+        self.value_converter = value_converter
+
+    def __call__(self, values: Iterable[str]) -> Dict:
+        pairs = {}
+
+        for pair in values:
+            key, separator, value = pair.partition('=')
+
+            if not separator:
+                raise ValueError(f'expected KEY=VALUE: {pair!r}')
+
+            try:
+                pairs[self.key_converter(key)] = self.value_converter(value)
+
+            except (TypeError, ValueError):
+                raise ValueError(f'invalid pair: {pair!r}') from None
+
+        return pairs
+
+
+def unwrap_optional(annotation):
+    '''Get ``T`` from ``Optional[T]``; other annotations are returned as is.'''
+
+    if getattr(annotation, '__origin__', None) is Union:
+        members = [member for member in annotation.__args__ if member is not _NoneType]
+
+        if len(members) == 1:
+            return members[0]
+
+    return annotation
+
+
+def _is_literal(origin) -> bool:
+    return repr(origin) in ('typing.Literal', 'typing_extensions.Literal')
+
+
+def _compile(annotation) -> Callable or None:
+    '''Build the converter for an annotation.'''
+
+    # pylint: disable=too-many-return-statements
+
+    for typ in getattr(annotation, '__mro__', (annotation,)):
+        if typ in _registry:
+            return _registry[typ]
+
+    if unwrap_optional(annotation) is not annotation:
+        return get_converter(unwrap_optional(annotation))
+
+    origin = getattr(annotation, '__origin__', None)
+    args = getattr(annotation, '__args__', None) or ()
+
+    if origin is Union:
+        return UnionConverter(
+            [get_converter(member) or str for member in args if member is not _NoneType]
+        )
+
+    if _is_literal(origin):
+        return LiteralConverter(args)
+
+    if origin is dict:
+        key_type, value_type = args if len(args) == 2 else (str, str)
+
+        return DictConverter(get_converter(key_type) or str, get_converter(value_type) or str)
+
+    if isclass(annotation) and issubclass(annotation, Enum):
+        return EnumConverter(annotation)
+
+    if annotation in (datetime, date, time):
+        return IsoFormatConverter(annotation)
+
+    return annotation if callable(annotation) else None
+
+
+def get_converter(annotation) -> Callable or None:
+    '''Get the converter for an annotation, compiling it on the first call.
+
+    :returns: function that converts a commandline value, or ``None`` if values are
+        passed as strings
+    '''
+
+    try:
+        return _compiled[annotation]
+
+    except KeyError:
+        converter = _compiled[annotation] = _compile(annotation)
+
+    except TypeError:
+        converter = annotation if callable(annotation) else None
+
+    return converter
@@ -0,0 +1,279 @@
+'''Fast commandline parser driven directly by command specs.
+
+The parser walks the commandline args once, looking up commands, nested CLIs, and options
+in dicts built from the command specs. It handles only the plain cases: exact option names,
+``--option=value``, and positional args. Anything else, e.g. abbreviated or combined options,
+help flags, ``--``, invalid values, or missing args, makes it give up with ``Fallback``,
+and the args are parsed again with argparse, which renders help and error messages.
+
+The parsing result is the same namespace that argparse would produce for the same args.
+'''
+
+import re
+from argparse import ArgumentTypeError, Namespace
+from typing import Any, Dict, List
+
+from .argfiles import expand
+from .converters import ValuesConverter
+
+
+# pylint: disable=protected-access
+
+
+_negative_number = re.compile(r'^-\d+$|^-\d*\.\d+$')
+
+
+class Fallback(Exception):
+    '''The args can't be parsed on the fast path and must be parsed with argparse.'''
+
+
+def _get_options(command) -> Dict[str, Any]:
+    '''Map prefixed option names to the args of a command.'''
+
+    options = {}
+
+    for arg in command.args:
+        if arg.default is not None:
+            options['--'+arg.name] = arg
+
+            if arg.short_name:
+                options['-'+arg.short_name] = arg
+
+    return options
+
+
+def _is_option(token: str, options: Dict[str, Any]) -> bool:
+    '''Check if a token is an option, the way argparse does it.
+
+    :raises Fallback: if the token looks like an unknown option
+    '''
+
+    if not token.startswith('-') or token == '-':
+        return False
+
+    if token in options or token.partition('=')[0] in options:
+        return True
+
+    if _negative_number.match(token):
+        return False
+
+    raise Fallback
+
+
+def _convert(arg, value: str, check_choices: bool = True) -> Any:
+    '''Cast a commandline value to the arg type and check that it's one of the arg choices.
+
+    Like argparse, default values are not checked against the choices.
+    '''
+
+    if arg.type:
+        try:
+            value = arg.type(value)
+
+        except (TypeError, ValueError, ArgumentTypeError):
+            raise Fallback from None
+
+    if check_choices and arg.choices is not None and value not in arg.choices:
+        raise Fallback
+
+    return value
+
+
+def _convert_values(arg, values: List[str]) -> Any:
+    '''Cast the values of a list arg, reading ``@PATH`` argument files if the arg allows them;
+    array and dict args are converted in a single pass.
+    '''
+
+    if arg.argfiles:
+        values = expand(values)
+
+    try:
+        if isinstance(arg.type, ValuesConverter):
+            return arg.type(values)
+
+        return [_convert(arg, value) for value in values]
+
+    except (ValueError, ArgumentTypeError):
+        raise Fallback from None
+
+
+def _parse_command(command, args: List[str], namespace: Dict[str, Any], has_subcommands: bool):
+    '''Parse the args of a single command into ``namespace``.
+
+    :param command: command whose args are parsed
+    :param args: commandline args
+    :param namespace: parsed values by arg name
+    :param has_subcommands: the command is the root command of a CLI with commands,
+        so the first extra positional arg is a command name
+    :returns: the args starting with the command name or ``None`` if there's no command
+    '''
+
+    # pylint: disable=too-many-branches, too-many-locals, too-many-statements
+
+    options = _get_options(command)
+    positionals = [arg for arg in command.args if arg.default is None]
+
+    if any(arg.action for arg in positionals):
+        raise Fallback
+
+    if has_subcommands and any(arg.nargs for arg in positionals):
+        raise Fallback
+
+    seen = set()
+    position = 0
+    index = 0
+
+    while index < len(args):
+        token = args[index]
+
+        if _is_option(token, options):
+            option, has_value, value = token.partition('=')
+            arg = options[option]
+            seen.add(arg.name)
+            index += 1
+
+            if arg.action:
+                if has_value:
+                    raise Fallback
+
+                namespace[arg.name] = True
+
+            elif not arg.nargs:
+                if not has_value:
+                    if index == len(args) or _is_option(args[index], options):
+                        raise Fallback
+
+                    value = args[index]
+                    index += 1
+
+                namespace[arg.name] = _convert(arg, value)
+
+            else:
+                if has_value:
+                    raise Fallback
+
+                start = index
+
+                while index < len(args) and not _is_option(args[index], options):
+                    index += 1
+
+                if arg.nargs == '+' and index == start:
+                    raise Fallback
+
+                namespace[arg.name] = _convert_values(arg, args[start:index])
+
+            continue
+
+        remaining = positionals[position:]
+        end = index
+
+        while end < len(args) and not _is_option(args[end], options):
+            end += 1
+
+            if has_subcommands and end - index > len(remaining):
+                break
+
+        run = args[index:end]
+
+        if has_subcommands and len(run) > len(remaining):
+            for arg, value in zip(remaining, run):
+                namespace[arg.name] = _convert(arg, value)
+
+            _set_defaults(command, namespace, seen)
+
+            return args[index+len(remaining):]
+
+        matched = remaining[:len(run)]
+        variadic = [arg for arg in matched if arg.nargs]
+
+        if not matched or not variadic and len(run) > len(matched):
+            raise Fallback
+
+        variadic_count = len(run) - len(matched) + 1
+
+        for arg in matched:
+            if variadic and arg is variadic[0]:
+                namespace[arg.name] = _convert_values(arg, run[:variadic_count])
+                run = run[variadic_count:]
+
+            elif arg.nargs:
+                namespace[arg.name] = _convert_values(arg, run[:1])
+                run = run[1:]
+
+            else:
+                namespace[arg.name] = _convert(arg, run[0])
+                run = run[1:]
+
+        position += len(matched)
+        index = end
+
+    if position < len(positionals):
+        raise Fallback
+
+    _set_defaults(command, namespace, seen)
+
+    return None
+
+
+def _set_defaults(command, namespace: Dict[str, Any], seen: set):
+    '''Set default values for the options that weren't passed.
+
+    Like argparse, cast string defaults to the arg type.
+    '''
+
+    for arg in command.args:
+        if arg.default is None or arg.name in seen:
+            continue
+
+        if isinstance(arg.default, str) and not arg.action:
+            namespace[arg.name] = _convert(arg, arg.default, check_choices=False)
+
+        else:
+            namespace[arg.name] = arg.default
+
+
+def parse_args(cli, args: List[str]) -> Namespace:
+    '''Parse commandline args for a CLI.
+
+    Nested CLIs are created on demand if the CLI is lazy, but command parsers are never built.
+
+    :param cli: root CLI
+    :param args: commandline args
+    :raises Fallback: if the args must be parsed with argparse
+    '''
+
+    namespace = {}
+
+    while True:
+        namespace['_cli'] = cli
+        namespace['_command'] = cli.root_command
+
+        spec = cli._spec
+        rest = _parse_command(
+            cli.root_command,
+            args,
+            namespace,
+            bool(spec.handler_names or cli._subcli_classes)
+        )
+
+        if rest is None:
+            break
+
+        name, args = rest[0], rest[1:]
+
+        if name in cli._subcli_classes:
+            cli = cli._subclis.get(name) or cli._register_subcli(name)
+            continue
+
+        if name not in spec.handler_names:
+            raise Fallback
+
+        command = cli._get_command(spec.handler_names[name])
+        namespace['_command'] = command
+
+        if _parse_command(command, args, namespace, False) is not None:
+            raise Fallback
+
+        break
+
+    return Namespace(**namespace)
@@ -0,0 +1,63 @@
+'''Exceptions that ``Cliar.run`` raises instead of printing messages and exiting,
+and the exception of failed fan-out calls.
+'''
+
+from argparse import ArgumentParser
+from typing import Any, Dict
+
+
+class CliarError(Exception):
+    '''Base class for the exceptions that ``Cliar.run`` raises instead of exiting.'''
+
+
+class ParseError(CliarError):
+    '''Commandline args can't be parsed.
+
+    It carries the parser that reported the error so that the error can be rendered
+    exactly the way argparse does it.
+    '''
+
+    status = 2
+
+    def __init__(self, parser: ArgumentParser, message: str):
+        super().__init__(f'{parser.prog}: error: {message}')
+        self.parser = parser
+        self.message = message
+
+    @property
+    def usage(self) -> str:
+        '''Usage message of the command that failed to parse its args.'''
+
+        return self.parser.format_usage()
+
+
+class HelpRequested(CliarError):
+    '''Help message was requested with ``-h`` or by a handler returning ``NotImplemented``.'''
+
+    status = 0
+
+    def __init__(self, parser: ArgumentParser):
+        super().__init__(parser.prog)
+        self.parser = parser
+
+    @property
+    def help(self) -> str:
+        '''Help message of the requested command.'''
+
+        return self.parser.format_help()
+
+
+class FanOutError(Exception):
+    '''Some calls of a fan-out handler failed.
+
+    :param errors: exceptions by chunk index
+    :param results: results of the successful calls by chunk index
+    '''
+
+    def __init__(self, errors: Dict[int, BaseException], results: Dict[int, Any]):
+        super().__init__(
+            f'{len(errors)} of {len(errors) + len(results)} calls failed: '
+            + '; '.join(f'{type(error).__name__}: {error}' for error in errors.values())
+        )
+        self.errors = errors
+        self.results = results
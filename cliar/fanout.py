@@ -0,0 +1,258 @@
+'''Fan-out handlers: a handler decorated with ``fan_out`` is called for chunks of one of its
+list params in parallel, and gets a ``--jobs`` option that sets the number of parallel calls.
+
+Sync handlers run in a thread pool or, with ``executor='process'``, in a process pool. Async
+handlers run concurrently on the event loop, at most ``--jobs`` at a time. With 0 jobs,
+the default, ``CLIAR_JOBS`` env var or the number of CPUs is used.
+
+The handler returns a list with the results of the calls, or ``None`` if all of them are
+``None``. Results are in the order of the chunks or, if ``ordered`` is false, in the order
+the calls finish.
+
+If a call fails and ``fail_fast`` is true, the calls that haven't started are cancelled
+and the exception is raised right away, without waiting for the running calls. Otherwise,
+all calls run and ``FanOutError`` with all the exceptions is raised in the end.
+
+In a process pool, each worker creates its own CLI object, so the CLI class, the chunks,
+and the results must be picklable.
+'''
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from functools import partial, wraps
+from inspect import Parameter, iscoroutinefunction, signature, unwrap
+from typing import Any, Callable, Dict, List, Tuple
+
+from .errors import FanOutError
+
+
+def get_jobs(jobs: int) -> int:
+    '''Get the number of parallel calls: ``jobs``, ``CLIAR_JOBS`` env var,
+    or the number of CPUs.
+    '''
+
+    return jobs or int(os.environ.get('CLIAR_JOBS') or 0) or os.cpu_count() or 1
+
+
+def _call_in_process(
+        cli_class: type,
+        handler_name: str,
+        global_args: Dict,
+        kwargs: Dict,
+        chunk: List
+    ) -> Any:
+    '''Call the original handler of a fan-out command with a CLI created in a worker process.
+
+    The original handler and the fan-out param are found by the ``_fan_out_handler``
+    and ``_fan_out_param`` attributes of the fan-out wrapper rather than by ``__wrapped__``,
+    which points to the wrong function when other decorators are stacked above or below
+    ``fan_out``.
+    '''
+
+    # pylint: disable=protected-access
+
+    cli = cli_class(lazy=True)
+    cli.global_args = global_args
+
+    wrapper = unwrap(
+        getattr(cli_class, handler_name),
+        stop=lambda function: hasattr(function, '_fan_out_handler')
+    )
+
+    return wrapper._fan_out_handler(cli, **kwargs, **{wrapper._fan_out_param: chunk})
+
+
+def _collect(
+        outcomes: List[Tuple[int, Any, BaseException or None]],
+        ordered: bool
+    ) -> List[Any] or None:
+    '''Get the results of the finished calls or raise their exceptions.
+
+    :param outcomes: chunk index, result, and exception of each call in the order they finished
+    '''
+
+    errors = {index: error for index, _, error in outcomes if error is not None}
+    results = {index: result for index, result, error in outcomes if error is None}
+
+    if errors:
+        raise FanOutError(errors, results)
+
+    if ordered:
+        outcomes = sorted(outcomes, key=lambda outcome: outcome[0])
+
+    values = [result for _, result, _ in outcomes]
+
+    return None if all(value is None for value in values) else values
+
+
+def _run_in_pool(
+        call: Callable,
+        chunks: List[List],
+        options: Dict,
+        pool,
+        in_context: bool = False
+    ) -> List or None:
+    '''Submit all chunks to the pool and collect the outcomes as the calls finish.
+
+    :param in_context: run each call in a copy of the caller's context, so that calls
+        in worker threads see its context vars, like global args and redirected streams
+    '''
+
+    futures = {
+        (
+            pool.submit(copy_context().run, call, chunk) if in_context
+            else pool.submit(call, chunk)
+        ): index
+        for index, chunk in enumerate(chunks)
+    }
+    outcomes = []
+
+    try:
+        for future in as_completed(futures):
+            error = future.exception()
+
+            if error is not None and options['fail_fast']:
+                raise error
+
+            outcomes.append((futures[future], None if error else future.result(), error))
+
+    finally:
+        for future in futures:
+            future.cancel()
+
+    return _collect(outcomes, options['ordered'])
+
+
+async def _run_async(call: Callable, chunks: List[List], options: Dict, jobs: int) -> List or None:
+    '''Await the calls for all chunks, at most ``jobs`` at a time, and collect the outcomes
+    as the calls finish.
+    '''
+
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    semaphore = asyncio.Semaphore(jobs)
+
+    async def call_chunk(index: int, chunk: List) -> Tuple[int, Any, Exception or None]:
+        async with semaphore:
+            try:
+                return index, await call(chunk), None
+
+            except Exception as error:  # pylint: disable=broad-except
+                return index, None, error
+
+    tasks = [asyncio.ensure_future(call_chunk(index, chunk)) for index, chunk in enumerate(chunks)]
+    outcomes = []
+
+    try:
+        for next_outcome in asyncio.as_completed(tasks):
+            outcome = await next_outcome
+
+            if outcome[2] is not None and options['fail_fast']:
+                raise outcome[2]
+
+            outcomes.append(outcome)
+
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return _collect(outcomes, options['ordered'])
+
+
+def make_fan_out(handler: Callable, options: Dict) -> Callable:
+    '''Wrap a handler so that it's called for chunks of the fan-out param in parallel.
+
+    The wrapper has the signature of the handler with an extra ``jobs`` param, so the command
+    gets ``--jobs`` option.
+    '''
+
+    param_name = options['param']
+    handler_signature = signature(handler)
+
+    if param_name not in handler_signature.parameters:
+        raise NameError(f'{handler.__name__} has no param {param_name}')
+
+    if 'jobs' in handler_signature.parameters:
+        raise NameError(f'{handler.__name__} already has a jobs param')
+
+    def get_chunks(kwargs: Dict) -> List[List]:
+        items = kwargs[param_name]
+        size = options['chunk_size']
+
+        if not hasattr(items, '__getitem__'):
+            items = list(items)
+
+        return [items[start:start+size] for start in range(0, len(items), size)]
+
+    if iscoroutinefunction(handler):
+        @wraps(handler)
+        async def async_wrapper(self, jobs: int = 0, **kwargs):
+            async def call(chunk):
+                return await handler(self, **{**kwargs, param_name: chunk})
+
+            return await _run_async(call, get_chunks(kwargs), options, get_jobs(jobs))
+
+        wrapper = async_wrapper
+
+    else:
+        @wraps(handler)
+        def sync_wrapper(self, jobs: int = 0, **kwargs):
+            if options['executor'] == 'process':
+                # pylint: disable=import-outside-toplevel
+                from concurrent.futures import ProcessPoolExecutor
+
+                pool = ProcessPoolExecutor(get_jobs(jobs))
+                call = partial(
+                    _call_in_process,
+                    type(self),
+                    handler.__name__,
+                    self.global_args,
+                    {name: value for name, value in kwargs.items() if name != param_name}
+                )
+
+            else:
+                pool = ThreadPoolExecutor(get_jobs(jobs))
+
+                def call(chunk):
+                    return handler(self, **{**kwargs, param_name: chunk})
+
+            try:
+                return _run_in_pool(
+                    call,
+                    get_chunks(kwargs),
+                    options,
+                    pool,
+                    in_context=isinstance(pool, ThreadPoolExecutor)
+                )
+
+            finally:
+                # Pending calls are already cancelled, so don't wait for the running ones
+                # after a failure.
+                pool.shutdown(wait=False)
+
+        wrapper = sync_wrapper
+
+    params = list(handler_signature.parameters.values())
+    position = len(params) - (params and params[-1].kind == Parameter.VAR_KEYWORD)
+    params.insert(position, Parameter('jobs', Parameter.KEYWORD_ONLY, default=0, annotation=int))
+
+    wrapper.__signature__ = handler_signature.replace(parameters=params)
+    wrapper.__annotations__ = {**getattr(handler, '__annotations__', {}), 'jobs': int}
+    wrapper._fan_out_handler = handler  # pylint: disable=protected-access
+    wrapper._fan_out_param = param_name  # pylint: disable=protected-access
+
+    short_names = {
+        getattr(handler, '_sharg_map', {}).get(name, name[0])
+        for name in handler_signature.parameters if name != 'self'
+    }
+    wrapper._sharg_map = {  # pylint: disable=protected-access
+        **getattr(handler, '_sharg_map', {}),
+        'jobs': '' if 'j' in short_names else 'j'
+    }
+    wrapper._help_map = {  # pylint: disable=protected-access
+        **getattr(handler, '_help_map', {}),
+        'jobs': 'number of parallel calls; CLIAR_JOBS env var or the number of CPUs by default'
+    }
+
+    return wrapper
@@ -0,0 +1,228 @@
+'''File params: handler params typed as ``MappedFile``, ``memoryview``, or file objects.
+
+Such a param takes a path on the commandline, and the handler gets the file opened
+or memory-mapped:
+
+-   ``MappedFile`` is a read-only ``mmap`` of the file; its contents are paged in by the OS
+    on access instead of being copied into the Python heap
+-   ``memoryview`` is a read-only view of such a map; empty files give an empty view
+-   ``BinaryIO`` and ``TextIO`` are the file opened for reading in binary or text mode;
+    ``-`` means stdin
+
+Files are opened when the args are parsed, so a missing file is reported as a usage error,
+and closed when the handler returns, including async and generator handlers. If the handler
+returns an iterator that ``Cliar.run`` passes to the caller, the files are closed when it's
+exhausted or closed.
+'''
+
+import mmap
+import os
+import sys
+from argparse import ArgumentTypeError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, BinaryIO, Callable, IO, List, TextIO
+from weakref import finalize
+
+from .streaming import is_stream
+
+
+_open_files = ContextVar('open_files', default=None)
+
+
+def _track(resource: Any) -> Any:
+    '''Close the resource when the current call ends.
+
+    Outside of a call, the resource is closed when it's garbage collected.
+    '''
+
+    open_files = _open_files.get()
+
+    if open_files is not None:
+        open_files.append(resource)
+
+    return resource
+
+
+def _close(resources: List[Any]):
+    '''Close the resources in reverse order.'''
+
+    for resource in reversed(resources):
+        try:
+            if isinstance(resource, memoryview):
+                resource.release()
+
+            else:
+                resource.close()
+
+        except (BufferError, OSError):
+            pass
+
+
+@contextmanager
+def closing_files():
+    '''Close the files opened for file params while the block runs, in reverse order.'''
+
+    open_files = []
+    token = _open_files.set(open_files)
+
+    try:
+        yield
+
+    finally:
+        _open_files.reset(token)
+        _close(open_files)
+
+
+def close_after(result: Any) -> Any:
+    '''Keep the files of the current call open until the result, an iterator or an async
+    iterator, is exhausted, closed, or garbage collected, instead of closing them at the end
+    of the ``closing_files`` block.
+
+    :returns: the result, wrapped in a generator if there are open files
+    '''
+
+    open_files = _open_files.get()
+
+    if not open_files or not is_stream(result):
+        return result
+
+    resources = open_files[:]
+    open_files.clear()
+
+    if hasattr(result, '__anext__'):
+        async def closing_async():
+            try:
+                async for record in result:
+                    yield record
+
+            finally:
+                _close(resources)
+
+        wrapper = closing_async()
+
+    else:
+        def closing():
+            try:
+                yield from result
+
+            finally:
+                _close(resources)
+
+        wrapper = closing()
+
+    # A generator closed before it starts doesn't run its finally clause.
+    finalize(wrapper, _close, resources)
+
+    return wrapper
+
+
+def _open(path: str, binary: bool) -> IO:
+    '''Open a file for reading.
+
+    :raises ArgumentTypeError: if the file can't be opened
+    '''
+
+    try:
+        if binary:
+            return open(path, 'rb')  # pylint: disable=consider-using-with
+
+        return open(path, 'r', encoding='utf-8')  # pylint: disable=consider-using-with
+
+    except OSError as error:
+        raise ArgumentTypeError(f"can't open '{path}': {error}") from error
+
+
+class MappedFile(mmap.mmap):
+    '''Read-only memory map of a file.
+
+    Use it as a handler param type to get the file mapped into memory. The file's ``path``
+    is available as an attribute.
+    '''
+
+    path = None
+
+    @classmethod
+    def open(cls, path: str) -> 'MappedFile':
+        '''Map a file into memory.
+
+        :raises ArgumentTypeError: if the file can't be opened or is empty
+        '''
+
+        with _open(path, binary=True) as file:
+            return cls._map(file, path)
+
+    @classmethod
+    def _map(cls, file: BinaryIO, path: str) -> 'MappedFile':
+        try:
+            mapped_file = cls(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        except (OSError, ValueError) as error:
+            raise ArgumentTypeError(f"can't map '{path}': {error}") from error
+
+        mapped_file.path = path
+
+        return mapped_file
+
+
+class FileMapper:
+    '''Commandline arg type that memory-maps a file.
+
+    :param view: return a ``memoryview`` of the map instead of the map itself;
+        an empty file gives an empty view
+    '''
+
+    def __init__(self, view: bool = False):
+        self.view = view
+
+    def __call__(self, path: str) -> MappedFile or memoryview:
+        with _open(path, binary=True) as file:
+            if self.view and not os.fstat(file.fileno()).st_size:
+                return memoryview(b'')
+
+            mapped_file = _track(MappedFile._map(file, path))  # pylint: disable=protected-access
+
+        return _track(memoryview(mapped_file)) if self.view else mapped_file
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(view={self.view!r})'
+
+
+class FileOpener:
+    '''Commandline arg type that opens a file, or stdin for ``-``.
+
+    :param binary: open the file in binary mode
+    '''
+
+    def __init__(self, binary: bool = False):
+        self.binary = binary
+
+    def __call__(self, path: str) -> IO:
+        if path == '-':
+            return sys.stdin.buffer if self.binary else sys.stdin
+
+        return _track(_open(path, self.binary))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(binary={self.binary!r})'
+
+
+_file_types = {
+    MappedFile: FileMapper(),
+    memoryview: FileMapper(view=True),
+    BinaryIO: FileOpener(binary=True),
+    TextIO: FileOpener(),
+}
+
+
+def get_file_type(typ: Any) -> Callable or None:
+    '''Get the commandline arg type for a file param type.
+
+    :returns: the arg type or ``None`` if ``typ`` is not a file param type
+    '''
+
+    try:
+        return _file_types.get(typ)
+
+    except TypeError:
+        return None
@@ -0,0 +1,129 @@
+'''Hooks that observe every call of a CLI, e.g. to log, trace, or collect metrics.
+
+A hook is a function that takes an ``Invocation``. Hooks are added with ``Cliar.add_hook``
+for one of the events, which fire in this order:
+
+-   ``before_parse``: the commandline args are known
+-   ``after_parse``: the command is found and its args are parsed
+-   ``before_handler``: the handler args are ready
+-   ``after_handler``: the handler has returned and its output is written
+-   ``on_error``: parsing or the handler raised an exception, including ``HelpRequested``
+    and ``SystemExit``; the exception is raised again after the hooks
+
+Every call ends with either ``after_handler`` or ``on_error``.
+
+Hooks are shared by a CLI and its nested CLIs and fire for sync and async handlers alike.
+In batch mode, hooks fire for every line. When no hooks are added, other calls
+don't create invocations at all.
+'''
+
+from contextlib import contextmanager
+from time import perf_counter, time
+from typing import Any, Callable, Dict, Iterator, List
+
+from .errors import ParseError, HelpRequested
+
+
+EVENTS = ('before_parse', 'after_parse', 'before_handler', 'after_handler', 'on_error')
+
+
+def get_exit_status(error: BaseException) -> int:
+    '''Get the exit status a CLI launched with ``Cliar.parse`` exits with on an exception.'''
+
+    if isinstance(error, HelpRequested):
+        return 0
+
+    if isinstance(error, ParseError):
+        return 2
+
+    if isinstance(error, SystemExit):
+        if error.code is None or isinstance(error.code, int):
+            return error.code or 0
+
+        return 1
+
+    if isinstance(error, KeyboardInterrupt):
+        return 130
+
+    return 1
+
+
+class Invocation:
+    '''Single call of a CLI as seen by the hooks.
+
+    :param hooks: hooks by event
+    :param args: commandline args, or the JSON call in batch mode
+    '''
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, hooks: Dict[str, List[Callable]], args: Any):
+        self.args = args
+
+        #: command path, e.g. ``['remote', 'add']``; empty for the root command
+        self.command = []
+        self.handler_args = None
+        self.result = None
+        self.error = None
+        self.status = None
+
+        #: seconds spent in the ``parse`` and ``handler`` phases
+        self.phases = {}
+
+        #: wall clock time of the call start
+        self.time = time()
+
+        self._hooks = hooks
+        self._started_at = perf_counter()
+
+    @property
+    def duration(self) -> float:
+        '''Seconds since the call start.'''
+
+        return perf_counter() - self._started_at
+
+    def fire(self, event: str):
+        '''Call the hooks of the event.'''
+
+        for hook in self._hooks.get(event, ()):
+            hook(self)
+
+    @contextmanager
+    def phase(self, name: str):
+        '''Add the time of the block to a phase.'''
+
+        start = perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + perf_counter() - start
+
+
+@contextmanager
+def observe(hooks: Dict[str, List[Callable]], args: Any) -> Iterator[Invocation]:
+    '''Fire ``before_parse`` when the block starts, and ``after_handler`` or ``on_error``
+    when it ends.
+
+    ``after_parse`` and ``before_handler`` are fired in the block.
+
+    :param hooks: hooks by event
+    :param args: commandline args, or the JSON call in batch mode
+    :returns: invocation to fill in the block
+    '''
+
+    invocation = Invocation(hooks, args)
+    invocation.fire('before_parse')
+
+    try:
+        yield invocation
+
+    except BaseException as error:
+        invocation.error = error
+        invocation.status = get_exit_status(error)
+        invocation.fire('on_error')
+        raise
+
+    invocation.status = 0
+    invocation.fire('after_handler')
@@ -0,0 +1,86 @@
+'''Lazy input params: handler params typed as ``Iterator[T]`` or ``Iterable[T]``.
+
+Such a param takes a path on the commandline, or ``-`` for stdin, and the handler gets
+an iterator over the lines of the file. The file is opened when the args are parsed,
+so a missing file is reported as a usage error, but it's read only as the handler consumes
+the iterator, in chunks of ``buffer_size`` bytes, so memory use doesn't depend on the file size.
+The file is closed when the call ends, like the files of file params, even if the handler
+doesn't exhaust the iterator.
+
+Each line is stripped of the line break and converted with the element type: ``str`` lines
+are decoded as UTF-8, ``bytes`` lines are passed as is, and any other type is called with
+the decoded line.
+'''
+
+import sys
+from argparse import ArgumentTypeError
+from typing import Any, Callable, IO, Iterator
+
+from .files import _track
+
+
+class LineReader:
+    '''Commandline arg type that opens a file, or stdin for ``-``, and reads it lazily
+    line by line.
+
+    :param item_type: type to convert each line to
+    :param buffer_size: size of the chunks the file is read in
+    '''
+
+    def __init__(self, item_type: Callable = str, buffer_size: int = 65536):
+        self.item_type = item_type
+        self.buffer_size = buffer_size
+
+    def __call__(self, path: str) -> Iterator[Any]:
+        binary = self.item_type is bytes
+
+        if path == '-':
+            return self._read(sys.stdin.buffer if binary else sys.stdin, '<stdin>', close=False)
+
+        try:
+            lines = open(  # pylint: disable=consider-using-with
+                path,
+                'rb' if binary else 'r',
+                buffering=self.buffer_size,
+                **({} if binary else {'encoding': 'utf-8'})
+            )
+
+        except OSError as error:
+            raise ArgumentTypeError(f"can't open '{path}': {error}") from error
+
+        return self._read(_track(lines), path, close=True)
+
+    def _read(self, lines: IO, source: str, close: bool) -> Iterator[Any]:
+        '''Yield converted lines, closing the file when done or when the iterator is closed.'''
+
+        item_type = self.item_type
+
+        try:
+            if item_type is bytes:
+                for line in lines:
+                    yield line.rstrip(b'\r\n')
+
+            elif item_type is str:
+                for line in lines:
+                    yield line.rstrip('\n')
+
+            else:
+                for number, line in enumerate(lines, 1):
+                    line = line.rstrip('\n')
+
+                    try:
+                        item = item_type(line)
+
+                    except (TypeError, ValueError):
+                        raise ValueError(
+                            f'{source}:{number}: invalid {item_type.__name__} value: {line!r}'
+                        ) from None
+
+                    yield item
+
+        finally:
+            if close:
+                lines.close()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.item_type!r})'
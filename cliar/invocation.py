@@ -0,0 +1,109 @@
+'''Helpers for running many commands in a single process, concurrently or one after another.
+
+Commands print to ``sys.stdout`` and ``sys.stderr`` and report errors by exiting. To run
+commands side by side, the standard streams are replaced with proxies that write to
+a stream set for the current thread or asyncio task, and errors are turned into exit statuses.
+'''
+
+import sys
+import traceback
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Tuple
+
+from .errors import ParseError, HelpRequested
+
+
+class RedirectedStream:
+    '''Standard stream proxy that writes to the stream set for the current context.
+
+    Each thread and each asyncio task has its own context, so commands run side by side
+    don't see each other's streams.
+    '''
+
+    def __init__(self, name: str, default):
+        self._default = default
+        self._stream = ContextVar(name, default=None)
+
+    def redirect(self, stream):
+        '''Redirect the stream in the current context; ``None`` resets the redirection.'''
+
+        self._stream.set(stream)
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream.get() or self._default, name)
+
+
+@contextmanager
+def redirect_streams() -> Iterator[Tuple[RedirectedStream, RedirectedStream, RedirectedStream]]:
+    '''Replace the standard streams with proxies for the duration of the block.
+
+    If the streams are already replaced, the existing proxies are reused.
+
+    :returns: stdin, stdout, and stderr proxies
+    '''
+
+    original_streams = sys.stdin, sys.stdout, sys.stderr
+
+    if all(isinstance(stream, RedirectedStream) for stream in original_streams):
+        yield original_streams
+        return
+
+    sys.stdin, sys.stdout, sys.stderr = (
+        RedirectedStream(name, stream)
+        for name, stream in zip(('stdin', 'stdout', 'stderr'), original_streams)
+    )
+
+    try:
+        yield sys.stdin, sys.stdout, sys.stderr
+
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = original_streams
+
+
+class ExitStatus:
+    '''Context manager that renders help and errors the way ``Cliar.parse`` does
+    and stores the exit status instead of exiting.
+
+    ``KeyboardInterrupt`` and other exceptions that aren't subclasses of ``Exception``
+    are not caught.
+    '''
+
+    def __init__(self):
+        self.code = 0
+
+    def __enter__(self) -> 'ExitStatus':
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+        if exc_type is None:
+            return False
+
+        if issubclass(exc_type, HelpRequested):
+            ArgumentParser.print_help(exc_value.parser)
+            self.code = 0
+
+        elif issubclass(exc_type, ParseError):
+            try:
+                ArgumentParser.error(exc_value.parser, exc_value.message)
+
+            except SystemExit as exit_request:
+                self.code = exit_request.code
+
+        elif issubclass(exc_type, SystemExit):
+            if exc_value.code is None or isinstance(exc_value.code, int):
+                self.code = exc_value.code or 0
+
+            else:
+                print(exc_value.code, file=sys.stderr)
+                self.code = 1
+
+        elif issubclass(exc_type, Exception):
+            traceback.print_exception(exc_type, exc_value, exc_traceback)
+            self.code = 1
+
+        else:
+            return False
+
+        return True
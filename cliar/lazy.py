@@ -0,0 +1,103 @@
+'''Lazy mode: register only the commands and nested CLIs needed to parse the given args.
+
+The command is located in the args with the root args of each CLI on the path. If it can't be
+located, all commands of the CLI are registered, and argparse handles the args as usual.
+'''
+
+from typing import List
+
+
+# pylint: disable=protected-access
+
+
+def _locate_command(cli, args: List[str]) -> int or None:
+    '''Find the command name in commandline args without building the command parsers.
+
+    Only the root args of the CLI are taken into account, so anything unusual, like
+    abbreviated or unknown options, help flags, or variadic root args, makes the lookup fail.
+
+    :param cli: CLI
+    :param args: commandline args passed to the CLI
+    :returns: index of the command name, ``len(args)`` if no command is given,
+        or ``None`` if the command can't be located
+    '''
+
+    option_actions = cli._parser._option_string_actions
+
+    positionals_left = 0
+
+    for arg in cli.root_command.args:
+        if arg.default is None:
+            if arg.nargs:
+                return None
+
+            positionals_left += 1
+
+    index = 0
+
+    while index < len(args):
+        token = args[index]
+
+        if token == '--':
+            return None
+
+        if token.startswith('-') and token != '-':
+            option, has_value, _ = token.partition('=')
+            action = option_actions.get(option)
+
+            if action is None or option in ('-h', '--help'):
+                return None
+
+            if action.nargs is None and not has_value:
+                index += 1
+
+            elif action.nargs not in (0, None):
+                return None
+
+        elif positionals_left:
+            positionals_left -= 1
+
+        else:
+            return index
+
+        index += 1
+
+    return len(args)
+
+
+def register_required(cli, args: List[str]):
+    '''Register only the commands and nested CLIs needed to parse the given args.
+
+    If the invoked command can't be determined, all commands of the CLI are registered
+    to let argparse handle the args.
+
+    :param cli: CLI
+    :param args: commandline args passed to the CLI
+    '''
+
+    index = _locate_command(cli, args)
+
+    if index == len(args):
+        return
+
+    if index is None:
+        cli._register_all()
+
+        for arg in args:
+            if arg in cli._placeholders:
+                cli._register_subcli(arg)
+
+    elif args[index] in cli._subclis:
+        register_required(cli._subclis[args[index]], args[index+1:])
+
+    elif args[index] in cli._subcli_classes:
+        register_required(cli._register_subcli(args[index]), args[index+1:])
+
+    elif args[index] in cli._commands:
+        return
+
+    elif args[index] in cli._spec.handler_names:
+        cli._register_commands([cli._spec.handler_names[args[index]]])
+
+    else:
+        cli._register_all()
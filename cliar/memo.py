@@ -0,0 +1,375 @@
+'''Memoized commands: results of a handler decorated with ``memoize`` are stored on disk
+and returned without calling the handler while they're fresh.
+
+An entry is keyed by the CLI class, the command path, the handler args, and the global args.
+It's reused for ``ttl`` seconds and until the file with the handler changes. Each command keeps
+its entries in a separate dir bounded by ``max_size`` bytes: when it grows larger, the least
+recently used entries are removed.
+
+Results are pickled. Unpicklable results, args, and async iterators are not cached. Iterators
+returned by generator handlers are collected into lists, so cached records are streamed again
+on a hit.
+
+The command gets ``--no-cache`` flag to call the handler without using the cache and
+``--refresh`` flag to call the handler and replace the cached result.
+``CLIAR_NO_RESULT_CACHE`` and ``CLIAR_REFRESH`` env vars do the same for all commands.
+``CLIAR_NO_CACHE``, which disables the spec cache, doesn't affect the results.
+
+Entries are written to temp files and moved in place, so concurrent processes never read
+partial entries. On Unix, processes and threads that miss the same entry at the same time wait
+for the first one to store it instead of calling the handler too. Async handlers wait for
+the lock in a thread, so the event loop keeps running.
+
+Each entry has its own lock file, so a handler can call memoized commands, itself included,
+and calls with different args never wait for each other. A lock file is removed with its
+entry only if nobody holds it, and a process that locks a removed file opens the new one and
+locks it again.
+'''
+
+import os
+import pickle
+from contextlib import asynccontextmanager, contextmanager
+from functools import wraps
+from hashlib import sha256
+from inspect import Parameter, iscoroutinefunction, signature, unwrap
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import time
+from typing import IO, Any, AsyncIterator, Callable, Dict, Iterator, Tuple
+
+from .cache import evict, get_cache_dir, get_sources
+
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
+
+_flags = ('no_cache', 'refresh')
+
+_missing = object()
+
+
+def _get_results_dir() -> Path:
+    return get_cache_dir() / 'results'
+
+
+def _get_entry_path(cli, handler: Callable, handler_args: Dict[str, Any]) -> Path or None:
+    '''Get the path to the cache entry of a call.
+
+    :returns: the path, or ``None`` if the args can't be pickled
+    '''
+
+    cli_class = type(cli)
+    command = '/'.join((*cli._path, handler.__name__))  # pylint: disable=protected-access
+    command_key = f'{cli_class.__module__}.{cli_class.__qualname__}:{command}'
+
+    try:
+        args_key = pickle.dumps(
+            (sorted(handler_args.items()), sorted(cli.global_args.items())),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    return (
+        _get_results_dir()
+        / sha256(command_key.encode()).hexdigest()
+        / f'{sha256(args_key).hexdigest()}.pickle'
+    )
+
+
+def _load(entry_path: Path, handler: Callable, ttl: float or None) -> Tuple[bool, Any]:
+    '''Load the cached result of a call.
+
+    :returns: whether the result was an iterator and the result, or ``_missing`` if there's
+        none, it's stale, or it can't be unpickled
+    '''
+
+    try:
+        with entry_path.open('rb') as entry_file:
+            stored_at, sources = pickle.load(entry_file)
+
+            if ttl is not None and time() - stored_at >= ttl:
+                return _missing
+
+            if sources != get_sources([unwrap(handler)]):
+                return _missing
+
+            result = pickle.load(entry_file)
+
+        os.utime(entry_path)
+
+        return result
+
+    except Exception:  # pylint: disable=broad-except
+        return _missing
+
+
+def _remove(entry_path: Path):
+    '''Remove the entry and its lock file unless somebody holds the lock.
+
+    :raises OSError: if the entry can't be removed
+    '''
+
+    entry_path.unlink()
+    _remove_lock(entry_path.with_suffix('.lock'))
+
+
+def _remove_lock(lock_path: Path):
+    '''Remove the lock file if nobody holds it.
+
+    The file is removed while locked, so a process waiting for it sees that it's gone
+    once it gets the lock.
+    '''
+
+    if fcntl is None:
+        return
+
+    try:
+        with lock_path.open('rb') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            lock_path.unlink()
+
+    except OSError:
+        pass
+
+
+def _save(entry_path: Path, handler: Callable, result: Tuple[bool, Any], max_size: int):
+    '''Store the result of a call and evict old entries if the command dir is too large.
+
+    Results that can't be pickled are not stored.
+
+    :param result: whether the result was an iterator and the result
+    '''
+
+    try:
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with NamedTemporaryFile('wb', dir=entry_path.parent, delete=False) as entry_file:
+            try:
+                pickle.dump((time(), get_sources([unwrap(handler)])), entry_file)
+                pickle.dump(result, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            except Exception:  # pylint: disable=broad-except
+                entry_file.close()
+                os.remove(entry_file.name)
+                return
+
+        os.replace(entry_file.name, entry_path)
+
+        evict(entry_path.parent.glob('*.pickle'), max_size, _remove)
+
+    except OSError:
+        pass
+
+
+def _lock(entry_path: Path) -> IO or None:
+    '''Open the lock file of the entry and wait for an exclusive lock on it.
+
+    If the file was removed while waiting, the new one is opened and locked instead.
+
+    :returns: the locked file, or ``None`` without ``fcntl`` or if it can't be created
+    '''
+
+    if fcntl is None:
+        return None
+
+    lock_path = entry_path.with_suffix('.lock')
+
+    while True:
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            # pylint: disable=consider-using-with
+            lock_file = open(lock_path, 'ab')
+
+        except OSError:
+            return None
+
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        try:
+            if os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                return lock_file
+
+        except OSError:
+            pass
+
+        lock_file.close()
+
+
+@contextmanager
+def _held(lock_file: IO or None):
+    if lock_file is None:
+        yield
+        return
+
+    with lock_file:
+        try:
+            yield
+
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _locked(entry_path: Path):
+    '''Hold an exclusive lock on the entry so that concurrent processes and threads
+    compute it once.
+
+    Without ``fcntl`` or if the lock file can't be created, nothing is locked.
+    '''
+
+    with _held(_lock(entry_path)):
+        yield
+
+
+@asynccontextmanager
+async def _locked_async(entry_path: Path):
+    '''Like ``_locked``, but wait for the lock in a thread so that other tasks keep running.'''
+
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    lock_file = await asyncio.get_running_loop().run_in_executor(None, _lock, entry_path)
+
+    with _held(lock_file):
+        yield
+
+
+def _get_mode(kwargs: Dict[str, Any]) -> str:
+    '''Pop the cache flags from the handler args and get the cache mode:
+    ``off``, ``refresh``, or ``on``.
+    '''
+
+    no_cache, refresh = (kwargs.pop(flag, False) for flag in _flags)
+
+    if no_cache or os.environ.get('CLIAR_NO_RESULT_CACHE', '') not in ('', '0'):
+        return 'off'
+
+    if refresh or os.environ.get('CLIAR_REFRESH', '') not in ('', '0'):
+        return 'refresh'
+
+    return 'on'
+
+
+def make_memoized(handler: Callable, options: Dict) -> Callable:
+    '''Wrap a handler so that its results are cached on disk.
+
+    The wrapper has the signature of the handler with extra ``no_cache`` and ``refresh`` params,
+    so the command gets ``--no-cache`` and ``--refresh`` flags.
+    '''
+
+    handler_signature = signature(handler)
+
+    for flag in _flags:
+        if flag in handler_signature.parameters:
+            raise NameError(f'{handler.__name__} already has a {flag} param')
+
+    def prepare(self, kwargs: Dict[str, Any]) -> Tuple[str, Path or None]:
+        mode = _get_mode(kwargs)
+
+        return mode, None if mode == 'off' else _get_entry_path(self, handler, kwargs)
+
+    if iscoroutinefunction(handler):
+        @wraps(handler)
+        async def async_wrapper(self, **kwargs):
+            mode, entry_path = prepare(self, kwargs)
+
+            if entry_path is None:
+                return await handler(self, **kwargs)
+
+            async with _locked_async(entry_path):
+                if mode == 'on':
+                    cached = _load(entry_path, handler, options['ttl'])
+
+                    if cached is not _missing:
+                        return cached[1]
+
+                result = await handler(self, **kwargs)
+                _save(entry_path, handler, (False, result), options['max_size'])
+
+            return result
+
+        wrapper = async_wrapper
+
+    else:
+        @wraps(handler)
+        def sync_wrapper(self, **kwargs):
+            mode, entry_path = prepare(self, kwargs)
+
+            if entry_path is None:
+                return handler(self, **kwargs)
+
+            with _locked(entry_path):
+                if mode == 'on':
+                    cached = _load(entry_path, handler, options['ttl'])
+
+                    if cached is not _missing:
+                        iterated, result = cached
+                        return iter(result) if iterated else result
+
+                result = handler(self, **kwargs)
+
+                if isinstance(result, AsyncIterator):
+                    return result
+
+                if isinstance(result, Iterator):
+                    result = list(result)
+                    _save(entry_path, handler, (True, result), options['max_size'])
+                    return iter(result)
+
+                _save(entry_path, handler, (False, result), options['max_size'])
+
+            return result
+
+        wrapper = sync_wrapper
+
+    params = list(handler_signature.parameters.values())
+    position = len(params) - (params and params[-1].kind == Parameter.VAR_KEYWORD)
+    params[position:position] = [
+        Parameter(flag, Parameter.KEYWORD_ONLY, default=False, annotation=bool) for flag in _flags
+    ]
+
+    wrapper.__signature__ = handler_signature.replace(parameters=params)
+    wrapper.__annotations__ = {
+        **getattr(handler, '__annotations__', {}),
+        **{flag: bool for flag in _flags}
+    }
+    wrapper._sharg_map = {  # pylint: disable=protected-access
+        **getattr(handler, '_sharg_map', {}),
+        **{flag: '' for flag in _flags}
+    }
+    wrapper._help_map = {  # pylint: disable=protected-access
+        **getattr(handler, '_help_map', {}),
+        'no_cache': 'call the command without using the cached result',
+        'refresh': 'call the command and replace the cached result'
+    }
+
+    return wrapper
+
+
+def clear_results() -> int:
+    '''Remove all cached command results.
+
+    :returns: number of removed results
+    '''
+
+    removed = 0
+
+    results_dir = _get_results_dir()
+
+    for entry_path in results_dir.glob('*/*.pickle'):
+        try:
+            _remove(entry_path)
+
+        except OSError:
+            continue
+
+        removed += 1
+
+    for lock_path in results_dir.glob('*/*.lock'):
+        _remove_lock(lock_path)
+
+    return removed
@@ -0,0 +1,89 @@
+'''Metrics emitter that records one JSON line per CLI call.
+
+Enable it with ``metrics`` param of ``Cliar`` or ``CLIAR_METRICS`` env var. The target is
+a file path, which the lines are appended to, or ``unix:PATH``, a Unix datagram socket
+the lines are sent to. Each line has:
+
+-   ``time``: Unix time of the call start
+-   ``pid``: process ID
+-   ``command``: space-separated command path, e.g. ``remote add``
+-   ``phases_ms``: time of the ``parse`` and ``handler`` phases
+-   ``duration_ms``: time of the whole call
+-   ``status``: exit status
+-   ``error``: exception class name if the call failed
+-   ``peak_rss``: peak resident memory of the process in bytes, Unix only
+
+Metrics never break a call: if the line can't be written, it's dropped.
+'''
+
+import json
+import os
+import socket
+import sys
+
+from .hooks import Invocation
+
+
+def _get_peak_rss() -> int or None:
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MetricsEmitter:
+    '''Hook for ``after_handler`` and ``on_error`` events that writes a metrics line.
+
+    :param target: file path or ``unix:PATH``
+    '''
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, target: str):
+        self.target = target
+        self._socket = None
+
+    def _send(self, line: bytes):
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._socket.setblocking(False)
+
+        self._socket.sendto(line, self.target[len('unix:'):])
+
+    def _append(self, line: bytes):
+        descriptor = os.open(self.target, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+        try:
+            os.write(descriptor, line)
+
+        finally:
+            os.close(descriptor)
+
+    def __call__(self, invocation: Invocation):
+        record = {
+            'time': invocation.time,
+            'pid': os.getpid(),
+            'command': ' '.join(invocation.command),
+            'phases_ms': {phase: duration * 1000 for phase, duration in invocation.phases.items()},
+            'duration_ms': invocation.duration * 1000,
+            'status': invocation.status,
+            'error': type(invocation.error).__name__ if invocation.error else None,
+            'peak_rss': _get_peak_rss(),
+        }
+
+        line = (json.dumps(record) + '\n').encode()
+
+        try:
+            if self.target.startswith('unix:'):
+                self._send(line)
+
+            else:
+                self._append(line)
+
+        except OSError:
+            pass
@@ -0,0 +1,138 @@
+'''Commandline modes of a root CLI, requested with the first arg instead of a command:
+``--batch FILE``, ``--shell``, ``--completion SHELL``, and the hidden ``--cliar-choices``
+used by the completion scripts.
+
+``--batch``, ``--shell``, and ``--completion`` are modes only if the root command has no arg
+with the same name.
+'''
+
+import sys
+from argparse import ArgumentParser, FileType
+from typing import List
+
+
+# pylint: disable=protected-access
+
+
+def _parse_batch_args(cli, args: List[str]):
+    '''Parse ``--batch FILE`` and ``--batch-workers N`` and run the batch.'''
+
+    batch_parser = ArgumentParser(prog=cli._parser.prog)
+    batch_parser.add_argument(
+        '--batch',
+        type=FileType('r', encoding='utf-8'),
+        required=True,
+        help='file with one call per line, - for stdin'
+    )
+    batch_parser.add_argument(
+        '--batch-workers',
+        type=int,
+        default=4,
+        help='number of threads for sync handlers'
+    )
+
+    batch_args = batch_parser.parse_args(args)
+
+    with batch_args.batch as lines:
+        sys.exit(cli.batch(lines, batch_args.batch_workers))
+
+
+def _parse_shell_args(cli, args: List[str]):
+    '''Parse ``--shell`` and run the interactive shell.'''
+
+    shell_parser = ArgumentParser(prog=cli._parser.prog)
+    shell_parser.add_argument(
+        '--shell',
+        action='store_true',
+        help='run commands interactively'
+    )
+    shell_parser.parse_args(args)
+
+    sys.exit(cli.shell())
+
+
+def _parse_completion_args(cli, args: List[str]):
+    '''Parse ``--completion SHELL`` and print the completion script, or check
+    an installed script with ``--check FILE``.
+    '''
+
+    from .completion import SHELLS, is_stale  # pylint: disable=import-outside-toplevel
+
+    completion_parser = ArgumentParser(prog=cli._parser.prog)
+    completion_parser.add_argument(
+        '--completion',
+        choices=SHELLS,
+        required=True,
+        help='print the completion script for the shell'
+    )
+    completion_parser.add_argument(
+        '--prog',
+        help='name of the command to complete'
+    )
+    completion_parser.add_argument(
+        '--check',
+        type=FileType('r', encoding='utf-8'),
+        metavar='FILE',
+        help='exit with 1 if the installed completion script is stale'
+    )
+
+    completion_args = completion_parser.parse_args(args)
+
+    if not completion_args.check:
+        print(cli.completion(completion_args.completion, completion_args.prog), end='')
+        sys.exit(0)
+
+    with completion_args.check as script:
+        if is_stale(cli, script.read(), completion_args.completion, completion_args.prog):
+            print(
+                f'{script.name} is stale, regenerate it with --completion',
+                file=sys.stderr
+            )
+            sys.exit(1)
+
+    sys.exit(0)
+
+
+def _print_choices(cli, args: List[str]):
+    '''Print the choices of an arg, one per line, for the completion scripts.
+
+    This is the hidden ``--cliar-choices PATH ARG`` mode, where ``PATH`` is the path
+    to the command, e.g. ``/remote/add``, and ``ARG`` is an option or a positional arg name.
+    '''
+
+    from .choices import get_choices  # pylint: disable=import-outside-toplevel
+
+    if len(args) != 2:
+        sys.exit(2)
+
+    for choice in get_choices(cli, *args):
+        print(choice)
+
+    sys.exit(0)
+
+
+def run_mode(cli, args: List[str]):
+    '''Run the mode requested with the first arg and exit, or return if no mode is requested.
+
+    :param cli: root CLI
+    :param args: commandline args without the program name
+    '''
+
+    mode = args[0].partition('=')[0] if args else None
+
+    if mode == '--cliar-choices':
+        _print_choices(cli, args[1:])
+
+    if (
+            mode not in ('--batch', '--shell', '--completion')
+            or any(arg.name == mode[2:] for arg in cli.root_command.args)
+        ):
+        return
+
+    if mode == '--batch':
+        _parse_batch_args(cli, args)
+
+    if mode == '--completion':
+        _parse_completion_args(cli, args)
+
+    _parse_shell_args(cli, args)
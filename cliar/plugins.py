@@ -0,0 +1,190 @@
+'''Plugin sub-CLIs discovered from package entry points.
+
+A package adds a nested CLI to a host CLI by declaring an entry point in the group the host
+CLI is created with, e.g. ``Cliar(plugins='myapp.plugins')``:
+
+.. code-block:: toml
+
+    [project.entry-points."myapp.plugins"]
+    deploy = "myapp_deploy.cli:Deploy"
+
+The entry point name is the command name, and the value is the ``Cliar`` subclass.
+
+Scanning the installed packages and importing the plugin modules to get their help is slow,
+so the names, the class paths, and the docstrings of the plugins are stored in an index in the cache
+dir. The index is rebuilt only when a dir on ``sys.path``, except the script dir, changes,
+e.g. when a package is installed or removed. With the index, a plugin module is imported only
+when its command is invoked or its help is requested.
+
+Set ``CLIAR_NO_CACHE`` env var to scan the entry points on every start.
+'''
+
+import json
+import os
+import sys
+from hashlib import sha256
+from importlib import import_module
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Dict, List, Tuple
+
+from .cache import _stat_sources, get_cache_dir, is_disabled
+
+
+class Plugin:
+    '''Nested CLI class from an entry point, imported on the first call.
+
+    :param name: command name
+    :param target: ``module:Class`` path to the CLI class
+    :param doc: docstring of the CLI class, which is the help of the command
+    '''
+
+    def __init__(self, name: str, target: str, doc: str or None):
+        self.name = name
+        self.target = target
+        self.doc = doc
+        self._cli_class = None
+
+    def load(self) -> type:
+        '''Import the CLI class.'''
+
+        if self._cli_class is None:
+            module_name, _, qualname = self.target.partition(':')
+            cli_class = import_module(module_name)
+
+            for name in filter(None, qualname.split('.')):
+                cli_class = getattr(cli_class, name)
+
+            self._cli_class = cli_class
+
+        return self._cli_class
+
+    def __call__(self, *args, **kwargs):
+        '''Create the nested CLI, importing its class if necessary.'''
+
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.name!r}, {self.target!r})'
+
+
+def _get_index_path(group: str) -> Path:
+    return get_cache_dir() / 'plugins' / f'{sha256(group.encode()).hexdigest()}.json'
+
+
+def _scan(group: str) -> List[Tuple[str, str, str or None]]:
+    '''Find the entry points in a group and import their classes to get the help.
+
+    Plugins that can't be imported are indexed without help, so that invoking them shows
+    the error.
+    '''
+
+    # pylint: disable=import-outside-toplevel
+    try:
+        from importlib.metadata import entry_points
+
+    except ImportError:
+        from importlib_metadata import entry_points
+
+    found = entry_points()
+    found = found.select(group=group) if hasattr(found, 'select') else found.get(group, ())
+
+    plugins = []
+
+    for entry_point in sorted(found, key=lambda entry_point: entry_point.name):
+        plugin = Plugin(entry_point.name, entry_point.value, None)
+
+        try:
+            plugin.doc = plugin.load().__doc__
+
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+        plugins.append((plugin.name, plugin.target, plugin.doc))
+
+    return plugins
+
+
+def _load_index(group: str, paths: Dict[str, Tuple[int, int]]) -> List or None:
+    '''Load the plugins of a group from the index if the dirs on ``sys.path`` haven't changed.'''
+
+    try:
+        with _get_index_path(group).open(encoding='utf-8') as index_file:
+            index = json.load(index_file)
+
+        if index['group'] != group or index['paths'] != {
+                path: list(stat) for path, stat in paths.items()
+            }:
+            return None
+
+        return index['plugins']
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_index(group: str, paths: Dict[str, Tuple[int, int]], plugins: List):
+    index_path = _get_index_path(group)
+
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with NamedTemporaryFile(
+                'w',
+                encoding='utf-8',
+                dir=index_path.parent,
+                delete=False
+            ) as index_file:
+            json.dump({'group': group, 'paths': paths, 'plugins': plugins}, index_file)
+
+        os.replace(index_file.name, index_path)
+
+    except OSError:
+        pass
+
+
+def discover(group: str) -> Dict[str, Plugin]:
+    '''Get the plugins of an entry point group from the index, rebuilding it if it's stale.
+
+    :param group: entry point group name
+    :returns: mapping from command names to plugins
+    '''
+
+    if is_disabled():
+        plugins = _scan(group)
+
+    else:
+        paths = _stat_sources(path for path in sys.path[1:] if path)
+        plugins = _load_index(group, paths)
+
+        if plugins is None:
+            plugins = _scan(group)
+            _save_index(group, paths, plugins)
+
+    return {name: Plugin(name, target, doc) for name, target, doc in plugins}
+
+
+def add_placeholder(cli, plugin_name: str):
+    '''Register a parser that only lists a plugin in the help of a CLI, without importing it.'''
+
+    # pylint: disable=protected-access
+
+    cli._command_parsers.add_parser(
+        plugin_name,
+        help=cli._subcli_classes[plugin_name].doc,
+        add_help=False
+    )
+    cli._placeholders.add(plugin_name)
+
+
+def remove_placeholder(cli, plugin_name: str):
+    '''Unregister the placeholder parser of a plugin before the plugin is registered.'''
+
+    # pylint: disable=protected-access
+
+    del cli._command_parsers._name_parser_map[plugin_name]
+    cli._command_parsers._choices_actions = [
+        action for action in cli._command_parsers._choices_actions
+        if action.dest != plugin_name
+    ]
+    cli._placeholders.discard(plugin_name)
@@ -0,0 +1,285 @@
+'''Profiling mode that shows where the time of a CLI call goes.
+
+Enable it with ``--cliar-profile`` commandline flag or ``CLIAR_PROFILE=1`` env var. The flag
+takes a comma-separated list of extra modes, e.g. ``--cliar-profile=cprofile,memory``:
+
+-   ``cprofile`` runs the handler under ``cProfile``
+-   ``memory`` traces memory allocations of the handler with ``tracemalloc``
+
+The time of each phase is measured with a monotonic clock:
+
+-   ``startup``: CPU time spent before the CLI was created, i.e. starting the interpreter
+    and importing modules
+-   ``init``: creating the CLI, including ``introspection`` of the handlers
+    and building the parsers
+-   ``parse``: parsing the commandline args, including type ``conversion``
+-   ``handler``: running the handler and writing its output
+
+The report is printed to stderr when the process exits. With ``--cliar-profile-output PATH``
+or ``CLIAR_PROFILE_OUTPUT`` env var, the report is written to ``PATH`` as JSON if ``PATH`` ends
+with ``.json``, otherwise the ``cprofile`` stats are dumped there in the pstats format.
+
+Profiling instruments Cliar methods only when it's enabled, so it costs nothing otherwise.
+'''
+
+import atexit
+import cProfile
+import json
+import os
+import pstats
+import sys
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+from io import StringIO
+from time import perf_counter, process_time
+from typing import Callable, Dict, List, Tuple
+
+
+PHASES = ('init', 'introspection', 'parse', 'conversion', 'handler')
+
+_nested_phases = {'introspection': 'init and parse', 'conversion': 'parse'}
+
+_flags = ('--cliar-profile', '--cliar-profile-output')
+
+_profiler = None  # pylint: disable=invalid-name
+
+
+class Profiler:
+    '''Phase timer and the handler profilers.
+
+    :param modes: extra modes: ``cprofile``, ``memory``
+    :param output: path to write the report or the pstats to
+    '''
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, modes: List[str], output: str or None = None):
+        self.modes = set(modes)
+        self.output = output
+
+        self.startup = process_time()
+        self.started_at = perf_counter()
+        self.phases = OrderedDict((phase, 0.0) for phase in PHASES)
+        self.memory = None
+
+        self._depths = dict.fromkeys(PHASES, 0)
+        self._profile = cProfile.Profile() if 'cprofile' in self.modes else None
+        self._allocations = []
+
+    @contextmanager
+    def phase(self, name: str):
+        '''Add the time of the block to a phase; nested blocks of the same phase are not
+        counted twice.
+        '''
+
+        if self._depths[name]:
+            yield
+            return
+
+        self._depths[name] += 1
+        start = perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.phases[name] += perf_counter() - start
+            self._depths[name] -= 1
+
+    @contextmanager
+    def handler_phase(self):
+        '''Time the handler and run the profilers enabled by the modes.'''
+
+        if self._depths['handler']:
+            yield
+            return
+
+        if 'memory' in self.modes:
+            tracemalloc.start()
+
+        if self._profile:
+            self._profile.enable()
+
+        try:
+            with self.phase('handler'):
+                yield
+
+        finally:
+            if self._profile:
+                self._profile.disable()
+
+            if 'memory' in self.modes:
+                snapshot = tracemalloc.take_snapshot().filter_traces((
+                    tracemalloc.Filter(False, __file__),
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                ))
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                self.memory = max(self.memory or 0, peak)
+                self._allocations = [
+                    (str(statistic.traceback[0]), statistic.size)
+                    for statistic in snapshot.statistics('lineno')[:5]
+                ]
+
+    def timed(self, function: Callable, phase: str) -> Callable:
+        '''Wrap a function or a coroutine function to add its time to a phase.'''
+
+        enter = self.handler_phase if phase == 'handler' else lambda: self.phase(phase)
+
+        if iscoroutinefunction(function):
+            @wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with enter():
+                    return await function(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with enter():
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def get_report(self) -> Dict:
+        '''Get the phase times in ms, the peak handler memory in bytes, and the sites
+        of the largest allocations that are still held when the handler returns.
+        '''
+
+        return {
+            'startup_cpu_ms': self.startup * 1000,
+            'phases_ms': {phase: duration * 1000 for phase, duration in self.phases.items()},
+            'total_ms': (perf_counter() - self.started_at) * 1000,
+            'handler_peak_memory': self.memory,
+            'handler_allocations': self._allocations,
+        }
+
+    def format_report(self, report: Dict) -> str:
+        '''Format the report as a compact table.'''
+
+        lines = ['cliar profile, ms:', f'  {"startup (CPU)":<16}{report["startup_cpu_ms"]:>10.2f}']
+
+        for phase, duration in report['phases_ms'].items():
+            note = f'  part of {_nested_phases[phase]}' if phase in _nested_phases else ''
+            lines.append(f'  {phase:<16}{duration:>10.2f}{note}')
+
+        lines.append(f'  {"total":<16}{report["total_ms"]:>10.2f}  from creating the CLI')
+
+        if report['handler_peak_memory'] is not None:
+            lines.append(f'handler memory peak, KiB: {report["handler_peak_memory"] / 1024:.1f}')
+            lines.append('largest allocations still held, KiB:')
+
+            for site, size in report['handler_allocations']:
+                lines.append(f'  {size / 1024:>10.1f}  {site}')
+
+        if self._profile and not self.output:
+            stats_stream = StringIO()
+            stats = pstats.Stats(self._profile, stream=stats_stream)
+            stats.sort_stats('cumulative').print_stats(15)
+            lines.append(stats_stream.getvalue().strip('\n'))
+
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self):
+        '''Print the report to stderr or write it to the output file.'''
+
+        report = self.get_report()
+
+        if self.output and self.output.endswith('.json'):
+            with open(self.output, 'w', encoding='utf-8') as output_file:
+                json.dump(report, output_file, indent=4)
+
+            return
+
+        if self.output and self._profile:
+            self._profile.dump_stats(self.output)
+
+        sys.stderr.write(self.format_report(report))
+
+    @staticmethod
+    def strip_args(args: List[str]) -> List[str]:
+        '''Remove the profiling flags and their values from commandline args.'''
+
+        return _split_args(args)[1]
+
+
+def _split_args(args: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    '''Separate the profiling flags from the other commandline args.
+
+    ``--cliar-profile`` takes the modes only as ``--cliar-profile=MODES``, since the next arg
+    may be a command, and ``--cliar-profile-output`` takes the path in either form.
+
+    :returns: flag values by flag name, and the other args
+    '''
+
+    values, other_args = {}, []
+    args = iter(args)
+
+    for arg in args:
+        flag, has_value, value = arg.partition('=')
+
+        if flag not in _flags:
+            other_args.append(arg)
+            continue
+
+        if flag == '--cliar-profile-output' and not has_value:
+            value = next(args, None)
+
+            if value is None:
+                sys.stderr.write(f'error: argument {flag}: expected a path\n')
+                sys.exit(2)
+
+        values[flag] = value
+
+    return values, other_args
+
+
+def _get_options() -> tuple:
+    '''Get the modes and the output path from the commandline flags and the env vars.'''
+
+    values, _ = _split_args(sys.argv[1:])
+
+    modes = values.get('--cliar-profile', os.environ.get('CLIAR_PROFILE', ''))
+    output = values.get('--cliar-profile-output', os.environ.get('CLIAR_PROFILE_OUTPUT')) or None
+
+    return [mode for mode in modes.split(',') if mode not in ('', '1')], output
+
+
+def _instrument(profiler: Profiler):
+    '''Wrap the functions and methods that make up the phases.'''
+
+    # pylint: disable=import-outside-toplevel, cyclic-import, protected-access
+
+    from . import calls, engine
+    from .cliar import Cliar, _ArgumentParser
+
+    for owner, name, phase in (
+            (Cliar, '_get_spec', 'introspection'),
+            (Cliar, '_get_command', 'introspection'),
+            (Cliar, '_parse_args', 'parse'),
+            (_ArgumentParser, '_get_value', 'conversion'),
+            (engine, '_convert', 'conversion'),
+            (calls, '_call_handler', 'handler'),
+            (calls, '_call_handler_async', 'handler'),
+        ):
+        setattr(owner, name, profiler.timed(getattr(owner, name), phase))
+
+
+def get_profiler() -> Profiler:
+    '''Start profiling the process if it hasn't been started yet.
+
+    The report is written when the process exits.
+    '''
+
+    global _profiler  # pylint: disable=global-statement
+
+    if _profiler is None:
+        _profiler = Profiler(*_get_options())
+        _instrument(_profiler)
+        atexit.register(_profiler.write_report)
+
+    return _profiler
@@ -0,0 +1,126 @@
+'''Run coroutine handlers from sync code.
+
+Each coroutine runs in a fresh event loop, which is closed afterwards along with async generators
+and the default executor, the way ``asyncio.run`` does it. Unlike ``asyncio.run``, the loop
+is created with a custom factory, e.g. ``uvloop.new_event_loop``, and the coroutine can be run
+when an event loop is already running in the current thread, e.g. in Jupyter.
+
+Ctrl+C cancels the running coroutine, so it can clean up, and then raises ``KeyboardInterrupt``.
+A second Ctrl+C interrupts the cleanup.
+'''
+
+import signal
+import threading
+from asyncio import AbstractEventLoop, CancelledError, all_tasks, gather, get_running_loop
+from asyncio import new_event_loop, set_event_loop
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import copy_context
+from typing import Any, Awaitable, Callable
+
+
+LoopFactory = Callable[[], AbstractEventLoop]
+
+
+@contextmanager
+def _handle_interrupts(loop: AbstractEventLoop, task):
+    '''Cancel the task on the first Ctrl+C and raise ``KeyboardInterrupt`` on the second one.
+
+    The handler is installed only in the main thread and only if Ctrl+C isn't handled
+    in some other way already.
+
+    :returns: a function that tells if the task was cancelled because of Ctrl+C
+    '''
+
+    interrupted = False
+
+    def handle_interrupt(_signum, _frame):
+        nonlocal interrupted
+
+        if interrupted or task.done():
+            raise KeyboardInterrupt
+
+        interrupted = True
+        loop.call_soon_threadsafe(task.cancel)
+
+    if (
+            threading.current_thread() is not threading.main_thread()
+            or signal.getsignal(signal.SIGINT) is not signal.default_int_handler
+        ):
+        yield lambda: interrupted
+        return
+
+    signal.signal(signal.SIGINT, handle_interrupt)
+
+    try:
+        yield lambda: interrupted
+
+    finally:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+
+def _shutdown(loop: AbstractEventLoop):
+    '''Cancel the remaining tasks, finalize async generators, and shut down the default executor.'''
+
+    tasks = all_tasks(loop)
+
+    for task in tasks:
+        task.cancel()
+
+    if tasks:
+        loop.run_until_complete(gather(*tasks, return_exceptions=True))
+
+    loop.run_until_complete(loop.shutdown_asyncgens())
+
+    if hasattr(loop, 'shutdown_default_executor'):
+        loop.run_until_complete(loop.shutdown_default_executor())
+
+
+def _run_in_new_loop(coroutine: Awaitable, loop_factory: LoopFactory or None) -> Any:
+    '''Run a coroutine in a new event loop and close the loop.'''
+
+    loop = (loop_factory or new_event_loop)()
+
+    try:
+        set_event_loop(loop)
+        task = loop.create_task(coroutine)
+
+        with _handle_interrupts(loop, task) as is_interrupted:
+            try:
+                return loop.run_until_complete(task)
+
+            except CancelledError:
+                if is_interrupted():
+                    raise KeyboardInterrupt from None
+
+                raise
+
+    finally:
+        try:
+            _shutdown(loop)
+
+        finally:
+            set_event_loop(None)
+            loop.close()
+
+
+def run_coroutine(coroutine: Awaitable, loop_factory: LoopFactory or None = None) -> Any:
+    '''Run a coroutine to completion and return its result.
+
+    :param coroutine: coroutine to run
+    :param loop_factory: function that creates an event loop, ``asyncio.new_event_loop`` by default
+    '''
+
+    try:
+        get_running_loop()
+
+    except RuntimeError:
+        return _run_in_new_loop(coroutine, loop_factory)
+
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(
+            copy_context().run,
+            _run_in_new_loop,
+            coroutine,
+            loop_factory
+        ).result()
@@ -0,0 +1,279 @@
+'''Server that runs the commands of a CLI in a warm process.
+
+Starting the interpreter, importing the CLI dependencies, and building the parsers take time
+on every call. The server does all that once and then runs the commands it receives over
+a Unix socket from ``cliar.client``.
+
+Each request is run in a worker thread with its own stdin, stdout, and stderr. All requests
+share the served CLI with its options, plugins, and hooks, like the calls of a batch: their
+args are parsed one at a time and their handlers run concurrently. The working dir
+and the environment are process-wide, so requests with the same working dir and environment
+run concurrently, and requests with different ones wait for each other.
+'''
+
+import io
+import json
+import os
+import socket
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Condition, Lock
+from time import monotonic
+from typing import Dict
+
+from .client import REQUEST, STDIN, STDOUT, STDERR, EXIT, send_frame, receive_frame
+from .invocation import ExitStatus, redirect_streams
+
+
+# pylint: disable=too-few-public-methods, protected-access, too-many-instance-attributes
+
+
+class _SocketWriter(io.RawIOBase):
+    '''Raw stream that sends the written data to a client channel.'''
+
+    def __init__(self, sock: socket.socket, channel: bytes, lock: Lock):
+        super().__init__()
+        self._sock = sock
+        self._channel = channel
+        self._lock = lock
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        with self._lock:
+            send_frame(self._sock, self._channel, bytes(data))
+
+        return len(data)
+
+
+class _SocketReader(io.RawIOBase):
+    '''Raw stream that reads the client stdin.'''
+
+    def __init__(self, sock: socket.socket):
+        super().__init__()
+        self._sock = sock
+        self._pending = b''
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._eof:
+            try:
+                channel, payload = receive_frame(self._sock)
+
+            except (OSError, EOFError):
+                channel, payload = STDIN, b''
+
+            if channel == STDIN:
+                self._pending = payload
+                self._eof = not payload
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+
+        return size
+
+
+class _ContextGate:
+    '''Apply the working dir and the environment of requests.
+
+    Requests with the same context run concurrently; a request with a different context waits
+    until the running requests finish.
+    '''
+
+    def __init__(self):
+        self._condition = Condition()
+        self._context = None
+        self._running = 0
+
+    @contextmanager
+    def enter(self, cwd: str, env: Dict[str, str]):
+        '''Wait until the context can be applied and apply it for the duration of the block.'''
+
+        context = (cwd, env)
+
+        with self._condition:
+            while self._running and self._context != context:
+                self._condition.wait()
+
+            if self._context != context:
+                os.chdir(cwd)
+                os.environ.clear()
+                os.environ.update(env)
+                self._context = context
+
+            self._running += 1
+
+        try:
+            yield
+
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._condition.notify_all()
+
+
+class _Server:
+    '''Unix socket server that runs the commands of a CLI.
+
+    :param cli: CLI to serve
+    :param socket_path: path to the Unix socket
+    :param idle_timeout: seconds without requests after which the server stops;
+        ``None`` means never stop
+    :param workers: number of requests run concurrently
+    '''
+
+    def __init__(self, cli, socket_path: str, idle_timeout: float or None, workers: int):
+        self._cli = cli
+
+        self._socket_path = socket_path
+        self._idle_timeout = idle_timeout
+        self._workers = workers
+
+        self._gate = _ContextGate()
+        self._lock = Lock()
+        self._active = 0
+        self._last_activity = monotonic()
+
+        self._stdin = self._stdout = self._stderr = None
+
+    def _bind(self) -> socket.socket:
+        '''Create the listening socket, removing the socket file left by a dead server.
+
+        :raises RuntimeError: if another server is listening on the socket
+        '''
+
+        if os.path.exists(self._socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self._socket_path)
+
+                except OSError:
+                    os.remove(self._socket_path)
+
+                else:
+                    raise RuntimeError(f'Server is already running on {self._socket_path}')
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self._socket_path)
+        listener.listen()
+        listener.settimeout(min(self._idle_timeout or 1.0, 1.0))
+
+        return listener
+
+    def _is_idle(self) -> bool:
+        with self._lock:
+            return (
+                self._idle_timeout is not None
+                and not self._active
+                and monotonic() - self._last_activity > self._idle_timeout
+            )
+
+    def _handle(self, conn: socket.socket):
+        '''Run a single request and send the output and exit status to the client.'''
+
+        send_lock = Lock()
+
+        stdout = io.TextIOWrapper(
+            io.BufferedWriter(_SocketWriter(conn, STDOUT, send_lock)),
+            encoding='utf-8',
+            line_buffering=True
+        )
+        stderr = io.TextIOWrapper(
+            io.BufferedWriter(_SocketWriter(conn, STDERR, send_lock)),
+            encoding='utf-8',
+            line_buffering=True
+        )
+        stdin = io.TextIOWrapper(io.BufferedReader(_SocketReader(conn)), encoding='utf-8')
+
+        self._stdin.redirect(stdin)
+        self._stdout.redirect(stdout)
+        self._stderr.redirect(stderr)
+
+        try:
+            channel, payload = receive_frame(conn)
+
+            if channel != REQUEST:
+                return
+
+            request = json.loads(payload)
+
+            status = ExitStatus()
+
+            try:
+                with self._gate.enter(request['cwd'], request['env']), status:
+                    self._cli._run(request['args'], stream_output=True)
+
+            except OSError:
+                traceback.print_exc()
+                status.code = 1
+
+            stdout.flush()
+            stderr.flush()
+
+            with send_lock:
+                send_frame(conn, EXIT, str(status.code).encode())
+
+        except (OSError, EOFError, ValueError):
+            pass
+
+        finally:
+            self._stdin.redirect(None)
+            self._stdout.redirect(None)
+            self._stderr.redirect(None)
+
+            conn.close()
+
+            with self._lock:
+                self._active -= 1
+                self._last_activity = monotonic()
+
+    def serve(self):
+        '''Accept and run requests until the server is idle for too long or interrupted.'''
+
+        listener = self._bind()
+
+        try:
+            with redirect_streams() as streams, ThreadPoolExecutor(self._workers) as pool:
+                self._stdin, self._stdout, self._stderr = streams
+
+                while not self._is_idle():
+                    try:
+                        conn, _ = listener.accept()
+
+                    except socket.timeout:
+                        continue
+
+                    conn.settimeout(None)
+
+                    with self._lock:
+                        self._active += 1
+
+                    pool.submit(self._handle, conn)
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            listener.close()
+
+            if os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+
+
+def serve(cli, socket_path: str, idle_timeout: float or None = 600.0, workers: int = 4):
+    '''Serve the commands of a CLI over a Unix socket.
+
+    :param cli: CLI to serve
+    :param socket_path: path to the Unix socket
+    :param idle_timeout: seconds without requests after which the server stops;
+        ``None`` means never stop
+    :param workers: number of requests run concurrently
+    '''
+
+    _Server(cli, socket_path, idle_timeout, workers).serve()
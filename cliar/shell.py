@@ -0,0 +1,300 @@
+'''Interactive shell that runs commands of a CLI in a single process.
+
+The parsers are built once, and the CLI objects live as long as the shell, so anything
+handlers store in ``self``, e.g. open connections, survives between commands.
+
+Besides the CLI commands, the shell understands a few builtins:
+
+-   ``cd NAME`` enters a nested CLI, ``cd ..`` leaves it, ``cd /`` returns to the root
+-   ``help [COMMAND]`` shows help for the current CLI or a command
+-   ``exit`` or ``quit`` leaves the shell, and so does Ctrl+D
+
+A line with global args only, e.g. ``--user john``, sets them for the following commands.
+'''
+
+import shlex
+import sys
+from pathlib import Path
+from typing import List
+
+from .cache import get_cache_dir
+from .invocation import ExitStatus
+
+try:
+    import readline
+
+except ImportError:
+    readline = None
+
+
+# pylint: disable=protected-access
+
+
+_builtins = ('cd', 'help', 'exit', 'quit')
+
+_HISTORY_LENGTH = 1000
+
+
+class _Shell:
+    '''Read-eval loop over a root CLI.
+
+    ``error_status`` is the exit status of the last failed command, or 0 if none failed.
+
+    :param root: root CLI
+    '''
+
+    def __init__(self, root):
+        self.error_status = 0
+        self._root = root
+        self._path = []
+        self._clis = [root]
+        self._global_args = [[]]
+        self._completions = []
+
+    @property
+    def prompt(self) -> str:
+        '''Prompt with the program name and the path to the current CLI.'''
+
+        return ' '.join((self._root._parser.prog, *self._path)) + '> '
+
+    def _cd(self, args: List[str]):
+        '''Enter a nested CLI, leave it with ``..``, or return to the root with ``/``.'''
+
+        if len(args) != 1:
+            print('usage: cd NAME | .. | /', file=sys.stderr)
+            return
+
+        if args[0].startswith('/'):
+            del self._path[:]
+            del self._clis[1:]
+            del self._global_args[1:]
+
+        for name in args[0].split('/'):
+            if name in ('', '.'):
+                continue
+
+            if name == '..':
+                if self._path:
+                    self._path.pop()
+                    self._clis.pop()
+                    self._global_args.pop()
+
+                continue
+
+            cli = self._clis[-1]
+
+            if name not in cli._subcli_classes:
+                print(f'cd: no nested CLI {name!r}', file=sys.stderr)
+                return
+
+            self._path.append(name)
+            self._clis.append(cli._subclis.get(name) or cli._register_subcli(name))
+            self._global_args.append([])
+
+    def _get_full_args(self, args: List[str]) -> List[str]:
+        '''Prefix args with the path to the current CLI and the global args set at each level.'''
+
+        full_args = []
+
+        for name, global_args in zip(['', *self._path], self._global_args):
+            if name:
+                full_args.append(name)
+
+            full_args.extend(global_args)
+
+        return full_args + args
+
+    def _is_global_args_only(self, args: List[str]) -> bool:
+        '''Check if the args are options of the current CLI's root command.'''
+
+        root_command = self._clis[-1].root_command
+        names = {f'--{arg.name}' for arg in root_command.args}
+        names.update(f'-{arg.short_name}' for arg in root_command.args if arg.short_name)
+
+        return args[0] in names or args[0].partition('=')[0] in names
+
+    def execute(self, line: str) -> bool:
+        '''Run a single line.
+
+        :returns: ``False`` if the shell must exit
+        '''
+
+        try:
+            args = shlex.split(line)
+
+        except ValueError as error:
+            print(f'error: {error}', file=sys.stderr)
+            self.error_status = 2
+            return True
+
+        if not args:
+            return True
+
+        if args[0] in ('exit', 'quit'):
+            return False
+
+        if args[0] == 'cd':
+            self._cd(args[1:])
+            return True
+
+        if args[0] == 'help':
+            args = [*args[1:], '-h']
+
+        with ExitStatus() as status:
+            if self._is_global_args_only(args):
+                parsed_args = self._root._parse_args(self._get_full_args(args))
+
+                if parsed_args._command is self._clis[-1].root_command:
+                    self._global_args[-1] = args
+                    return True
+
+            self._root._run(self._get_full_args(args), stream_output=True)
+
+        if status.code:
+            self.error_status = status.code
+
+        return True
+
+    def get_completions(self, line: str) -> List[str]:
+        '''Get completions for the last word of a line.'''
+
+        # pylint: disable=too-many-branches
+
+        try:
+            words = shlex.split(line)
+
+        except ValueError:
+            words = line.split()
+
+        if not line or line[-1].isspace():
+            words.append('')
+
+        *done, current = words
+
+        cli = self._clis[-1]
+        command = cli.root_command
+
+        if not done:
+            candidates = [*_builtins]
+
+        elif done[0] == 'cd':
+            for name in done[1:]:
+                if name not in cli._subcli_classes:
+                    return []
+
+                cli = cli._subclis.get(name) or cli._register_subcli(name)
+
+            return sorted(name for name in cli._subcli_classes if name.startswith(current))
+
+        elif done[0] == 'help':
+            candidates, done = [], done[1:]
+
+        else:
+            candidates = []
+
+        for word in done:
+            spec = cli._spec
+
+            if command is not cli.root_command or word.startswith('-'):
+                continue
+
+            if word in cli._subcli_classes:
+                cli = cli._subclis.get(word) or cli._register_subcli(word)
+                command = cli.root_command
+
+            elif word in spec.handler_names:
+                command = cli._get_command(spec.handler_names[word])
+
+        if command is cli.root_command:
+            candidates.extend(cli._spec.handler_names)
+            candidates.extend(cli._subcli_classes)
+
+        if current.startswith('-') or command is not cli.root_command:
+            candidates.extend(f'--{arg.name}' for arg in command.args if arg.default is not None)
+
+        return sorted({candidate for candidate in candidates if candidate.startswith(current)})
+
+    def complete(self, text: str, state: int) -> str or None:  # pylint: disable=unused-argument
+        '''Readline completer.'''
+
+        if state == 0:
+            line = readline.get_line_buffer()[:readline.get_endidx()]
+            self._completions = self.get_completions(line)
+
+        if state < len(self._completions):
+            return self._completions[state] + ' '
+
+        return None
+
+
+def _get_history_path(cli_class: type) -> Path:
+    '''Get the path to the history file of a CLI class.'''
+
+    name = cli_class.__module__
+
+    if name == '__main__':
+        name = Path(getattr(sys.modules['__main__'], '__file__', 'main')).stem
+
+    return get_cache_dir() / 'history' / f'{name}.{cli_class.__qualname__}'
+
+
+def run_shell(cli) -> int:
+    '''Read commands from stdin and run them until ``exit`` or EOF.
+
+    Prompts, history, and completion are used only when stdin is a terminal. Otherwise,
+    e.g. when commands are piped in, the exit status is that of the last failed command.
+
+    :param cli: root CLI
+    :returns: exit status
+    '''
+
+    shell = _Shell(cli)
+    interactive = sys.stdin.isatty()
+    history_path = None
+
+    if interactive and readline:
+        history_path = _get_history_path(type(cli))
+
+        try:
+            readline.read_history_file(str(history_path))
+
+        except OSError:
+            pass
+
+        readline.set_history_length(_HISTORY_LENGTH)
+        readline.set_completer_delims(' \t\n')
+        readline.set_completer(shell.complete)
+        readline.parse_and_bind('tab: complete')
+
+    try:
+        while True:
+            try:
+                line = input(shell.prompt if interactive else '')
+
+            except KeyboardInterrupt:
+                print()
+                continue
+
+            except EOFError:
+                if interactive:
+                    print()
+
+                break
+
+            try:
+                if not shell.execute(line):
+                    break
+
+            except KeyboardInterrupt:
+                print()
+
+    finally:
+        if history_path:
+            try:
+                history_path.parent.mkdir(parents=True, exist_ok=True)
+                readline.write_history_file(str(history_path))
+
+            except OSError:
+                pass
+
+    return 0 if interactive else shell.error_status
@@ -0,0 +1,221 @@
+'''Write records yielded by generator and async generator handlers to stdout.
+
+Records are consumed one by one, so memory use doesn't depend on the number of records.
+They are collected in a buffer, which is flushed when it grows larger than ``buffer_size``
+bytes or when ``flush_interval`` seconds have passed since the last flush. If stdout is
+a terminal, each record is flushed right away.
+
+When the reader goes away, e.g. stdout is piped into ``head``, the generator is closed
+and the CLI exits quietly instead of printing ``BrokenPipeError``.
+'''
+
+import os
+import sys
+from collections.abc import AsyncIterator, Iterator
+from time import monotonic
+from typing import Any, AsyncIterable, Iterable, TextIO
+
+
+def is_stream(result: Any) -> bool:
+    '''Check if a handler result must be streamed, i.e. it's an iterator or an async iterator.
+
+    Lists and other iterables are not streamed, since they're already in memory.
+    '''
+
+    return isinstance(result, (Iterator, AsyncIterator))
+
+
+class _RecordWriter:
+    '''Buffered writer that frames records with a separator.
+
+    Text records are buffered as is and encoded in one go on flush. If the stream has
+    a binary buffer, bytes records are written to it as is, otherwise they're decoded.
+    '''
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+            self,
+            stream: TextIO,
+            separator: str,
+            flush_interval: float,
+            buffer_size: int
+        ):
+        self._stream = stream
+        self._binary = getattr(stream, 'buffer', None)
+        self._encoding = getattr(stream, 'encoding', None) or 'utf-8'
+        self._separator = separator
+        self._flush_interval = 0 if stream.isatty() else flush_interval
+        self._buffer_size = buffer_size
+
+        self._text = []
+        self._data = []
+        self._size = 0
+        self._last_flush = monotonic()
+
+        stream.flush()
+
+    def _encode_text(self):
+        '''Move the buffered text records to the binary buffer.'''
+
+        if self._text:
+            self._data.append(''.join(self._text).encode(self._encoding))
+            self._text.clear()
+
+    def _to_text(self, record: Any) -> str:
+        '''Convert a record that is not ``str`` to text.
+
+        Bytes records are moved to the binary buffer right away, and an empty string
+        is returned in their place.
+        '''
+
+        if not isinstance(record, (bytes, bytearray)):
+            return str(record)
+
+        if self._binary:
+            self._encode_text()
+            self._data.append(bytes(record))
+            return ''
+
+        return bytes(record).decode(self._encoding, errors='replace')
+
+    def _is_due(self) -> bool:
+        return (
+            self._size >= self._buffer_size
+            or monotonic() - self._last_flush >= self._flush_interval
+        )
+
+    def write(self, record: Any):
+        '''Add a record to the buffer and flush the buffer if it's full or old enough.'''
+
+        if record.__class__ is not str:
+            record = self._to_text(record)
+
+        self._text.append(record)
+        self._text.append(self._separator)
+        self._size += len(record) + 1
+
+        if self._is_due():
+            self.flush()
+
+    def write_all(self, records: Iterable):
+        '''Write all records from an iterator and flush.
+
+        This is ``write`` in a loop, with attribute lookups moved out of the loop.
+        '''
+
+        append = self._text.append
+        separator = self._separator
+        to_text = self._to_text
+        buffer_size = self._buffer_size
+        flush_interval = self._flush_interval
+        size = self._size
+        last_flush = self._last_flush
+
+        for record in records:
+            if record.__class__ is not str:
+                record = to_text(record)
+
+            append(record)
+            append(separator)
+            size += len(record) + 1
+
+            if size >= buffer_size or monotonic() - last_flush >= flush_interval:
+                self.flush()
+                size, last_flush = 0, self._last_flush
+
+        self.flush()
+
+    def flush(self):
+        '''Write the buffered records to the stream.'''
+
+        if self._binary:
+            self._encode_text()
+
+            if self._data:
+                self._binary.write(b''.join(self._data))
+                self._data.clear()
+
+            self._binary.flush()
+
+        else:
+            self._stream.write(''.join(self._text))
+            self._text.clear()
+            self._stream.flush()
+
+        self._size = 0
+        self._last_flush = monotonic()
+
+
+def _exit_on_broken_pipe(stream: TextIO):
+    '''Point the stream's file descriptor to devnull, so that flushing at exit doesn't fail,
+    and exit.
+    '''
+
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, stream.fileno())
+
+    except (AttributeError, OSError, ValueError):
+        pass
+
+    sys.exit(1)
+
+
+def write_records(
+        records: Iterable,
+        separator: str = '\n',
+        flush_interval: float = 0.5,
+        buffer_size: int = 65536,
+        stream: TextIO or None = None
+    ):
+    '''Write records from an iterator to a stream, stdout by default.
+
+    :param records: records to write; anything but bytes is converted to ``str``
+    :param separator: string written after each record
+    :param flush_interval: max seconds between flushes, checked whenever a record is produced
+    :param buffer_size: max bytes to buffer before flushing
+    :param stream: text stream to write to; ``sys.stdout`` by default
+    '''
+
+    stream = stream or sys.stdout
+
+    try:
+        _RecordWriter(stream, separator, flush_interval, buffer_size).write_all(records)
+
+    except BrokenPipeError:
+        _exit_on_broken_pipe(stream)
+
+    finally:
+        if hasattr(records, 'close'):
+            records.close()
+
+
+async def write_records_async(
+        records: AsyncIterable,
+        separator: str = '\n',
+        flush_interval: float = 0.5,
+        buffer_size: int = 65536,
+        stream: TextIO or None = None
+    ):
+    '''Write records from an async iterator to a stream, stdout by default.
+
+    The params are the same as in ``write_records``.
+    '''
+
+    stream = stream or sys.stdout
+
+    try:
+        writer = _RecordWriter(stream, separator, flush_interval, buffer_size)
+
+        async for record in records:
+            writer.write(record)
+
+        writer.flush()
+
+    except BrokenPipeError:
+        _exit_on_broken_pipe(stream)
+
+    finally:
+        if hasattr(records, 'aclose'):
+            await records.aclose()
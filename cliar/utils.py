@@ -1,4 +1,4 @@
-from typing import Callable, List, Dict
+from typing import Callable, Iterable, List, Dict
 from argparse import ArgumentDefaultsHelpFormatter
 
 
@@ -14,7 +14,7 @@ def set_help(help_map: Dict[str, str], show_defaults=False) -> Callable:
     def decorator(handler: Callable) -> Callable:
         '''Decorator returning command handler with a help message map.'''
 
-        handler._help_map = help_map
+        handler._help_map = {**getattr(handler, '_help_map', {}), **help_map}
 
         if show_defaults:
             handler._formatter_class = ArgumentDefaultsHelpFormatter
@@ -34,7 +34,29 @@ def set_metavars(metavar_map: Dict[str, str]) -> Callable:
     def decorator(handler: Callable) -> Callable:
         '''Decorator returning command handler with a custom metavar map.'''
 
-        handler._metavar_map = metavar_map
+        handler._metavar_map = {**getattr(handler, '_metavar_map', {}), **metavar_map}
+        return handler
+
+    return decorator
+
+
+def set_choices(choice_map: Dict[str, Iterable or Callable], ttl: float = 300.0) -> Callable:
+    '''Restrict arg values to choices, static or computed at runtime.
+
+    A provider function is called without args only when the choices are needed: to validate
+    a value, to show help, or to complete a value in the shell. Its result is cached on disk
+    for ``ttl`` seconds.
+
+    :param choice_map: mapping from handler param names to lists of choices or to functions
+        that return them
+    :param ttl: seconds to reuse the result of a provider function; 0 disables caching
+    '''
+
+    def decorator(handler: Callable) -> Callable:
+        '''Decorator returning command handler with a choice map.'''
+
+        handler._choice_map = {**getattr(handler, '_choice_map', {}), **choice_map}
+        handler._choices_ttl = ttl
         return handler
 
     return decorator
@@ -51,7 +73,7 @@ def set_arg_map(arg_map: Dict[str, str]) -> Callable:
     def decorator(handler: Callable) -> Callable:
         '''Decorator returning command handler with a custom arg map.'''
 
-        handler._arg_map = arg_map
+        handler._arg_map = {**getattr(handler, '_arg_map', {}), **arg_map}
         return handler
 
     return decorator
@@ -68,7 +90,26 @@ def set_sharg_map(sharg_map: Dict[str, str]) -> Callable:
     def decorator(handler: Callable) -> Callable:
         '''Decorator returning command handler with a custom shaarg map.'''
 
-        handler._sharg_map = sharg_map
+        handler._sharg_map = {**getattr(handler, '_sharg_map', {}), **sharg_map}
+        return handler
+
+    return decorator
+
+
+def read_argfiles(param_names: Iterable[str]) -> Callable:
+    '''Read values of list and dict params from ``@PATH`` argument files.
+
+    A value ``@PATH`` is replaced with the values from the file, one per line or separated
+    by NUL chars, and ``@-`` reads them from stdin. Values that start with ``@`` are passed
+    as ``@@VALUE``.
+
+    :param param_names: names of the list and dict params that read argument files
+    '''
+
+    def decorator(handler: Callable) -> Callable:
+        '''Decorator returning command handler with params that read argument files.'''
+
+        handler._argfile_params = {*getattr(handler, '_argfile_params', ()), *param_names}
         return handler
 
     return decorator
@@ -108,6 +149,98 @@ def add_aliases(aliases: List[str]) -> Callable:
     return decorator
 
 
+def set_stream_options(
+        separator: str = '\n',
+        flush_interval: float = 0.5,
+        buffer_size: int = 65536
+    ) -> Callable:
+    '''Set how records yielded by a generator or an async generator handler are written
+    to stdout.
+
+    :param separator: string written after each record, e.g. ``'\\0'`` for NUL-separated output
+    :param flush_interval: max seconds between flushes
+    :param buffer_size: max bytes to buffer before flushing
+    '''
+
+    def decorator(handler: Callable) -> Callable:
+        '''Decorator returning command handler with output stream options.'''
+
+        handler._stream_options = {
+            'separator': separator,
+            'flush_interval': flush_interval,
+            'buffer_size': buffer_size
+        }
+        return handler
+
+    return decorator
+
+
+def fan_out(
+        param_name: str,
+        chunk_size: int = 1,
+        executor: str = 'thread',
+        ordered: bool = True,
+        fail_fast: bool = True
+    ) -> Callable:
+    '''Call the handler for chunks of a list param in parallel instead of once for the whole list.
+
+    The command gets ``--jobs`` option with the number of parallel calls. The handler returns
+    the list of the call results.
+
+    :param param_name: name of the list param to split into chunks
+    :param chunk_size: number of items passed to each call
+    :param executor: ``thread`` or ``process`` pool for sync handlers; async handlers run
+        on the event loop
+    :param ordered: return the results in the order of the chunks rather than in the order
+        the calls finish
+    :param fail_fast: on the first failed call, cancel the rest and raise its exception;
+        otherwise, run all calls and raise ``FanOutError`` with all exceptions
+    '''
+
+    if executor not in ('thread', 'process'):
+        raise ValueError(f'Unknown executor: {executor}')
+
+    def decorator(handler: Callable) -> Callable:
+        '''Decorator returning command handler that fans out over a list param.'''
+
+        from .fanout import make_fan_out  # pylint: disable=import-outside-toplevel
+
+        return make_fan_out(
+            handler,
+            {
+                'param': param_name,
+                'chunk_size': chunk_size,
+                'executor': executor,
+                'ordered': ordered,
+                'fail_fast': fail_fast
+            }
+        )
+
+    return decorator
+
+
+def memoize(ttl: float or None = 3600.0, max_size: int = 2**26) -> Callable:
+    '''Cache the handler results on disk and return them without calling the handler
+    for the same args.
+
+    The command gets ``--no-cache`` and ``--refresh`` flags to bypass and to replace
+    the cached result.
+
+    :param ttl: seconds to reuse a result; ``None`` means until the handler source changes
+    :param max_size: max bytes of the cached results of the command; the least recently used
+        ones are removed when there are more
+    '''
+
+    def decorator(handler: Callable) -> Callable:
+        '''Decorator returning command handler with cached results.'''
+
+        from .memo import make_memoized  # pylint: disable=import-outside-toplevel
+
+        return make_memoized(handler, {'ttl': ttl, 'max_size': max_size})
+
+    return decorator
+
+
 def ignore(handler: Callable) -> Callable:
     '''Exclude a method from being converted into a command.
 
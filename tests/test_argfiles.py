@@ -0,0 +1,152 @@
+from array import array
+from io import StringIO
+from typing import Dict, List
+
+from pytest import fixture, raises
+
+from cliar import Cliar, ParseError, read_argfiles, set_choices
+from cliar import argfiles
+
+
+class Hosts(Cliar):
+    '''Host commands.'''
+
+    @read_argfiles(['hosts'])
+    def ping(self, hosts: List[str], count: int = 1):
+        return hosts, count
+
+    def greet(self, names: List[str], labels: Dict[str, str] = {}):
+        return names, labels
+
+
+class Fleet(Cliar):
+    '''Fleet commands.'''
+
+    hosts = Hosts
+
+    @read_argfiles(['tags'])
+    def _root(self, tags: List[str] = ['all']):
+        return tags
+
+    @read_argfiles(['ids'])
+    def ids(self, ids: List[int], verbose: bool = False):
+        return ids
+
+    @set_choices({'zones': ['a', 'b']})
+    @read_argfiles(['zones'])
+    def zones(self, zones: List[str]):
+        return zones
+
+    def sizes(self, sizes: array = array('q'), verbose: bool = False):
+        return sizes.tolist()
+
+    @read_argfiles(['labels'])
+    def labels(self, labels: Dict[str, int] = {}):
+        return labels
+
+
+@fixture(params=['argparse', 'fast'])
+def fleet(request):
+    return Fleet(engine=request.param)
+
+
+def test_newline_delimited(fleet, tmp_path):
+    ids_path = tmp_path/'ids.txt'
+    ids_path.write_text('\n'.join(str(number) for number in range(10000)) + '\n')
+
+    assert fleet.run(['ids', f'@{ids_path}']) == list(range(10000))
+    assert fleet.run(['ids', '-1', f'@{ids_path}', '-2'])[-3:] == [9998, 9999, -2]
+
+
+def test_nul_delimited(fleet, tmp_path):
+    hosts_path = tmp_path/'hosts'
+    hosts_path.write_text('web 1\0web 2\0\0db\n')
+
+    assert fleet.run(['hosts', 'ping', f'@{hosts_path}', '-c', '3']) == (
+        ['web 1', 'web 2', 'db\n'], 3
+    )
+
+
+def test_root_args(fleet, tmp_path):
+    tags_path = tmp_path/'tags.txt'
+    tags_path.write_text('prod\r\neu\r\n')
+
+    assert fleet.run(['--tags', f'@{tags_path}']) == ['prod', 'eu']
+
+
+def test_chunks(fleet, tmp_path, monkeypatch):
+    monkeypatch.setattr(argfiles, 'CHUNK_SIZE', 3)
+
+    ids_path = tmp_path/'ids.txt'
+    ids_path.write_text('12345\n678\n9')
+
+    assert fleet.run(['ids', f'@{ids_path}']) == [12345, 678, 9]
+
+
+def test_arrays_and_dicts(fleet, tmp_path):
+    sizes_path = tmp_path/'sizes.txt'
+    sizes_path.write_text('1\0002\0003')
+
+    labels_path = tmp_path/'labels.txt'
+    labels_path.write_text('a=1\nb=2\n')
+
+    assert fleet.run(['sizes', '-s', '0', f'@{sizes_path}', '4']) == [0, 1, 2, 3, 4]
+    assert fleet.run(['labels', '-l', f'@{labels_path}', 'c=3']) == {'a': 1, 'b': 2, 'c': 3}
+
+
+def test_escape_and_errors(fleet, tmp_path):
+    assert fleet.run(['hosts', 'ping', '@@home', 'db']) == (['@home', 'db'], 1)
+
+    with raises(ParseError) as error:
+        fleet.run(['ids', f'@{tmp_path/"missing.txt"}'])
+
+    assert "can't open" in error.value.message
+
+    ids_path = tmp_path/'ids.txt'
+    ids_path.write_text('1\ntwo\n')
+
+    with raises(ParseError) as error:
+        fleet.run(['ids', f'@{ids_path}'])
+
+    assert error.value.message == "argument ids: invalid int value: 'two'"
+
+    zones_path = tmp_path/'zones.txt'
+    zones_path.write_text('a\nc\n')
+
+    with raises(ParseError) as error:
+        fleet.run(['zones', f'@{zones_path}'])
+
+    assert "invalid choice: 'c'" in error.value.message
+
+
+def test_opt_in(fleet):
+    assert fleet.run(['hosts', 'greet', '@alice', '@@bob', '-l', '@team=a']) == (
+        ['@alice', '@@bob'], {'@team': 'a'}
+    )
+
+
+def test_stdin(fleet, monkeypatch):
+    monkeypatch.setattr('sys.stdin', StringIO('1\n2\n'))
+
+    assert fleet.run(['ids', '@-']) == [1, 2]
+
+
+def test_stdin_not_kept(monkeypatch):
+    monkeypatch.setattr('sys.stdin', StringIO('1\n2\n'))
+
+    def replayed(chunks):
+        raise AssertionError('Stdin must be read straight')
+
+    monkeypatch.setattr(argfiles, '_ReplayedStdin', replayed)
+
+    assert Fleet().run(['ids', '@-']) == [1, 2]
+
+
+def test_stdin_after_fallback(fleet, monkeypatch):
+    monkeypatch.setattr('sys.stdin', StringIO('1\n2\n'))
+
+    assert fleet.run(['ids', '@-', '--verbose', '--verb']) == [1, 2]
+
+    monkeypatch.setattr('sys.stdin', StringIO('1 2 3'))
+
+    assert fleet.run(['sizes', '-s', '@-', '-v', '--verb']) == [1, 2, 3]
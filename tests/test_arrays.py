@@ -0,0 +1,107 @@
+from array import array
+from subprocess import run, PIPE
+
+import numpy
+from pytest import fixture, raises
+
+from cliar import Cliar, ParseError
+
+
+@fixture(params=['argparse', 'fast'])
+def engine(request):
+    return request.param
+
+
+def _run(datadir, engine, *args, **kwargs):
+    return run(
+        ['python', str(datadir/'arrayed.py'), engine, *args],
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True,
+        **kwargs
+    )
+
+
+def test_values(datadir, engine):
+    assert _run(datadir, engine, 'mean', '1', '2', '4.5').stdout == 'd 2.5\n'
+    assert _run(datadir, engine, 'mean', '1,2', '3,').stdout == 'd 2.0\n'
+    assert _run(datadir, engine, 'total', '--counts', '1', '2', '3').stdout == 'q 6\n'
+    assert _run(datadir, engine, 'total').stdout == 'q 0\n'
+
+
+def test_invalid_values(datadir, engine):
+    result = _run(datadir, engine, 'total', '--counts', '1', '2.5')
+
+    assert result.returncode == 2
+    assert "argument -c/--counts: invalid int array item: '2.5'" in result.stderr
+
+
+def test_files(datadir, engine, tmp_path):
+    text_path = tmp_path/'values.txt'
+    text_path.write_text('1, 2\n3\n\n4,5 6')
+
+    assert _run(datadir, engine, 'total', '--counts', f'@{text_path}').stdout == 'q 21\n'
+
+    binary_path = tmp_path/'values.bin'
+
+    with binary_path.open('wb') as binary:
+        array('q', range(1000)).tofile(binary)
+
+    assert _run(datadir, engine, 'total', '--counts', f'@{binary_path}').stdout == 'q 499500\n'
+    assert _run(datadir, engine, 'mean', '@-', input='1 2\n3').stdout == 'd 2.0\n'
+
+    result = _run(datadir, engine, 'mean', f'@{tmp_path/"missing.txt"}')
+
+    assert result.returncode == 2
+    assert "can't open" in result.stderr
+
+
+def test_chunks(monkeypatch, tmp_path):
+    from cliar import arrays
+
+    monkeypatch.setattr(arrays, '_CHUNK_SIZE', 4)
+
+    values_path = tmp_path/'values.txt'
+    values_path.write_text(' '.join(str(value) for value in range(1000)))
+
+    assert arrays.ArrayReader('q')([f'@{values_path}']).tolist() == list(range(1000))
+
+    binary_path = tmp_path/'values.bin'
+
+    with binary_path.open('wb') as binary:
+        array('q', range(1000)).tofile(binary)
+
+    assert arrays.ArrayReader('q')([f'@{binary_path}']).tolist() == list(range(1000))
+
+    binary_path.write_bytes(b'\0' * 12)
+
+    with raises(ValueError):
+        arrays.ArrayReader('q')([f'@{binary_path}'])
+
+
+def test_run():
+    class Stats(Cliar):
+        def total(self, counts: array = array('i')):
+            return counts
+
+    result = Stats().run(['total', '-c', '1', '2'])
+
+    assert result == array('i', [1, 2])
+
+    with raises(ParseError):
+        Stats().run(['total', '-c', '1', '99999999999'])
+
+
+def test_numpy():
+    class Stats(Cliar):
+        def mean(self, values: numpy.ndarray):
+            return values
+
+        def total(self, counts: numpy.ndarray = numpy.array([], dtype=numpy.int32)):
+            return counts
+
+    stats = Stats()
+
+    assert stats.run(['mean', '1', '2']).dtype == numpy.float64
+    assert stats.run(['total', '-c', '1,2']).tolist() == [1, 2]
+    assert stats.run(['total', '-c', '1,2']).dtype == numpy.int32
@@ -0,0 +1,18 @@
+import sys
+from array import array
+
+from cliar import Cliar
+
+
+class Arrayed(Cliar):
+    '''CLI with array params.'''
+
+    def mean(self, values: array):
+        print(values.typecode, sum(values) / len(values))
+
+    def total(self, counts: array = array('q')):
+        print(counts.typecode, sum(counts))
+
+
+if __name__ == '__main__':
+    Arrayed(engine=sys.argv.pop(1)).parse()
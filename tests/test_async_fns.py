@@ -1,4 +1,6 @@
-from subprocess import run
+import asyncio
+from signal import SIGINT
+from subprocess import run, Popen, PIPE
 
 
 def test_help(capfd, datadir):
@@ -18,3 +20,44 @@ def test_wait(capfd, datadir):
 
     seconds_awaited = float(capfd.readouterr().out.strip())
     assert round(seconds_awaited, 1) == round(seconds_to_wait, 1)
+
+
+def test_async_root(capfd, datadir):
+    run(f'python {datadir/"async_root.py"} --name John', shell=True)
+
+    captured = capfd.readouterr()
+
+    assert captured.out.strip() == 'Hello, John!'
+    assert captured.err.strip() == 'loops: 1'
+
+    run(f'python {datadir/"async_root.py"}', shell=True)
+
+    assert 'usage:' in capfd.readouterr().out
+
+
+def test_interrupt(datadir):
+    process = Popen(['python', str(datadir/'async_root.py'), 'hang'], stdout=PIPE, stderr=PIPE)
+
+    assert process.stdout.readline().strip() == b'hanging'
+
+    process.send_signal(SIGINT)
+    stdout, stderr = process.communicate(timeout=10)
+
+    assert stdout.strip() == b'cancelled'
+    assert b'KeyboardInterrupt' in stderr
+    assert process.returncode != 0
+
+
+def test_parse_async(capsys, datadir, monkeypatch):
+    monkeypatch.syspath_prepend(str(datadir))
+
+    from async_root import AsyncRoot
+
+    async def main():
+        await AsyncRoot().parse_async(['--name', 'Jane'])
+
+        AsyncRoot().run(['--name', 'Joe'])
+
+    asyncio.run(main())
+
+    assert capsys.readouterr().out.splitlines() == ['Hello, Jane!', 'Hello, Joe!']
@@ -0,0 +1,39 @@
+import asyncio
+import sys
+
+from cliar import Cliar
+
+
+class Counter:
+    calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return asyncio.new_event_loop()
+
+
+class AsyncRoot(Cliar):
+    '''Async root CLI.'''
+
+    async def _root(self, name=''):
+        if not name:
+            return NotImplemented
+
+        await asyncio.sleep(0)
+        print(f'Hello, {name}!')
+
+    async def hang(self):
+        print('hanging', flush=True)
+
+        try:
+            await asyncio.sleep(60)
+
+        except asyncio.CancelledError:
+            print('cancelled', flush=True)
+            raise
+
+
+if __name__ == '__main__':
+    counter = Counter()
+    AsyncRoot(loop_factory=counter).parse()
+    print(f'loops: {counter.calls}', file=sys.stderr)
@@ -0,0 +1,85 @@
+import json
+from subprocess import run, PIPE
+from time import monotonic
+
+
+def _batch(datadir, calls, *args):
+    return run(
+        ['python', str(datadir/'batched.py'), '--batch', '-', *args],
+        input='\n'.join(calls) + '\n',
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True
+    )
+
+
+def test_args(datadir):
+    result = _batch(
+        datadir,
+        ['add 1 2', '', '# comment', 'add 3 4', '--user "John Doe" remote add origin']
+    )
+
+    assert result.returncode == 0
+    assert result.stdout == '3\n7\nAdding remote origin as John Doe\n'
+
+
+def test_json(datadir):
+    result = _batch(
+        datadir,
+        [
+            '{"command": "add", "args": {"x": 1, "y": 2}}',
+            '{"command": "remote add", "args": {"name": "origin"}}',
+            '{"command": "wait", "args": {"seconds": 0}}',
+            '{"command": "add", "args": {"z": 1}}'
+        ]
+    )
+
+    outcomes = [json.loads(line) for line in result.stdout.splitlines()]
+
+    assert outcomes[0] == {'status': 0, 'result': 3, 'stdout': '3\n', 'stderr': ''}
+    assert outcomes[1]['stdout'] == 'Adding remote origin as guest\n'
+    assert outcomes[2]['result'] == 0
+    assert outcomes[3]['status'] == 2
+    assert 'unrecognized arguments: z' in outcomes[3]['stderr']
+
+    assert result.returncode == 2
+
+
+def test_errors(datadir):
+    result = _batch(datadir, ['add 1 two', 'fail', 'add 1 1', 'add -h'])
+
+    assert result.returncode == 2
+    assert result.stdout.splitlines()[0] == '2'
+    assert 'Add two numbers.' in result.stdout
+    assert "invalid int value: 'two'" in result.stderr
+    assert 'failing' in result.stderr
+    assert 'RuntimeError: Failed' in result.stderr
+
+
+def test_order_and_concurrency(datadir):
+    start = monotonic()
+
+    result = _batch(
+        datadir,
+        ['nap 0.5', 'wait 0.5', 'nap 0.1', 'wait 0.1', 'nap 0.5', 'wait 0.5'],
+        '--batch-workers',
+        '4'
+    )
+
+    assert monotonic() - start < 2
+    assert result.stdout.splitlines() == [
+        'slept 0.5', 'waited 0.5', 'slept 0.1', 'waited 0.1', 'slept 0.5', 'waited 0.5'
+    ]
+
+
+def test_file(datadir, tmp_path):
+    calls = tmp_path/'calls.txt'
+    calls.write_text('add 1 2\nadd 2 2\n')
+
+    result = run(
+        ['python', str(datadir/'batched.py'), '--batch', str(calls)],
+        stdout=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.stdout == '3\n4\n'
@@ -0,0 +1,44 @@
+import asyncio
+import sys
+from time import sleep
+
+from cliar import Cliar
+
+
+class Remote(Cliar):
+    '''Remote.'''
+
+    def add(self, name: str):
+        print(f'Adding remote {name} as {self.global_args["user"]}')
+
+
+class Batched(Cliar):
+    '''Batched CLI.'''
+
+    remote = Remote
+
+    def _root(self, user='guest'):
+        return NotImplemented
+
+    def add(self, x: int, y: int):
+        '''Add two numbers.'''
+
+        print(x + y)
+        return x + y
+
+    def nap(self, seconds: float):
+        sleep(seconds)
+        print(f'slept {seconds}')
+
+    async def wait(self, seconds: float):
+        await asyncio.sleep(seconds)
+        print(f'waited {seconds}')
+        return seconds
+
+    def fail(self):
+        print('failing', file=sys.stderr)
+        raise RuntimeError('Failed')
+
+
+if __name__ == '__main__':
+    Batched().parse()
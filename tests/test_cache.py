@@ -0,0 +1,78 @@
+from os import environ
+from subprocess import run
+
+
+def _spec_files(cache_dir):
+    return sorted((cache_dir/'specs').glob('*.pickle'))
+
+
+def test_cached_spec(capfd, datadir, tmp_path):
+    env = {**environ, 'CLIAR_CACHE_DIR': str(tmp_path)}
+
+    run(f'python {datadir/"cached.py"} add 1 2 3', shell=True, env=env)
+    assert capfd.readouterr().out.strip() == '6'
+
+    spec_files = _spec_files(tmp_path)
+    assert len(spec_files) == 2
+
+    mtimes = [spec_file.stat().st_mtime_ns for spec_file in spec_files]
+
+    run(f'python {datadir/"cached.py"} sum 1 2 3', shell=True, env=env)
+    assert capfd.readouterr().out.strip() == '6'
+
+    run(f'python {datadir/"cached.py"} power 3 --to 3', shell=True, env=env)
+    assert capfd.readouterr().out.strip() == '27.0'
+
+    run(f'python {datadir/"cached.py"} remote add origin', shell=True, env=env)
+    assert capfd.readouterr().out.strip() == 'Adding remote origin'
+
+    assert [spec_file.stat().st_mtime_ns for spec_file in _spec_files(tmp_path)] == mtimes
+
+    run(f'python {datadir/"cached.py"} add -h', shell=True, env=env)
+    help_message = capfd.readouterr().out
+    assert 'Add numbers.' in help_message
+    assert 'Numbers to add' in help_message
+
+    mtimes = [spec_file.stat().st_mtime_ns for spec_file in _spec_files(tmp_path)]
+
+    run(f'python {datadir/"cached.py"} add -h', shell=True, env=env)
+    assert capfd.readouterr().out == help_message
+
+    assert [spec_file.stat().st_mtime_ns for spec_file in _spec_files(tmp_path)] == mtimes
+
+
+def test_invalidation(capfd, datadir, tmp_path):
+    env = {**environ, 'CLIAR_CACHE_DIR': str(tmp_path)}
+
+    run(f'python {datadir/"cached.py"} add 1 2', shell=True, env=env)
+    assert capfd.readouterr().out.strip() == '3'
+
+    source = (datadir/'cached.py').read_text()
+    (datadir/'cached.py').write_text(source.replace("'sum'", "'total'"))
+
+    run(f'python {datadir/"cached.py"} total 1 2', shell=True, env=env)
+    assert capfd.readouterr().out.strip() == '3'
+
+    run(f'python {datadir/"cached.py"} sum 1 2', shell=True, env=env)
+    assert "invalid choice: 'sum'" in capfd.readouterr().err
+
+
+def test_no_cache(capfd, datadir, tmp_path):
+    env = {**environ, 'CLIAR_CACHE_DIR': str(tmp_path), 'CLIAR_NO_CACHE': '1'}
+
+    run(f'python {datadir/"cached.py"} add 1 2', shell=True, env=env)
+    assert capfd.readouterr().out.strip() == '3'
+
+    assert not _spec_files(tmp_path)
+
+
+def test_clear(capfd, datadir, tmp_path):
+    env = {**environ, 'CLIAR_CACHE_DIR': str(tmp_path)}
+
+    run(f'python {datadir/"cached.py"} add 1 2', shell=True, env=env)
+    capfd.readouterr()
+
+    run('python -m cliar cache clear', shell=True, env=env)
+    assert capfd.readouterr().out.strip() == f'Removed 2 cached specs from {tmp_path}'
+
+    assert not _spec_files(tmp_path)
@@ -0,0 +1,32 @@
+from typing import List
+
+from cliar import Cliar, set_help, set_arg_map, add_aliases
+
+
+class Remote(Cliar):
+    '''Remote help.'''
+
+    def add(self, name: str):
+        '''Remote add help.'''
+        print(f'Adding remote {name}')
+
+
+class Cached(Cliar):
+    '''Cached help.'''
+
+    remote = Remote
+
+    @add_aliases(['sum'])
+    @set_help({'numbers': 'Numbers to add'})
+    def add(self, numbers: List[int]):
+        '''Add numbers.'''
+        print(sum(numbers))
+
+    @set_arg_map({'base': 'to'})
+    def power(self, x: float, base=2.0):
+        '''Raise to power.'''
+        print(x**base)
+
+
+if __name__ == '__main__':
+    Cached(cache=True).parse()
@@ -0,0 +1,186 @@
+import json
+import os
+import sys
+from subprocess import run, PIPE
+
+from pytest import fixture, raises
+
+from cliar import ParseError
+from cliar import choices
+from cliar.choices import ChoiceProvider
+
+
+@fixture
+def chosen(datadir, tmp_path, monkeypatch):
+    monkeypatch.setenv('CLIAR_CACHE_DIR', str(tmp_path/'cache'))
+    monkeypatch.setenv('CLUSTER_CALLS', str(tmp_path/'calls'))
+
+    sys.path.insert(0, str(datadir))
+
+    import chosen
+
+    yield chosen
+
+    sys.path.remove(str(datadir))
+
+
+def _calls(tmp_path):
+    try:
+        return len((tmp_path/'calls').read_text().splitlines())
+
+    except FileNotFoundError:
+        return 0
+
+
+def test_validation(capsys, chosen, tmp_path):
+    for engine in ('argparse', 'fast'):
+        cli = chosen.Chosen(engine=engine)
+
+        cli.run(['deploy', 'prod', '--size', 'l'])
+        assert capsys.readouterr().out == 'Deploying to prod with size l\n'
+
+        with raises(ParseError) as error:
+            cli.run(['deploy', 'test'])
+
+        assert "invalid choice: 'test'" in error.value.message
+
+        with raises(ParseError):
+            cli.run(['deploy', 'dev', '--size', 'xl'])
+
+        cli.run(['scale', '3'])
+        assert capsys.readouterr().out == '6\n'
+
+        with raises(ParseError):
+            cli.run(['scale', '4'])
+
+    assert _calls(tmp_path) == 1
+
+
+def test_lazy_provider(chosen, tmp_path):
+    cli = chosen.Chosen()
+
+    cli.run(['scale', '1'])
+
+    assert _calls(tmp_path) == 0
+
+
+def test_disk_cache(chosen, tmp_path):
+    provider = ChoiceProvider(chosen.list_clusters, ttl=60)
+
+    assert list(provider) == ['prod', 'staging', 'dev']
+    assert 'staging' in ChoiceProvider(chosen.list_clusters, ttl=60)
+    assert _calls(tmp_path) == 1
+
+    entry_path, = (tmp_path/'cache'/'choices').glob('*.json')
+    entry = json.loads(entry_path.read_text())
+    entry['time'] -= 60
+    entry_path.write_text(json.dumps(entry))
+
+    assert 'dev' in ChoiceProvider(chosen.list_clusters, ttl=60)
+    assert _calls(tmp_path) == 2
+
+    assert list(ChoiceProvider(chosen.list_clusters, ttl=0)) == ['prod', 'staging', 'dev']
+    assert _calls(tmp_path) == 3
+
+
+def test_eviction(chosen, tmp_path, monkeypatch):
+    monkeypatch.setattr(choices, 'MAX_CACHE_SIZE', 1000)
+
+    for index in range(50):
+        def provider(index=index):
+            return [index] * 20
+
+        provider.__qualname__ = f'provider_{index}'
+
+        ChoiceProvider(provider).get()
+
+    entries = list((tmp_path/'cache'/'choices').glob('*.json'))
+
+    assert sum(entry.stat().st_size for entry in entries) <= 1000
+    assert 1 < len(entries) < 50
+
+
+def test_completion_entry_point(datadir, tmp_path):
+    env = {
+        **os.environ,
+        'CLIAR_CACHE_DIR': str(tmp_path/'cache'),
+        'CLUSTER_CALLS': str(tmp_path/'calls')
+    }
+
+    for _ in range(2):
+        result = run(
+            ['python', str(datadir/'chosen.py'), '--cliar-choices', '/deploy', 'cluster'],
+            stdout=PIPE,
+            universal_newlines=True,
+            env=env
+        )
+
+        assert result.returncode == 0
+        assert result.stdout == 'prod\nstaging\ndev\n'
+
+    assert _calls(tmp_path) == 1
+
+    result = run(
+        ['python', str(datadir/'chosen.py'), '--cliar-choices', '/deploy', '-s'],
+        stdout=PIPE,
+        universal_newlines=True,
+        env=env
+    )
+
+    assert result.stdout == 's\nm\nl\n'
+
+    result = run(
+        ['python', str(datadir/'chosen.py'), '--cliar-choices', '/nowhere', 'cluster'],
+        stdout=PIPE,
+        universal_newlines=True,
+        env=env
+    )
+
+    assert result.returncode == 0
+    assert result.stdout == ''
+
+
+def test_choices_without_parsers(capsys, chosen, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['chosen.py', '--cliar-choices', '/deploy', '--size'])
+
+    cli = chosen.Chosen()
+
+    assert not cli._commands
+
+    with raises(SystemExit) as exit_info:
+        cli.parse()
+
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out == 's\nm\nl\n'
+
+
+def test_completion_script(chosen, datadir, tmp_path):
+    executable = tmp_path/'bin'/'chosen'
+    executable.parent.mkdir()
+    executable.write_text(f'#!/bin/sh\nexec {sys.executable} {datadir/"chosen.py"} "$@"\n')
+    executable.chmod(0o755)
+
+    script = chosen.Chosen().completion('bash', prog='chosen')
+
+    def complete(*words):
+        driver = (
+            script
+            + 'COMP_WORDS=("$@"); COMP_CWORD=$((${#COMP_WORDS[@]} - 1))\n'
+            + '_cliar_chosen; printf "%s\\n" "${COMPREPLY[@]}"\n'
+        )
+
+        return run(
+            ['bash', '-c', driver, 'bash', 'chosen', *words],
+            stdout=PIPE,
+            universal_newlines=True,
+            env={
+                **os.environ,
+                'PATH': f'{executable.parent}{os.pathsep}{os.environ["PATH"]}',
+                'PYTHONPATH': os.pathsep.join(sys.path)
+            },
+            check=True
+        ).stdout.split()
+
+    assert complete('deploy', 's') == ['staging']
+    assert complete('deploy', '--size', '') == ['s', 'm', 'l']
+    assert complete('scale', '') == ['1', '2', '3']
@@ -0,0 +1,29 @@
+import os
+
+from cliar import Cliar, set_choices
+
+
+def list_clusters():
+    calls_path = os.environ.get('CLUSTER_CALLS')
+
+    if calls_path:
+        with open(calls_path, 'a') as calls:
+            calls.write('call\n')
+
+    return ['prod', 'staging', 'dev']
+
+
+class Chosen(Cliar):
+    '''Chosen CLI.'''
+
+    @set_choices({'cluster': list_clusters, 'size': ['s', 'm', 'l']})
+    def deploy(self, cluster: str, size='m'):
+        print(f'Deploying to {cluster} with size {size}')
+
+    @set_choices({'replicas': lambda: range(1, 4)}, ttl=0)
+    def scale(self, replicas: int):
+        print(replicas * 2)
+
+
+if __name__ == '__main__':
+    Chosen().parse()
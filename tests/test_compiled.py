@@ -0,0 +1,97 @@
+import sys
+from os import environ
+from subprocess import run, PIPE
+
+from pytest import fixture, mark, raises
+
+from cliar.cliar import _Command, _specs
+from cliar.compiled import compile_cli, load_class
+
+
+def _run(args, cwd, **kwargs):
+    return run(
+        ['python', *args],
+        cwd=str(cwd),
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True,
+        **kwargs
+    )
+
+
+@fixture
+def compiled(datadir):
+    result = _run(['-m', 'cliar', 'compile', 'compiled_app:App', '-o', 'app.py'], datadir)
+
+    assert result.returncode == 0, result.stderr
+
+    return datadir/'app.py'
+
+
+@mark.parametrize('args', [
+    ['sum', '1', '2'],
+    ['--verbose', 's', '1', '2', '-c', 'blue'],
+    ['remote', 'add', 'origin'],
+    ['sum', 'one'],
+])
+def test_commands(datadir, compiled, args):
+    original = _run(['compiled_app.py', *args], datadir)
+    result = _run([compiled.name, *args], datadir)
+
+    assert result.returncode == original.returncode
+    assert result.stdout == original.stdout
+    assert result.stderr.replace('app.py', 'compiled_app.py') == original.stderr
+
+
+@mark.parametrize('columns', ['80', '120'])
+@mark.parametrize('args', [['-h'], ['sum', '-h'], ['s', '-h'], ['remote', 'add', '-h']])
+def test_help(datadir, compiled, args, columns):
+    original = _run(['compiled_app.py', *args], datadir, env={**environ, 'COLUMNS': '80'})
+    result = _run(
+        ['-v', compiled.name, *args],
+        datadir,
+        env={**environ, 'COLUMNS': columns}
+    )
+
+    assert result.returncode == 0
+    assert result.stdout == original.stdout.replace('compiled_app.py', 'app.py')
+    assert "import 'compiled_app'" not in result.stderr
+
+
+def test_no_introspection(monkeypatch, datadir, capsys):
+    monkeypatch.syspath_prepend(str(datadir))
+
+    namespace = {}
+    exec(compile_cli('compiled_app:App', 'app.py'), namespace)
+
+    app_class = load_class('compiled_app:App')
+
+    for spec_class in (app_class, app_class.remote):
+        del _specs[spec_class]
+
+    def fail(*args):
+        raise AssertionError('handler inspected')
+
+    monkeypatch.setattr(_Command, '_get_args', fail)
+    monkeypatch.setattr(sys, 'argv', ['app.py', 'remote', 'add', 'origin'])
+
+    namespace['main']()
+
+    assert capsys.readouterr().out == 'Adding remote origin\n'
+
+
+def test_check(datadir, compiled):
+    check = ['-m', 'cliar', 'compile', 'compiled_app:App', '--check', 'app.py']
+
+    assert _run(check, datadir).returncode == 0
+
+    source = datadir/'compiled_app.py'
+    source.write_text(source.read_text().replace("'Numbers to sum'", "'Numbers to add'"))
+
+    result = _run(check, datadir)
+
+    assert result.returncode == 1
+    assert 'app.py is out of date' in result.stderr
+
+    with raises(ValueError):
+        load_class('compiled_app')
@@ -0,0 +1,38 @@
+from enum import Enum
+from typing import List
+
+from cliar import Cliar, add_aliases, set_help
+
+
+class Color(Enum):
+    red = 1
+    blue = 2
+
+
+class Remote(Cliar):
+    '''Manage remotes.'''
+
+    def add(self, name: str):
+        '''Add a remote.'''
+
+        print(f'Adding remote {name}')
+
+
+class App(Cliar):
+    '''App to compile.'''
+
+    remote = Remote
+
+    def _root(self, verbose=False):
+        return NotImplemented
+
+    @add_aliases(['s'])
+    @set_help({'numbers': 'Numbers to sum'})
+    def sum(self, numbers: List[int], color: Color = Color.red):
+        '''Sum numbers.'''
+
+        print(sum(numbers), color.name, self.global_args['verbose'])
+
+
+if __name__ == '__main__':
+    App().parse()
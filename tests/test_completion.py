@@ -0,0 +1,117 @@
+import sys
+from subprocess import run, PIPE
+
+from pytest import fixture
+
+from cliar.completion import is_stale
+
+
+@fixture
+def completed(datadir):
+    sys.path.insert(0, str(datadir))
+
+    from completed import Completed
+
+    yield Completed
+
+    sys.path.remove(str(datadir))
+
+
+def _complete(script, *words):
+    driver = (
+        script
+        + 'COMP_WORDS=("$@"); COMP_CWORD=$((${#COMP_WORDS[@]} - 1))\n'
+        + '_cliar_completed; printf "%s\\n" "${COMPREPLY[@]}"\n'
+    )
+
+    result = run(
+        ['bash', '-c', driver, 'bash', 'completed', *words],
+        stdout=PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    return result.stdout.split()
+
+
+def test_bash(completed, datadir):
+    script = completed().completion('bash', prog='completed')
+
+    assert _complete(script, '') == ['checkout', 'co', 'load', 'remote']
+    assert _complete(script, 'c') == ['checkout', 'co']
+    assert _complete(script, '--user', 'remote', 'r') == ['remote']
+    assert _complete(script, '-') == ['-h', '--help', '-u', '--user']
+    assert _complete(script, 'remote', '') == ['add', 'show']
+    assert _complete(script, 'remote', 'add', '--') == ['--help', '--url']
+    assert _complete(script, 'co', '--f') == ['--force']
+    assert _complete(script, 'load', '--config', str(datadir/'compl')) == [
+        str(datadir/'completed.py')
+    ]
+    assert _complete(script, 'remote', 'add', '--url', '') == []
+
+
+def test_zsh_fish(completed):
+    zsh_script = completed().completion('zsh', prog='completed')
+
+    assert zsh_script.startswith('#compdef completed\n')
+    assert "'/checkout'|'/co') node='/checkout' ;;" in zsh_script
+    assert "compdef _cliar_completed 'completed'" in zsh_script
+
+    fish_script = completed().completion('fish', prog='completed')
+
+    assert "case '/checkout' '/co'" in fish_script
+    assert "complete -c 'completed' -f -a '(_cliar_completed)'" in fish_script
+
+
+def test_lazy(completed):
+    assert (
+        completed(lazy=True).completion('bash', prog='completed')
+        == completed().completion('bash', prog='completed')
+    )
+
+
+def test_stale(completed):
+    script = completed().completion('bash')
+
+    assert not is_stale(completed(), script, 'bash')
+    assert is_stale(completed(), script, 'fish')
+    assert is_stale(completed(), script, 'bash', prog='other')
+    assert is_stale(completed(), '# hand-written script', 'bash')
+
+    class Extended(completed):
+        def clone(self, url: str):
+            pass
+
+    assert is_stale(Extended(), script, 'bash')
+
+
+def test_commandline(datadir, tmp_path):
+    result = run(
+        ['python', str(datadir/'completed.py'), '--completion', 'bash'],
+        stdout=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.returncode == 0
+    assert result.stdout.endswith("complete -o filenames -F _cliar_completed_py 'completed.py'\n")
+
+    script_path = tmp_path/'completed.bash'
+    script_path.write_text(result.stdout)
+
+    result = run(
+        ['python', str(datadir/'completed.py'), '--completion', 'bash', '--check', str(script_path)]
+    )
+
+    assert result.returncode == 0
+
+    result = run(
+        [
+            'python', str(datadir/'completed.py'),
+            '--completion', 'fish', '--check', str(script_path)
+        ],
+        stderr=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.returncode == 1
+    assert 'is stale' in result.stderr
@@ -0,0 +1,36 @@
+from pathlib import Path
+from typing import TextIO
+
+from cliar import Cliar, add_aliases, set_arg_map, set_sharg_map
+
+
+class Remote(Cliar):
+    '''Remote.'''
+
+    def add(self, name: str, url: str = ''):
+        print(f'Adding remote {name}')
+
+    def show(self):
+        print('Remotes')
+
+
+class Completed(Cliar):
+    '''Completed CLI.'''
+
+    remote = Remote
+
+    def _root(self, user='guest'):
+        return NotImplemented
+
+    @add_aliases(['co'])
+    def checkout(self, branch: str, force=False):
+        print(f'Checking out {branch}')
+
+    @set_arg_map({'config_file': 'config'})
+    @set_sharg_map({'config_file': 'C'})
+    def load(self, data: TextIO, config_file: Path = Path('cliar.ini')):
+        print(data.read())
+
+
+if __name__ == '__main__':
+    Completed().parse()
@@ -0,0 +1,126 @@
+from datetime import date, datetime, time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+try:
+    from typing import Literal
+
+except ImportError:
+    from typing_extensions import Literal
+
+from pytest import fixture, raises
+
+from cliar import Cliar, ParseError, register_converter
+from cliar import converters
+
+
+class Color(Enum):
+    red = 1
+    green = 2
+
+
+class Point:
+    def __init__(self, x: float, y: float):
+        self.x, self.y = x, y
+
+
+def parse_point(value: str) -> Point:
+    return Point(*map(float, value.split(',')))
+
+
+class Converted(Cliar):
+    def optional(self, number: Optional[int]):
+        return number
+
+    def optional_list(self, numbers: Optional[List[int]], labels: Optional[Dict[str, int]] = {}):
+        return numbers, labels
+
+    def union(self, value: Union[int, float, str]):
+        return value
+
+    def literal(self, mode: Literal['fast', 'slow'], level: Literal[1, 2] = 1):
+        return mode, level
+
+    def paint(self, color: Color, colors: List[Color] = (Color.red,)):
+        return color, colors
+
+    def labels(self, labels: Dict[str, int] = {}):
+        return labels
+
+    def when(self, moment: datetime, day: date = date(2020, 1, 1), at: time = time(0)):
+        return moment, day, at
+
+    def read(self, path: Path):
+        return path
+
+
+@fixture(params=['argparse', 'fast'])
+def cli(request):
+    return Converted(engine=request.param)
+
+
+@fixture
+def registry():
+    yield
+    converters._registry.pop(Point, None)
+    converters._compiled.clear()
+
+
+def test_optional_and_union(cli):
+    assert cli.run(['optional', '42']) == 42
+    assert cli.run(['optional-list', '1', '2', '--labels', 'a=1']) == ([1, 2], {'a': 1})
+    assert cli.run(['union', '42']) == 42
+    assert cli.run(['union', '4.2']) == 4.2
+    assert cli.run(['union', 'abc']) == 'abc'
+
+
+def test_literal(cli, capsys):
+    assert cli.run(['literal', 'fast']) == ('fast', 1)
+    assert cli.run(['literal', 'slow', '--level', '2']) == ('slow', 2)
+
+    with raises(ParseError) as error:
+        cli.run(['literal', 'medium'])
+
+    assert "invalid choice: 'medium'" in error.value.message
+
+
+def test_enum(cli):
+    assert cli.run(['paint', 'green']) == (Color.green, (Color.red,))
+    assert cli.run(['paint', '1', '--colors', 'red', '2']) == (Color.red, [Color.red, Color.green])
+
+    with raises(ParseError) as error:
+        cli.run(['paint', 'blue'])
+
+    assert error.value.message == "argument {red,green}: invalid Color value: 'blue'"
+
+
+def test_dict(cli):
+    assert cli.run(['labels', '--labels', 'a=1', 'b=2']) == {'a': 1, 'b': 2}
+
+    with raises(ParseError) as error:
+        cli.run(['labels', '--labels', 'a=x'])
+
+    assert 'invalid pair' in error.value.message
+
+
+def test_datetime(cli):
+    assert cli.run(['when', '2021-10-21T10:30', '--day', '2021-10-22', '--at', '12:00']) == (
+        datetime(2021, 10, 21, 10, 30), date(2021, 10, 22), time(12)
+    )
+
+
+def test_registered(registry):
+    register_converter(Point, parse_point)
+
+    class Plotted(Cliar):
+        def move(self, point: Point):
+            return point.x, point.y
+
+    assert Plotted().run(['move', '1,2']) == (1.0, 2.0)
+    assert Converted().run(['read', 'a.txt']) == Path('a.txt')
+
+
+def test_compiled_once():
+    assert converters.get_converter(Optional[Color]) is converters.get_converter(Color)
+    assert converters.get_converter(Dict[str, int]) is converters.get_converter(Dict[str, int])
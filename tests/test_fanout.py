@@ -0,0 +1,194 @@
+import asyncio
+import threading
+from os import environ
+from subprocess import run, PIPE
+from time import perf_counter, sleep
+from typing import List
+
+from pytest import raises
+
+from cliar import Cliar, FanOutError, fan_out, set_help, set_sharg_map
+
+
+class Fanned(Cliar):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def _root(self, unit=''):
+        return NotImplemented
+
+    def _track(self, delta: int):
+        with self.lock:
+            self.active += delta
+            self.peak = max(self.peak, self.active)
+
+    @fan_out('items')
+    def square(self, items: List[int], delay: float = 0.0):
+        self._track(1)
+        sleep(delay)
+        self._track(-1)
+        return [item ** 2 for item in items]
+
+    @fan_out('items', chunk_size=3, ordered=False)
+    def chunks(self, items: List[int]):
+        sleep(0.05 if items[0] == 0 else 0)
+        return items
+
+    @fan_out('items')
+    async def wait(self, items: List[int]):
+        self._track(1)
+        await asyncio.sleep(0.01)
+        self._track(-1)
+        return items[0]
+
+    @fan_out('items')
+    def fail(self, items: List[int]):
+        if items[0] % 2:
+            raise ValueError(items[0])
+
+        return items[0]
+
+    @fan_out('items')
+    def fail_slow(self, items: List[int]):
+        if not items[0]:
+            raise ValueError(items[0])
+
+        sleep(1)
+
+    @fan_out('items', fail_fast=False)
+    def fail_all(self, items: List[int]):
+        if items[0] % 2:
+            raise ValueError(items[0])
+
+        return items[0]
+
+    @set_sharg_map({'items': 'i'})
+    @set_help({'just': 'width of the items'})
+    @fan_out('items')
+    def stacked(self, items: List[str], just: int = 0):
+        return [item.rjust(just) for item in items]
+
+    @fan_out('items')
+    def label(self, items: List[int]):
+        return f'{items[0]}{self.global_args["unit"]}'
+
+    @fan_out('items')
+    def show(self, items: List[str], just: int = 0):
+        print(*items)
+
+
+def test_results():
+    fanned = Fanned()
+
+    assert fanned.run(['square', '1', '2', '3']) == [[1], [4], [9]]
+    assert fanned.run(['show', 'a', 'b']) is None
+
+    chunks = fanned.run(['chunks', '0', '1', '2', '3', '4', '5', '6', '--jobs', '3'])
+
+    assert sorted(chunks[:2]) == [[3, 4, 5], [6]]
+    assert chunks[2] == [0, 1, 2]
+
+
+def test_global_args():
+    fanned = Fanned()
+
+    assert fanned.run(['--unit', 'kg', 'label', '1', '2', '--jobs', '2']) == ['1kg', '2kg']
+    assert fanned.run(['label', '3']) == ['3']
+
+
+def test_jobs(monkeypatch):
+    fanned = Fanned()
+
+    fanned.run(['square', *map(str, range(8)), '--delay', '0.05', '-j', '2'])
+
+    assert fanned.peak == 2
+
+    monkeypatch.setenv('CLIAR_JOBS', '4')
+    fanned.peak = 0
+    fanned.run(['square', *map(str, range(8)), '--delay', '0.05'])
+
+    assert fanned.peak == 4
+
+
+def test_async():
+    fanned = Fanned()
+
+    assert fanned.run(['wait', *map(str, range(10)), '--jobs', '3']) == list(range(10))
+    assert fanned.peak == 3
+
+
+def test_errors():
+    fanned = Fanned()
+
+    with raises(ValueError):
+        fanned.run(['fail', '0', '1', '2'])
+
+    with raises(FanOutError) as error:
+        fanned.run(['fail-all', '0', '1', '2', '3'])
+
+    assert sorted(error.value.errors) == [1, 3]
+    assert error.value.results == {0: 0, 2: 2}
+
+    started_at = perf_counter()
+
+    with raises(ValueError):
+        fanned.run(['fail-slow', '0', '1', '2', '--jobs', '2'])
+
+    assert perf_counter() - started_at < 0.5
+
+
+def test_options():
+    fanned = Fanned()
+
+    assert fanned._get_command('show').args[-1].short_name == ''
+    assert fanned._get_command('square').args[-1].short_name == 'j'
+
+    args = {arg.param_name: arg for arg in fanned._get_command('stacked').args}
+
+    assert (args['items'].short_name, args['just'].short_name) == ('i', 'j')
+    assert args['jobs'].short_name == ''
+    assert args['just'].help == 'width of the items'
+    assert args['jobs'].help.startswith('number of parallel calls')
+    assert fanned.run(['stacked', 'a', 'b', '--just', '2']) == [[' a'], [' b']]
+
+    with raises(NameError):
+        fan_out('missing')(Fanned.square.__wrapped__)
+
+    with raises(ValueError):
+        fan_out('items', executor='fiber')
+
+
+def test_process_pool(datadir):
+    result = run(
+        ['python', str(datadir/'fanned.py'), '--prefix', 'sum', 'pids', '1', '2', '3', '-j', '2'],
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.returncode == 0
+    assert sorted(result.stdout.splitlines()) == ['sum 3', 'sum 3']
+
+    result = run(
+        ['python', str(datadir/'fanned.py'), 'ping', 'web', 'db', '-c', '2', '--jobs', '1'],
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.stdout == 'web 2\ndb 2\n'
+
+
+def test_process_pool_stacked(datadir, tmp_path):
+    result = run(
+        ['python', str(datadir/'fanned.py'), 'sums', '1', '2', '3', '-j', '2'],
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True,
+        env={**environ, 'CLIAR_CACHE_DIR': str(tmp_path)}
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert sorted(result.stdout.splitlines()) == ['1', '2', '3']
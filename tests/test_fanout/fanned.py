@@ -0,0 +1,31 @@
+import os
+from typing import List
+
+from cliar import Cliar, fan_out, memoize, set_help
+
+
+class Fanned(Cliar):
+    '''CLI with fan-out commands.'''
+
+    def _root(self, prefix=''):
+        return NotImplemented
+
+    @fan_out('numbers', chunk_size=2, executor='process')
+    def pids(self, numbers: List[int]):
+        os.write(1, f'{self.global_args["prefix"]} {sum(numbers)}\n'.encode())
+        return os.getpid()
+
+    @set_help({'numbers': 'numbers to print'})
+    @memoize()
+    @fan_out('numbers', executor='process')
+    def sums(self, numbers: List[int]):
+        os.write(1, f'{sum(numbers)}\n'.encode())
+
+    @fan_out('hosts')
+    def ping(self, hosts: List[str], count: int = 1):
+        for host in hosts:
+            print(f'{host} {count}')
+
+
+if __name__ == '__main__':
+    Fanned().parse()
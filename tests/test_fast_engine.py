@@ -0,0 +1,228 @@
+'''Differential tests: the fast engine must produce the same handler args as argparse
+or give up and let argparse handle the args.
+'''
+
+from random import Random
+from typing import List
+
+from pytest import mark, raises
+
+from cliar import Cliar, CliarError, set_arg_map, set_sharg_map, add_aliases, set_name
+from cliar.engine import Fallback, parse_args
+
+
+class Remote(Cliar):
+    '''Remote help.'''
+
+    def _root(self, verbose=False):
+        pass
+
+    def add(self, name: str, url: str = 'localhost', tags: List[str] = ['default']):
+        pass
+
+
+class Flow(Cliar):
+    def start(self, name: str):
+        pass
+
+
+class Basic(Cliar):
+    '''Basic CLI.'''
+
+    remote = Remote
+    flow = Flow
+
+    @set_arg_map({'user': 'as'})
+    @set_sharg_map({'user': None})
+    def _root(self, user='', password='', debug=False):
+        pass
+
+    def add(self, x: int, y: int):
+        pass
+
+    def power(self, x: float, power=2, base: float = 10.0):
+        pass
+
+    @add_aliases(['sum', 'plus'])
+    def summ(self, numbers: List[int]):
+        pass
+
+    def avg(self, numbers: List[float] = [1, 2, 3], weights: List[float] = [], strict=False):
+        pass
+
+    def head(self, first: str, rest: List[str], last: str):
+        pass
+
+    def repeat(self, times: int = '3', message='hi'):
+        pass
+
+    @set_name('fac')
+    def factorial(self, n: int):
+        pass
+
+    def echo(self, message):
+        pass
+
+
+class WithRootPositional(Cliar):
+    def _root(self, target: str, force=False):
+        pass
+
+    def deploy(self, version: str):
+        pass
+
+
+SUPPORTED = [
+    (Basic, []),
+    (Basic, ['--as', 'me', '-p', 'secret']),
+    (Basic, ['--as=me', '--password=secret', '--debug']),
+    (Basic, ['add', '1', '2']),
+    (Basic, ['add', '1', '-2']),
+    (Basic, ['--debug', 'add', '-1', '-2']),
+    (Basic, ['power', '2']),
+    (Basic, ['power', '2', '--power', '3', '-b', '2']),
+    (Basic, ['power', '-p', '3', '2.5']),
+    (Basic, ['power', '2', '-p', '3', '-p', '4']),
+    (Basic, ['summ', '1', '2', '3']),
+    (Basic, ['sum', '1']),
+    (Basic, ['plus', '-1', '2']),
+    (Basic, ['avg']),
+    (Basic, ['avg', '-n', '1', '2', '-w', '0.5', '0.5', '-s']),
+    (Basic, ['avg', '--numbers', '--strict']),
+    (Basic, ['head', 'a', 'b', 'c', 'd']),
+    (Basic, ['head', 'a', 'b', 'c']),
+    (Basic, ['repeat']),
+    (Basic, ['repeat', '-t', '5', '-m', 'hello']),
+    (Basic, ['fac', '5']),
+    (Basic, ['echo', '']),
+    (Basic, ['echo', '-']),
+    (Basic, ['remote']),
+    (Basic, ['remote', '-v']),
+    (Basic, ['remote', 'add', 'origin']),
+    (Basic, ['-p', 'x', 'remote', 'add', 'origin', '-u', 'url', '-t', 'a', 'b']),
+    (Basic, ['flow']),
+    (Basic, ['flow', 'start', 'feature']),
+    (WithRootPositional, ['prod']),
+    (WithRootPositional, ['prod', '-f']),
+    (WithRootPositional, ['-f', 'prod', 'deploy', '1.0']),
+]
+
+FALLBACK = [
+    (Basic, ['--pass', 'secret']),
+    (Basic, ['power', '2', '-p3']),
+    (Basic, ['avg', '-sn', '1']),
+    (Basic, ['echo', '--', '-x']),
+]
+
+ERRORS = [
+    (Basic, ['-h']),
+    (Basic, ['add', '-h']),
+    (Basic, ['add', '1']),
+    (Basic, ['add', '1', '2', '3']),
+    (Basic, ['add', '1', 'x']),
+    (Basic, ['add', '1', '2', '--bogus']),
+    (Basic, ['--bogus', 'add', '1', '2']),
+    (Basic, ['bogus']),
+    (Basic, ['calculate-factorial', '3']),
+    (Basic, ['summ']),
+    (Basic, ['power', '2', '-p']),
+    (Basic, ['power', '2', '-p', '-b', '3']),
+    (Basic, ['avg', '--strict=yes']),
+    (Basic, ['head', 'a']),
+    (Basic, ['head', 'a', 'b']),
+    (Basic, ['remote', 'bogus']),
+    (Basic, ['remote', 'add']),
+    (Basic, ['flow', 'start']),
+    (Basic, ['--as']),
+    (WithRootPositional, []),
+    (WithRootPositional, ['prod', 'deploy']),
+]
+
+
+def _parse_with_argparse(cli_class, args):
+    try:
+        return cli_class()._parser.parse_args(args)
+
+    except CliarError:
+        return None
+
+
+def _parse_with_fast_engine(cli_class, args):
+    try:
+        return parse_args(cli_class(engine='fast'), args)
+
+    except Fallback:
+        return None
+
+
+def _handler_args(namespace):
+    return (
+        type(namespace._cli),
+        namespace._command,
+        {arg.param_name: getattr(namespace, arg.name) for arg in namespace._command.args},
+        {key: value for key, value in vars(namespace).items() if key != '_cli'}
+    )
+
+
+@mark.parametrize('cli_class, args', SUPPORTED)
+def test_supported(cli_class, args):
+    expected = _parse_with_argparse(cli_class, args)
+    actual = _parse_with_fast_engine(cli_class, args)
+
+    assert expected is not None
+    assert actual is not None
+    assert _handler_args(actual) == _handler_args(expected)
+
+
+@mark.parametrize('cli_class, args', FALLBACK)
+def test_fallback(cli_class, args):
+    assert _parse_with_argparse(cli_class, args) is not None
+    assert _parse_with_fast_engine(cli_class, args) is None
+
+
+@mark.parametrize('cli_class, args', ERRORS)
+def test_errors(capsys, cli_class, args):
+    assert _parse_with_argparse(cli_class, args) is None
+    assert _parse_with_fast_engine(cli_class, args) is None
+
+
+def test_random_args(capsys):
+    tokens = [
+        'add', 'power', 'sum', 'avg', 'head', 'repeat', 'remote', 'flow', 'start', 'fac',
+        '1', '-2', '2.5', 'x', '', '-', '--',
+        '-p', '--power', '-b', '-n', '-w', '-s', '-t', '-m', '-u', '-v', '--as', '--debug',
+        '--power=3', '-p=2', '-p3', '--pow', '--bogus', '-h'
+    ]
+
+    random = Random(42)
+
+    for _ in range(1000):
+        args = [
+            random.choice(tokens[:10]),
+            *(random.choice(tokens) for _ in range(random.randint(0, 5)))
+        ]
+
+        expected = _parse_with_argparse(Basic, args)
+        actual = _parse_with_fast_engine(Basic, args)
+
+        if expected is None:
+            assert actual is None, args
+
+        elif actual is not None:
+            assert _handler_args(actual) == _handler_args(expected), args
+
+
+def test_lazy(capsys):
+    cli = Basic(lazy=True, engine='fast')
+    namespace = parse_args(cli, ['remote', 'add', 'origin'])
+
+    assert namespace.name == 'origin'
+    assert not cli._commands
+    assert not cli._subclis['remote']._commands
+
+
+def test_unknown_engine():
+    with raises(ValueError) as excinfo:
+        Basic(engine='regex')
+
+    assert 'Unknown parser engine: regex' in str(excinfo.value)
@@ -0,0 +1,125 @@
+import asyncio
+import sys
+from subprocess import run, PIPE
+
+from pytest import fixture, raises
+
+
+@fixture
+def files(datadir):
+    sys.path.insert(0, str(datadir))
+
+    from files import Files
+
+    yield Files()
+
+    sys.path.remove(str(datadir))
+
+
+@fixture
+def log(tmp_path):
+    log = tmp_path/'app.log'
+    log.write_bytes(b'INFO start\nERROR fail\nINFO retry\nERROR fail again\n')
+
+    return log
+
+
+def test_mapped_file(capsys, files, log):
+    files.run(['count', str(log), 'ERROR'])
+
+    assert capsys.readouterr().out == '2\n'
+    assert files.kept.closed
+    assert files.kept.path == str(log)
+
+    files.run(['acount', str(log), 'INFO'])
+
+    assert capsys.readouterr().out == '2\n'
+    assert files.kept.closed
+
+
+def test_memoryview(capsys, files, log, tmp_path):
+    files.run(['size', str(log)])
+
+    assert capsys.readouterr().out == f'{log.stat().st_size}\n'
+
+    with raises(ValueError):
+        files.kept.nbytes
+
+    empty = tmp_path/'empty.log'
+    empty.write_bytes(b'')
+
+    files.run(['size', str(empty)])
+
+    assert capsys.readouterr().out == '0\n'
+
+
+def test_file_objects(capsys, files, log):
+    files.run(['head', str(log)])
+
+    assert capsys.readouterr().out == 'INFO start\n'
+    assert files.kept.closed
+
+    files.run(['lines', str(log)])
+
+    assert capsys.readouterr().out == '4\n'
+    assert files.kept.closed
+
+    files.run(['where', str(log)])
+
+    assert capsys.readouterr().out == f'{type(log).__name__} app.log\n'
+
+
+def test_returned_iterators(files, log):
+    errors = files.run(['errors', str(log)])
+
+    assert next(errors) == 'ERROR fail'
+    assert not files.kept.closed
+    assert list(errors) == ['ERROR fail again']
+    assert files.kept.closed
+
+    matches = files.run(['matches', str(log), 'ERROR'])
+
+    assert next(matches) == 11
+    assert not files.kept.closed
+    matches.close()
+    assert files.kept.closed
+
+    async def collect(records):
+        return [record async for record in records]
+
+    assert asyncio.run(collect(files.run(['aerrors', str(log)]))) == [
+        'ERROR fail', 'ERROR fail again'
+    ]
+    assert files.kept.closed
+
+
+def test_commandline(datadir, log, tmp_path):
+    result = run(
+        ['python', str(datadir/'files.py'), 'lines', '-'],
+        input='a\nb\n',
+        stdout=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.stdout == '2\n'
+
+    result = run(
+        ['python', str(datadir/'files.py'), 'count', str(tmp_path/'missing.log'), 'ERROR'],
+        stderr=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.returncode == 2
+    assert "can't open" in result.stderr
+
+    empty = tmp_path/'empty.log'
+    empty.write_bytes(b'')
+
+    result = run(
+        ['python', str(datadir/'files.py'), 'count', str(empty), 'ERROR'],
+        stderr=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.returncode == 2
+    assert "can't map" in result.stderr
@@ -0,0 +1,60 @@
+import asyncio
+import re
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+from cliar import Cliar, MappedFile
+
+
+class Files(Cliar):
+    '''Files CLI.'''
+
+    def count(self, log: MappedFile, pattern: str):
+        print(len(re.findall(pattern.encode(), log)))
+        self.kept = log
+
+    async def acount(self, log: MappedFile, pattern: str):
+        await asyncio.sleep(0)
+        print(len(re.findall(pattern.encode(), log)))
+        self.kept = log
+
+    def size(self, data: memoryview):
+        print(data.nbytes)
+        self.kept = data
+
+    def head(self, log: BinaryIO):
+        print(log.readline().decode().strip())
+        self.kept = log
+
+    def lines(self, log: TextIO):
+        print(sum(1 for _ in log))
+        self.kept = log
+
+    def errors(self, log: TextIO):
+        self.kept = log
+
+        for line in log:
+            if line.startswith('ERROR'):
+                yield line.strip()
+
+    def matches(self, log: MappedFile, pattern: str):
+        self.kept = log
+
+        for match in re.finditer(pattern.encode(), log):
+            yield match.start()
+
+    async def aerrors(self, log: TextIO):
+        self.kept = log
+
+        for line in log:
+            await asyncio.sleep(0)
+
+            if line.startswith('ERROR'):
+                yield line.strip()
+
+    def where(self, path: Path):
+        print(type(path).__name__, path.name)
+
+
+if __name__ == '__main__':
+    Files().parse()
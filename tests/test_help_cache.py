@@ -0,0 +1,83 @@
+import sys
+from argparse import ArgumentParser
+from os import environ
+from shutil import copy
+from subprocess import run, PIPE
+
+from pytest import fixture, mark, raises
+
+
+_help_args = [
+    ['-h'],
+    ['--help'],
+    ['checkout', '-h'],
+    ['co', '--help'],
+    ['status', '-h'],
+    ['remote', '-h'],
+    ['remote', 'add', '-h'],
+]
+
+
+def _run(script, args, env):
+    return run(['python', str(script), *args], stdout=PIPE, env=env, check=True).stdout
+
+
+@fixture
+def env(tmp_path):
+    return {**environ, 'CLIAR_CACHE_DIR': str(tmp_path/'cache'), 'COLUMNS': '60'}
+
+
+@mark.parametrize('args', _help_args)
+def test_equivalence(datadir, env, args):
+    rendered = _run(datadir/'helped.py', args, {**env, 'CLIAR_NO_CACHE': '1'})
+
+    assert _run(datadir/'helped.py', args, env) == rendered
+    assert _run(datadir/'helped.py', args, env) == rendered
+
+    narrow = _run(datadir/'helped.py', args, {**env, 'COLUMNS': '40', 'CLIAR_NO_CACHE': '1'})
+
+    assert _run(datadir/'helped.py', args, {**env, 'COLUMNS': '40'}) == narrow
+
+
+@mark.parametrize('lazy', [True, False])
+def test_served_from_spec(capsys, datadir, monkeypatch, lazy):
+    sys.path.insert(0, str(datadir))
+
+    from helped import Helped
+
+    sys.path.remove(str(datadir))
+
+    monkeypatch.setenv('CLIAR_NO_CACHE', '1')
+    monkeypatch.setattr(sys, 'argv', ['helped.py', 'remote', 'add', '-h'])
+
+    with raises(SystemExit):
+        Helped(lazy=lazy).parse()
+
+    rendered = capsys.readouterr().out
+
+    def format_help(parser):
+        raise AssertionError('Help must not be rendered again')
+
+    monkeypatch.setattr(ArgumentParser, 'format_help', format_help)
+
+    cli = Helped(lazy=lazy)
+
+    with raises(SystemExit) as exit_info:
+        cli.parse()
+
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out == rendered
+    assert not cli._commands
+    assert not cli._subclis
+
+
+def test_invalidation(datadir, env, tmp_path):
+    script = tmp_path/'helped.py'
+    copy(str(datadir/'helped.py'), str(script))
+
+    assert b'Show status.' in _run(script, ['-h'], env)
+    assert b'Show status.' in _run(script, ['-h'], env)
+
+    script.write_text(script.read_text().replace('Show status.', 'Show the working tree status.'))
+
+    assert b'Show the working tree status.' in _run(script, ['-h'], env)
@@ -0,0 +1,45 @@
+from cliar import Cliar, set_help, add_aliases
+
+
+class Remote(Cliar):
+    '''Manage remotes.'''
+
+    def add(self, name: str, url: str = ''):
+        '''Add a remote.
+
+        The remote is fetched right away.
+        '''
+
+        print(f'Adding remote {name}')
+
+    def show(self):
+        '''Show remotes.'''
+
+        print('Remotes')
+
+
+class Helped(Cliar):
+    '''Helped CLI with a long description that doesn't fit into a single line of a narrow
+    terminal and gets wrapped by argparse.
+    '''
+
+    remote = Remote
+
+    def _root(self, user='guest'):
+        return NotImplemented
+
+    @add_aliases(['co'])
+    @set_help({'branch': 'Branch to check out', 'force': 'Discard local changes'})
+    def checkout(self, branch: str, force=False):
+        '''Check out a branch.'''
+
+        print(f'Checking out {branch}')
+
+    def status(self, short=False):
+        '''Show status.'''
+
+        print('Clean')
+
+
+if __name__ == '__main__':
+    Helped(lazy=True, cache=True).parse()
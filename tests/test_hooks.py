@@ -0,0 +1,183 @@
+import asyncio
+import json
+import socket
+from os import environ
+from subprocess import run, PIPE
+
+from pytest import raises
+
+from cliar import Cliar, ParseError, HelpRequested
+
+
+class Remote(Cliar):
+    '''Remote help.'''
+
+    def add(self, name: str):
+        return f'Adding remote {name}'
+
+
+class Calc(Cliar):
+    '''Calculator.'''
+
+    remote = Remote
+
+    def add(self, x: int, y: int):
+        return x + y
+
+    async def wait(self, value: int):
+        await asyncio.sleep(0)
+        return value
+
+    def fail(self):
+        raise RuntimeError('Failed')
+
+
+def _record(cli):
+    events = []
+
+    def make_hook(event):
+        def hook(invocation):
+            events.append((event, list(invocation.command), invocation.handler_args,
+                           invocation.result, invocation.status))
+
+        return hook
+
+    for event in ('before_parse', 'after_parse', 'before_handler', 'after_handler', 'on_error'):
+        cli.add_hook(event, make_hook(event))
+
+    return events
+
+
+def test_events():
+    calc = Calc()
+    events = _record(calc)
+
+    assert calc.run(['add', '1', '2']) == 3
+    assert events == [
+        ('before_parse', [], None, None, None),
+        ('after_parse', ['add'], None, None, None),
+        ('before_handler', ['add'], {'x': 1, 'y': 2}, None, None),
+        ('after_handler', ['add'], {'x': 1, 'y': 2}, 3, 0),
+    ]
+
+
+def test_nested_and_async():
+    calc = Calc(lazy=True)
+    events = _record(calc)
+
+    assert calc.run(['remote', 'add', 'origin']) == 'Adding remote origin'
+    assert events[-1] == ('after_handler', ['remote', 'add'], {'name': 'origin'},
+                          'Adding remote origin', 0)
+
+    assert calc.run(['wait', '42']) == 42
+    assert events[-1] == ('after_handler', ['wait'], {'value': 42}, 42, 0)
+
+    asyncio.run(calc.parse_async(['wait', '7']))
+    assert events[-1] == ('after_handler', ['wait'], {'value': 7}, 7, 0)
+
+
+def test_errors():
+    calc = Calc()
+    errors = []
+
+    calc.add_hook('on_error', lambda invocation: errors.append(
+        (invocation.command, type(invocation.error), invocation.status)
+    ))
+
+    with raises(ParseError):
+        calc.run(['add', 'one'])
+
+    with raises(HelpRequested):
+        calc.run(['-h'])
+
+    with raises(RuntimeError):
+        calc.run(['fail'])
+
+    assert errors == [([], ParseError, 2), ([], HelpRequested, 0), (['fail'], RuntimeError, 1)]
+
+    with raises(ValueError):
+        calc.add_hook('after_everything', print)
+
+
+def test_phases():
+    calc = Calc()
+    invocations = []
+
+    calc.add_hook('after_handler', invocations.append)
+    calc.run(['add', '1', '2'])
+
+    assert set(invocations[0].phases) == {'parse', 'handler'}
+    assert invocations[0].duration >= sum(invocations[0].phases.values())
+
+
+def test_batch():
+    calc = Calc()
+    invocations = []
+
+    calc.add_hook('after_handler', invocations.append)
+    calc.add_hook('on_error', invocations.append)
+
+    lines = ['add 1 2', '{"command": "remote add", "args": {"name": "origin"}}', 'add x']
+
+    assert calc.batch(lines) == 2
+    assert sorted((invocation.command, invocation.status) for invocation in invocations) == [
+        ([], 2), (['add'], 0), (['remote', 'add'], 0)
+    ]
+
+
+def _run(datadir, *args, **env):
+    return run(
+        ['python', str(datadir/'hooked.py'), *args],
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True,
+        env={**environ, **env}
+    )
+
+
+def test_metrics_file(datadir, tmp_path):
+    metrics_path = tmp_path/'metrics.jsonl'
+
+    assert _run(datadir, 'add', '1', '2', CLIAR_METRICS=str(metrics_path)).stdout == '3\n'
+    assert _run(datadir, 'remote', 'add', 'origin', CLIAR_METRICS=str(metrics_path)).returncode == 0
+    assert _run(datadir, 'wait', CLIAR_METRICS=str(metrics_path)).stdout == 'Done\n'
+    assert _run(datadir, 'fail', CLIAR_METRICS=str(metrics_path)).returncode == 3
+    assert _run(datadir, 'add', 'x', CLIAR_METRICS=str(metrics_path)).returncode == 2
+
+    records = [json.loads(line) for line in metrics_path.read_text().splitlines()]
+
+    assert [(record['command'], record['status'], record['error']) for record in records] == [
+        ('add', 0, None),
+        ('remote add', 0, None),
+        ('wait', 0, None),
+        ('fail', 3, 'SystemExit'),
+        ('', 2, 'ParseError'),
+    ]
+    assert records[2]['phases_ms']['handler'] >= 50
+    assert records[2]['duration_ms'] >= records[2]['phases_ms']['handler']
+    assert all(record['peak_rss'] > 0 for record in records)
+
+
+def test_metrics_socket(datadir, tmp_path):
+    socket_path = tmp_path/'metrics.sock'
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as server:
+        server.bind(str(socket_path))
+        server.settimeout(10)
+
+        result = _run(datadir, 'add', '1', '2', CLIAR_METRICS=f'unix:{socket_path}')
+
+        assert result.stdout == '3\n'
+
+        record = json.loads(server.recv(65536))
+
+    assert record['command'] == 'add'
+    assert record['status'] == 0
+
+
+def test_metrics_unavailable(datadir, tmp_path):
+    result = _run(datadir, 'add', '1', '2', CLIAR_METRICS=f'unix:{tmp_path/"missing.sock"}')
+
+    assert result.returncode == 0
+    assert result.stdout == '3\n'
+    assert result.stderr == ''
@@ -0,0 +1,31 @@
+import asyncio
+import sys
+
+from cliar import Cliar
+
+
+class Remote(Cliar):
+    '''Remote help.'''
+
+    def add(self, name: str):
+        print(f'Adding remote {name}')
+
+
+class Hooked(Cliar):
+    '''CLI with metrics.'''
+
+    remote = Remote
+
+    def add(self, x: int, y: int):
+        print(x + y)
+
+    async def wait(self):
+        await asyncio.sleep(0.05)
+        print('Done')
+
+    def fail(self):
+        sys.exit(3)
+
+
+if __name__ == '__main__':
+    Hooked().parse()
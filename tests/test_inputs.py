@@ -0,0 +1,75 @@
+from subprocess import run, PIPE
+from typing import Iterator
+
+from cliar import Cliar, inputs
+
+
+def _run(datadir, args, input=''):
+    return run(
+        ['python', str(datadir/'inputs.py'), *args],
+        input=input,
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True
+    )
+
+
+def test_stdin(datadir):
+    assert _run(datadir, ['total', '-'], '1\n2\n3\n').stdout == '6\n'
+    assert _run(datadir, ['first', '--count', '2'], 'a b\nc\nd\n').stdout == 'a b\nc\n'
+    assert _run(datadir, ['size', '-'], 'ab\ncd\r\n').stdout == '4\n'
+    assert _run(datadir, ['kind', '-'], 'a\n').stdout == 'generator str\n'
+
+
+def test_file(datadir, tmp_path):
+    ids = tmp_path/'ids.txt'
+    ids.write_text('\n'.join(map(str, range(100000))) + '\n')
+
+    assert _run(datadir, ['total', str(ids)]).stdout == f'{sum(range(100000))}\n'
+    assert _run(datadir, ['first', '--lines', str(ids)]).stdout == '0\n'
+
+
+def test_closed_after_call(tmp_path, monkeypatch):
+    class Kept(Cliar):
+        def head(self, lines: Iterator[str]):
+            self.lines = lines
+
+            return next(lines)
+
+    ids = tmp_path/'ids.txt'
+    ids.write_text('1\n2\n3\n')
+
+    opened = []
+
+    def spy_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(inputs, 'open', spy_open, raising=False)
+
+    for engine in ('argparse', 'fast'):
+        cli = Kept(engine=engine)
+
+        assert cli.run(['head', str(ids)]) == '1'
+        assert all(lines.closed for lines in opened)
+
+    assert opened
+
+
+def test_errors(datadir, tmp_path):
+    result = _run(datadir, ['total', str(tmp_path/'missing.txt')])
+
+    assert result.returncode == 2
+    assert "can't open" in result.stderr
+
+    result = _run(datadir, ['total', '-'], '1\ntwo\n')
+
+    assert result.returncode == 1
+    assert "<stdin>:2: invalid int value: 'two'" in result.stderr
+
+
+def test_help(datadir):
+    help_message = _run(datadir, ['total', '-h']).stdout
+
+    assert 'ID_FILE' in help_message
+    assert 'File with one ID per line' in help_message
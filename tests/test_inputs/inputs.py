@@ -0,0 +1,26 @@
+from typing import Iterable, Iterator
+
+from cliar import Cliar, set_help, set_metavars
+
+
+class Inputs(Cliar):
+    '''Inputs CLI.'''
+
+    @set_help({'ids': 'File with one ID per line'})
+    @set_metavars({'ids': 'ID_FILE'})
+    def total(self, ids: Iterator[int]):
+        print(sum(ids))
+
+    def first(self, lines: Iterable[str] = '-', count=1):
+        for _, line in zip(range(count), lines):
+            print(line)
+
+    def size(self, chunks: Iterator[bytes]):
+        print(sum(len(chunk) for chunk in chunks))
+
+    def kind(self, lines: Iterator):
+        print(type(lines).__name__, type(next(lines)).__name__)
+
+
+if __name__ == '__main__':
+    Inputs().parse()
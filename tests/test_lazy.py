@@ -0,0 +1,64 @@
+from subprocess import run
+
+
+def test_root(capfd, datadir):
+    run(f'python {datadir/"lazy.py"}', shell=True)
+    assert capfd.readouterr().out.strip() == 'Git root.'
+
+    run(f'python {datadir/"lazy.py"} --verbose --user foo', shell=True)
+    assert capfd.readouterr().out.strip() == 'Git root.'
+
+
+def test_only_invoked_command_registered(capfd, datadir):
+    run(f'python {datadir/"lazy.py"} registered', shell=True)
+    assert capfd.readouterr().out.strip() == 'registered 0'
+
+    run(f'python {datadir/"lazy.py"} -v --user foo registered', shell=True)
+    assert capfd.readouterr().out.strip() == 'registered 0'
+
+
+def test_commands(capfd, datadir):
+    run(f'python {datadir/"lazy.py"} branch dev', shell=True)
+    assert capfd.readouterr().out.strip() == 'Setting branch to dev'
+
+    run(f'python {datadir/"lazy.py"} remote add origin', shell=True)
+    assert capfd.readouterr().out.strip() == 'Adding remote origin'
+
+
+def test_not_implemented_root(capfd, datadir):
+    run(f'python {datadir/"lazy.py"} remote', shell=True)
+    output = capfd.readouterr().out
+
+    assert 'Remote help.' in output
+    assert 'Remote add help.' in output
+    assert 'Remote show help.' in output
+
+
+def test_helps(capfd, datadir):
+    run(f'python {datadir/"lazy.py"} -h', shell=True)
+    output = capfd.readouterr().out
+
+    assert 'Git branch help.' in output
+    assert 'Show registered commands.' in output
+    assert 'Remote help.' in output
+
+    run(f'python {datadir/"lazy.py"} remote add -h', shell=True)
+    assert 'Remote add help.' in capfd.readouterr().out
+
+
+def test_errors(capfd, datadir):
+    run(f'python {datadir/"lazy.py"} brunch dev', shell=True)
+    assert "invalid choice: 'brunch' (choose from 'branch', 'registered', 'remote')" in (
+        capfd.readouterr().err.splitlines()[-1]
+    )
+
+    run(f'python {datadir/"lazy.py"} --bogus registered', shell=True)
+    error = capfd.readouterr().err
+
+    assert error.splitlines()[0] == 'usage: lazy.py [-h] [-v] [-u USER] {branch,registered,remote} ...'
+    assert error.splitlines()[-1].endswith('unrecognized arguments: --bogus')
+
+    run(f'python {datadir/"lazy.py"} remote add', shell=True)
+    assert capfd.readouterr().err.splitlines()[-1].endswith(
+        'the following arguments are required: name'
+    )
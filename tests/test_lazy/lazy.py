@@ -0,0 +1,34 @@
+from cliar import Cliar
+
+
+class Remote(Cliar):
+    '''Remote help.'''
+
+    def add(self, name: str):
+        '''Remote add help.'''
+        print(f'Adding remote {name}')
+
+    def show(self):
+        '''Remote show help.'''
+        print('Showing all remotes')
+
+
+class Git(Cliar):
+    '''Git help.'''
+
+    remote = Remote
+
+    def _root(self, verbose=False, user=''):
+        print('Git root.')
+
+    def branch(self, name):
+        '''Git branch help.'''
+        print(f'Setting branch to {name}')
+
+    def registered(self):
+        '''Show registered commands.'''
+        print(' '.join(sorted(self._commands)), len(self._subclis))
+
+
+if __name__ == '__main__':
+    Git(lazy=True).parse()
@@ -0,0 +1,225 @@
+import asyncio
+from subprocess import Popen, PIPE
+from threading import Thread
+from time import sleep
+from typing import List
+
+from pytest import fixture, raises
+
+from cliar import Cliar, memoize, set_arg_map, set_choices, set_help, set_metavars, set_sharg_map
+from cliar.memo import clear_results
+
+
+class Memoized(Cliar):
+    slow_calls = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def _root(self, unit=''):
+        return NotImplemented
+
+    @memoize()
+    def total(self, numbers: List[int]):
+        self.calls.append(numbers)
+        return f'{sum(numbers)}{self.global_args["unit"]}'
+
+    @memoize(ttl=0.1)
+    def now(self):
+        self.calls.append(None)
+        return len(self.calls)
+
+    @memoize()
+    def lines(self, count: int):
+        self.calls.append(count)
+
+        for number in range(count):
+            yield number
+
+    @memoize()
+    async def wait(self, value: int):
+        self.calls.append(value)
+        await asyncio.sleep(0)
+        return value * 2
+
+    @memoize()
+    async def slow(self, value: int):
+        Memoized.slow_calls.append(value)
+        await asyncio.sleep(0.2)
+        return value
+
+    @memoize()
+    def fib(self, number: int):
+        self.calls.append(number)
+        return number if number < 2 else self.fib(number=number-1) + self.fib(number=number-2)
+
+    @memoize()
+    def report(self, numbers: List[int]):
+        return f'total: {self.total(numbers=numbers)}'
+
+    @memoize(max_size=0)
+    def uncached(self, value: int):
+        self.calls.append(value)
+        return value
+
+
+class Stacked(Cliar):
+    @set_help({'name': 'who to greet'})
+    @set_metavars({'name': 'WHO'})
+    @set_choices({'name': ['alice', 'bob']}, ttl=0)
+    @set_arg_map({'number': 'times'})
+    @set_sharg_map({'number': 'n'})
+    @memoize()
+    def greet(self, name, number=1):
+        return f'{name} {number}'
+
+
+@fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv('CLIAR_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv('CLIAR_NO_CACHE', raising=False)
+    monkeypatch.delenv('CLIAR_NO_RESULT_CACHE', raising=False)
+    monkeypatch.delenv('CLIAR_REFRESH', raising=False)
+    return tmp_path
+
+
+def test_hits():
+    memoized = Memoized()
+
+    assert memoized.run(['total', '1', '2']) == '3'
+    assert memoized.run(['total', '1', '2']) == '3'
+    assert memoized.calls == [[1, 2]]
+
+    assert memoized.run(['total', '2', '1']) == '3'
+    assert memoized.run(['--unit', 'kg', 'total', '1', '2']) == '3kg'
+    assert len(memoized.calls) == 3
+
+    assert Memoized().run(['total', '1', '2']) == '3'
+    assert len(memoized.calls) == 3
+
+
+def test_ttl():
+    memoized = Memoized()
+
+    assert memoized.run(['now']) == 1
+    assert memoized.run(['now']) == 1
+
+    sleep(0.15)
+
+    assert memoized.run(['now']) == 2
+
+
+def test_flags(monkeypatch):
+    memoized = Memoized()
+
+    memoized.run(['total', '1'])
+    memoized.run(['total', '1', '--no-cache'])
+    assert len(memoized.calls) == 2
+
+    memoized.run(['total', '1', '--refresh'])
+    memoized.run(['total', '1'])
+    assert len(memoized.calls) == 3
+
+    monkeypatch.setenv('CLIAR_REFRESH', '1')
+    memoized.run(['total', '1'])
+    assert len(memoized.calls) == 4
+
+    monkeypatch.setenv('CLIAR_NO_RESULT_CACHE', '1')
+    memoized.run(['total', '5'])
+    monkeypatch.delenv('CLIAR_REFRESH')
+    memoized.run(['total', '5'])
+    assert len(memoized.calls) == 6
+
+    monkeypatch.delenv('CLIAR_NO_RESULT_CACHE')
+    monkeypatch.setenv('CLIAR_NO_CACHE', '1')
+    memoized.run(['total', '6'])
+    memoized.run(['total', '6'])
+    assert len(memoized.calls) == 7
+
+    assert memoized._get_command('total').args[-1].short_name == ''
+
+    with raises(NameError):
+        memoize()(lambda self, refresh=False: None)
+
+
+def test_stacked_decorators():
+    args = {arg.param_name: arg for arg in Stacked()._get_command('greet').args}
+
+    assert args['name'].help == 'who to greet'
+    assert args['name'].metavar == 'WHO'
+    assert list(args['name'].choices) == ['alice', 'bob']
+    assert args['number'].name == 'times'
+    assert args['number'].short_name == 'n'
+    assert args['no_cache'].short_name == args['refresh'].short_name == ''
+    assert args['no_cache'].help == 'call the command without using the cached result'
+
+    assert Stacked().run(['greet', 'bob', '-n', '2', '--no-cache']) == 'bob 2'
+
+
+def test_iterators_and_coroutines():
+    memoized = Memoized()
+
+    assert list(memoized.run(['lines', '3'])) == [0, 1, 2]
+    assert list(memoized.run(['lines', '3'])) == [0, 1, 2]
+
+    assert memoized.run(['wait', '4']) == 8
+    assert memoized.run(['wait', '4']) == 8
+
+    assert memoized.calls == [3, 4]
+
+
+def test_eviction(cache_dir):
+    memoized = Memoized()
+
+    memoized.run(['uncached', '1'])
+    memoized.run(['uncached', '1'])
+
+    assert memoized.calls == [1, 1]
+    assert not list((cache_dir/'results').glob('*/*.pickle'))
+
+    memoized.run(['total', *map(str, range(64))])
+    lock_paths = list((cache_dir/'results').glob('*/*.lock'))
+
+    assert lock_paths
+    assert clear_results() == 1
+    assert not any(lock_path.exists() for lock_path in lock_paths)
+
+
+def test_nested_calls():
+    memoized = Memoized()
+
+    assert memoized.run(['fib', '12']) == 144
+    assert sorted(memoized.calls) == list(range(13))
+
+    assert memoized.run(['report', '1', '2']) == 'total: 3'
+    assert memoized.run(['total', '1', '2']) == '3'
+    assert memoized.calls[13:] == [[1, 2]]
+
+
+def test_concurrent_async_calls():
+    threads = [Thread(target=Memoized().run, args=(['slow', '7'],)) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert Memoized.slow_calls == [7]
+
+
+def test_concurrent_processes(datadir, tmp_path):
+    log = tmp_path/'calls.log'
+
+    processes = [
+        Popen(
+            ['python', str(datadir/'memoized.py'), 'report', 'hosts', '--log', str(log)],
+            stdout=PIPE,
+            universal_newlines=True
+        )
+        for _ in range(4)
+    ]
+
+    assert [process.communicate()[0] for process in processes] == ['HOSTS\n'] * 4
+    assert len(log.read_text().splitlines()) == 1
@@ -0,0 +1,25 @@
+import os
+import sys
+from time import sleep
+
+from cliar import Cliar, memoize
+
+
+class Memoized(Cliar):
+    '''CLI with a slow memoized command.'''
+
+    @memoize()
+    def report(self, name: str, log=''):
+        with open(log, 'a') as log_file:
+            log_file.write(f'{os.getpid()}\n')
+
+        sleep(0.2)
+
+        return name.upper()
+
+    def _root(self):
+        return NotImplemented
+
+
+if __name__ == '__main__':
+    print(Memoized().run(sys.argv[1:]))
@@ -0,0 +1,40 @@
+from typing import List
+
+from cliar import Cliar, set_help
+
+
+class Base(Cliar):
+    @set_help({'name': 'Who to greet'})
+    def hello(self, name: str, times=1):
+        print(f'Hello {name}!' * times)
+
+
+class Derived(Base):
+    def add(self, numbers: List[int]):
+        print(sum(numbers))
+
+
+def test_spec_shared_by_instances():
+    assert Base()._spec is Base()._spec
+    assert Base(lazy=True)._spec is Base()._spec
+
+
+def test_commands_shared_by_subclasses():
+    base, derived = Base(), Derived()
+
+    assert derived._spec is not base._spec
+    assert derived._commands['hello'] is base._commands['hello']
+    assert 'add' in derived._commands
+    assert 'add' not in base._commands
+
+
+def test_compact_records():
+    command = Derived()._commands['hello']
+
+    assert not hasattr(command, '__dict__')
+    assert not hasattr(command.args[0], '__dict__')
+
+    assert [(arg.name, arg.param_name, arg.help) for arg in command.args] == [
+        ('name', 'name', 'Who to greet'),
+        ('times', 'times', '')
+    ]
@@ -0,0 +1,93 @@
+from os import environ, pathsep
+from subprocess import run, PIPE
+
+from pytest import fixture, mark
+
+from cliar import Cliar
+
+
+class Host(Cliar):
+    '''Host CLI with plugins.'''
+
+    def status(self):
+        '''Show the status.'''
+
+        return 'OK'
+
+
+@fixture
+def env(datadir, tmp_path):
+    return {
+        **environ,
+        'PYTHONPATH': pathsep.join((str(datadir), environ.get('PYTHONPATH', ''))),
+        'CLIAR_CACHE_DIR': str(tmp_path/'cache')
+    }
+
+
+def _run(datadir, env, *args):
+    return run(
+        ['python', str(datadir/'host.py'), *args],
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True,
+        env=env
+    )
+
+
+def _imported(result):
+    return {
+        name for name in ('plugin_audit', 'plugin_deploy')
+        if f'Importing {name}' in result.stderr
+    }
+
+
+def test_lazy_import(datadir, env):
+    _run(datadir, env, '-h')
+
+    result = _run(datadir, env, '-h')
+    assert 'deploy              Deploy the app.' in result.stdout
+    assert 'audit               Audit the logs.' in result.stdout
+    assert _imported(result) == set()
+
+    result = _run(datadir, env, 'deploy', 'prod')
+    assert result.stdout == 'Deploying to prod\n'
+    assert _imported(result) == {'plugin_deploy'}
+
+    result = _run(datadir, env, 'audit', 'logs', '-h')
+    assert 'Show the logs.' in result.stdout
+    assert _imported(result) == {'plugin_audit'}
+
+    result = _run(datadir, env, 'status')
+    assert result.stdout == 'OK\n'
+    assert _imported(result) == set()
+
+
+def test_index(datadir, env, tmp_path):
+    _run(datadir, env, '-h')
+    assert len(list((tmp_path/'cache'/'plugins').glob('*.json'))) == 1
+
+    dist_info = datadir/'more_plugins-1.0.dist-info'
+    dist_info.mkdir()
+    (dist_info/'METADATA').write_text('Metadata-Version: 2.1\nName: more-plugins\nVersion: 1.0\n')
+    (dist_info/'entry_points.txt').write_text('[host.plugins]\nship = plugin_deploy:Deploy\n')
+
+    result = _run(datadir, env, '-h')
+    assert 'ship ' in result.stdout
+
+
+@mark.parametrize('lazy', [True, False])
+def test_run(monkeypatch, datadir, tmp_path, capsys, lazy):
+    monkeypatch.syspath_prepend(str(datadir))
+    monkeypatch.setenv('CLIAR_CACHE_DIR', str(tmp_path))
+
+    host = Host(lazy=lazy, plugins='host.plugins')
+
+    assert host.run(['status']) == 'OK'
+
+    host.run(['deploy', 'prod'])
+    host.run(['audit', 'logs', '--since', '3'])
+    assert capsys.readouterr().out == 'Deploying to prod\nLogs since 3\n'
+
+    assert sorted(host._subclis) == ['audit', 'deploy']
+    assert not host._placeholders
+    assert 'deploy' not in Host(lazy=lazy)._subcli_classes
@@ -0,0 +1,14 @@
+from cliar import Cliar
+
+
+class Host(Cliar):
+    '''Host CLI with plugins.'''
+
+    def status(self):
+        '''Show the status.'''
+
+        print('OK')
+
+
+if __name__ == '__main__':
+    Host(lazy=True, plugins='host.plugins').parse()
@@ -0,0 +1,15 @@
+import sys
+
+from cliar import Cliar
+
+
+print(f'Importing {__name__}', file=sys.stderr)
+
+
+class Audit(Cliar):
+    '''Audit the logs.'''
+
+    def logs(self, since: int = 0):
+        '''Show the logs.'''
+
+        print(f'Logs since {since}')
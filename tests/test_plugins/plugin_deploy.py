@@ -0,0 +1,13 @@
+import sys
+
+from cliar import Cliar
+
+
+print(f'Importing {__name__}', file=sys.stderr)
+
+
+class Deploy(Cliar):
+    '''Deploy the app.'''
+
+    def _root(self, env: str):
+        print(f'Deploying to {env}')
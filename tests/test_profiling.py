@@ -0,0 +1,103 @@
+import json
+import pstats
+from os import environ
+from subprocess import run, PIPE
+
+
+def _run(datadir, *args, **env):
+    return run(
+        ['python', str(datadir/'profiled.py'), *args],
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True,
+        env={**environ, **env}
+    )
+
+
+def test_disabled(datadir):
+    result = _run(datadir, 'modules')
+
+    assert result.stdout == 'False\n'
+    assert result.stderr == ''
+
+
+def test_report(datadir):
+    result = _run(datadir, 'add', '1', '2', '--cliar-profile')
+
+    assert result.returncode == 0
+    assert result.stdout == '3\n'
+
+    phases = [line.split()[0] for line in result.stderr.splitlines()[1:]]
+
+    assert result.stderr.startswith('cliar profile, ms:\n')
+    assert phases == [
+        'startup', 'init', 'introspection', 'parse', 'conversion', 'handler', 'total'
+    ]
+
+    result = _run(datadir, 'wait', CLIAR_PROFILE='memory')
+
+    assert result.stdout == 'Done\n'
+
+    handler_time = float(result.stderr.splitlines()[6].split()[1])
+
+    assert handler_time >= 50
+    assert 'handler memory peak, KiB:' in result.stderr
+
+
+def test_json_output(datadir, tmp_path):
+    report_path = tmp_path/'profile.json'
+
+    result = _run(
+        datadir,
+        '--cliar-profile=cprofile,memory',
+        f'--cliar-profile-output={report_path}',
+        'add', '1', '2'
+    )
+
+    assert result.stdout == '3\n'
+    assert result.stderr == ''
+
+    report = json.loads(report_path.read_text())
+
+    assert list(report['phases_ms']) == ['init', 'introspection', 'parse', 'conversion', 'handler']
+    assert report['total_ms'] >= report['phases_ms']['handler']
+    assert report['handler_peak_memory'] > 0
+
+
+def test_output_flag_forms(datadir, tmp_path):
+    report_path = tmp_path/'profile.json'
+
+    result = _run(datadir, 'add', '1', '2', '--cliar-profile-output', str(report_path))
+
+    assert result.returncode == 0
+    assert result.stdout == '3\n'
+    assert result.stderr == ''
+    assert 'handler' in json.loads(report_path.read_text())['phases_ms']
+
+    result = _run(datadir, 'add', '1', '2', '--cliar-profile-output')
+
+    assert result.returncode == 2
+    assert 'argument --cliar-profile-output: expected a path' in result.stderr
+
+    result = _run(datadir, 'add', '1', '2', '--cliar-profiles')
+
+    assert result.returncode == 2
+    assert 'cliar profile' not in result.stderr
+
+
+def test_pstats_output(datadir, tmp_path):
+    stats_path = tmp_path/'profile.pstats'
+
+    result = _run(
+        datadir,
+        'add', '1', '2',
+        CLIAR_PROFILE='cprofile',
+        CLIAR_PROFILE_OUTPUT=str(stats_path)
+    )
+
+    assert result.stdout == '3\n'
+    assert 'handler' in result.stderr
+
+    stats = pstats.Stats(str(stats_path))
+
+    assert any(function[2] == 'add' for function in stats.stats)
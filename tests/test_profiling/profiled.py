@@ -0,0 +1,23 @@
+import asyncio
+import sys
+from typing import List
+
+from cliar import Cliar
+
+
+class Profiled(Cliar):
+    '''Profiled CLI.'''
+
+    def add(self, numbers: List[int]):
+        print(sum(numbers))
+
+    def modules(self):
+        print('cliar.profiling' in sys.modules)
+
+    async def wait(self):
+        await asyncio.sleep(0.05)
+        print('Done')
+
+
+if __name__ == '__main__':
+    Profiled().parse()
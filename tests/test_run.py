@@ -0,0 +1,103 @@
+import asyncio
+from typing import List
+
+from pytest import raises
+
+from cliar import Cliar, ParseError, HelpRequested
+
+
+class Remote(Cliar):
+    '''Remote help.'''
+
+    def add(self, name: str):
+        return f'Adding remote {name} as {self.global_args["user"]}'
+
+
+class Calc(Cliar):
+    '''Calculator.'''
+
+    remote = Remote
+
+    def _root(self, user=''):
+        return NotImplemented
+
+    def add(self, x: int, y: int):
+        '''Add two numbers.'''
+
+        return x + y
+
+    def summ(self, numbers: List[float]):
+        return sum(numbers)
+
+    async def wait(self, value: int):
+        await asyncio.sleep(0)
+        return value
+
+    def fail(self):
+        raise RuntimeError('Failed')
+
+
+def test_result():
+    calc = Calc()
+
+    assert calc.run(['add', '1', '2']) == 3
+    assert calc.run(('summ', '1', '2.5')) == 3.5
+    assert calc.run(['wait', '42']) == 42
+    assert calc.run(['--user', 'me', 'remote', 'add', 'origin']) == 'Adding remote origin as me'
+
+
+def test_parse_error(capsys):
+    calc = Calc()
+
+    with raises(ParseError) as excinfo:
+        calc.run(['add', '1', 'x'])
+
+    assert excinfo.value.message == "argument y: invalid int value: 'x'"
+    assert excinfo.value.status == 2
+    assert excinfo.value.usage.startswith('usage: ')
+    assert str(excinfo.value).endswith("add: error: argument y: invalid int value: 'x'")
+
+    with raises(ParseError) as excinfo:
+        calc.run(['bogus'])
+
+    assert "invalid choice: 'bogus'" in excinfo.value.message
+
+    assert capsys.readouterr() == ('', '')
+
+
+def test_help(capsys):
+    calc = Calc()
+
+    with raises(HelpRequested) as excinfo:
+        calc.run(['add', '-h'])
+
+    assert excinfo.value.status == 0
+    assert 'Add two numbers.' in excinfo.value.help
+
+    with raises(HelpRequested) as excinfo:
+        calc.run([])
+
+    assert 'Calculator.' in excinfo.value.help
+
+    assert capsys.readouterr() == ('', '')
+
+
+def test_handler_error():
+    with raises(RuntimeError):
+        Calc().run(['fail'])
+
+
+def test_repeated_runs():
+    for calc in (Calc(), Calc(lazy=True), Calc(engine='fast')):
+        with raises(ParseError):
+            calc.run(['add'])
+
+        parser = calc._parser
+
+        for index in range(1000):
+            assert calc.run(['add', str(index), '1']) == index + 1
+
+            with raises(ParseError):
+                calc.run(['add', str(index)])
+
+        assert calc._parser is parser
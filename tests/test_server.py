@@ -0,0 +1,113 @@
+from os import environ
+from subprocess import Popen, run, PIPE
+from time import monotonic, sleep
+
+from pytest import fixture
+
+
+def _call(socket_path, args, **kwargs):
+    return run(
+        ['python', '-m', 'cliar.client', str(socket_path), *args],
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True,
+        **kwargs
+    )
+
+
+def _start(datadir, socket_path, idle_timeout):
+    server = Popen(['python', str(datadir/'served.py'), str(socket_path), str(idle_timeout)])
+
+    deadline = monotonic() + 10
+
+    while not socket_path.exists() and monotonic() < deadline:
+        sleep(0.05)
+
+    return server
+
+
+@fixture
+def socket_path(datadir, tmp_path):
+    socket_path = tmp_path/'served.sock'
+    server = _start(datadir, socket_path, 60)
+
+    yield socket_path
+
+    server.terminate()
+    server.wait()
+
+
+def test_output(socket_path):
+    result = _call(socket_path, ['add', '1', '2'])
+    assert result.returncode == 0
+    assert result.stdout.strip() == '3'
+
+    result = _call(socket_path, ['add', '-h'])
+    assert result.returncode == 0
+    assert 'Add two numbers.' in result.stdout
+
+
+def test_errors(socket_path):
+    result = _call(socket_path, ['add', '1', 'two'])
+    assert result.returncode == 2
+    assert "invalid int value: 'two'" in result.stderr
+
+    result = _call(socket_path, ['fail'])
+    assert result.returncode == 1
+    assert 'RuntimeError: Failed' in result.stderr
+
+    result = _call(socket_path, ['quit', '3'])
+    assert result.returncode == 3
+
+    assert _call(socket_path, ['add', '2', '2']).stdout.strip() == '4'
+
+
+def test_stdin(socket_path):
+    result = _call(socket_path, ['upper'], input='hello\nworld\n')
+    assert result.stdout == 'HELLO\nWORLD\n'
+
+
+def test_context(socket_path, tmp_path):
+    result = _call(socket_path, ['where'], cwd=str(tmp_path), env={**environ, 'SERVED_NAME': 'test'})
+    assert result.stdout.split('\n')[:2] == [str(tmp_path), 'test']
+
+
+def test_concurrency(socket_path):
+    start = monotonic()
+
+    clients = [
+        Popen(['python', '-m', 'cliar.client', str(socket_path), 'nap', '1'], stdout=PIPE)
+        for _ in range(3)
+    ]
+
+    for client in clients:
+        assert client.communicate()[0].strip() == b'awake'
+
+    assert monotonic() - start < 2.5
+
+
+def test_shared_config(socket_path):
+    clients = [
+        Popen(['python', '-m', 'cliar.client', str(socket_path), 'hooks', '0.5'], stdout=PIPE)
+        for _ in range(3)
+    ]
+
+    assert [client.communicate()[0].strip() for client in clients] == [b'1'] * 3
+
+
+def test_client_imports():
+    result = run(
+        ['python', '-c', 'import sys, cliar.client; print("cliar.cliar" in sys.modules)'],
+        stdout=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.stdout.strip() == 'False'
+
+
+def test_idle_timeout(datadir, tmp_path):
+    socket_path = tmp_path/'idle.sock'
+    server = _start(datadir, socket_path, 0.5)
+
+    assert server.wait(timeout=10) == 0
+    assert not socket_path.exists()
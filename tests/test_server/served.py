@@ -0,0 +1,41 @@
+import sys
+from time import sleep
+from os import getcwd, environ
+
+from cliar import Cliar
+
+
+class Served(Cliar):
+    '''Served CLI.'''
+
+    def add(self, x: int, y: int):
+        '''Add two numbers.'''
+
+        print(x + y)
+
+    def upper(self):
+        print(sys.stdin.read().upper(), end='')
+
+    def where(self):
+        print(getcwd())
+        print(environ.get('SERVED_NAME', ''))
+
+    def nap(self, seconds: float):
+        sleep(seconds)
+        print('awake')
+
+    def hooks(self, seconds: float):
+        sleep(seconds)
+        print(len(self._hooks.get('before_handler', [])))
+
+    def fail(self):
+        raise RuntimeError('Failed')
+
+    def quit(self, code: int):
+        exit(code)
+
+
+if __name__ == '__main__':
+    served = Served()
+    served.add_hook('before_handler', lambda invocation: None)
+    served.serve(sys.argv[1], idle_timeout=float(sys.argv[2]))
@@ -0,0 +1,81 @@
+from subprocess import run, PIPE
+
+from cliar.shell import _Shell
+
+
+def _shell(datadir, lines):
+    return run(
+        ['python', str(datadir/'shelled.py'), '--shell'],
+        input='\n'.join(lines) + '\n',
+        stdout=PIPE,
+        stderr=PIPE,
+        universal_newlines=True
+    )
+
+
+def test_commands(datadir):
+    result = _shell(datadir, ['add 1 2', '', 'connect db.local', 'add two 2', 'status'])
+
+    assert result.returncode == 2
+    assert result.stdout.splitlines() == ['3', 'Connected to db.local']
+    assert "invalid int value: 'two'" in result.stderr
+
+
+def test_exit_status(datadir):
+    assert _shell(datadir, ['add 1 2', 'status']).returncode == 0
+    assert _shell(datadir, ['add 1 2', 'add "1 2']).returncode == 2
+    assert _shell(datadir, ['add two 2', 'add 1 2']).returncode == 2
+
+
+def test_navigation(datadir):
+    result = _shell(
+        datadir,
+        [
+            'cd remote',
+            'add origin',
+            '--user john',
+            'cd ..',
+            'remote add upstream',
+            '--user jane',
+            'remote add fork',
+            'cd /remote',
+            'show',
+            'cd nowhere',
+            'exit',
+            'add 1 1'
+        ]
+    )
+
+    assert result.stdout.splitlines() == [
+        'Adding remote origin as guest',
+        'Adding remote upstream as guest',
+        'Adding remote fork as jane',
+        'Remotes'
+    ]
+    assert "no nested CLI 'nowhere'" in result.stderr
+    assert "invalid choice: 'john'" in result.stderr
+
+
+def test_help(datadir):
+    result = _shell(datadir, ['help', 'help add'])
+
+    assert 'commands:' in result.stdout
+    assert 'Add two numbers.' in result.stdout
+
+
+def test_completions(datadir, monkeypatch):
+    monkeypatch.syspath_prepend(str(datadir))
+
+    from shelled import Shelled
+
+    shell = _Shell(Shelled())
+
+    assert shell.get_completions('') == sorted(
+        ['add', 'cd', 'connect', 'exit', 'help', 'quit', 'remote', 'status']
+    )
+    assert shell.get_completions('co') == ['connect']
+    assert shell.get_completions('--') == ['--user']
+    assert shell.get_completions('remote ') == ['add', 'show']
+    assert shell.get_completions('remote add origin --') == ['--verbose']
+    assert shell.get_completions('cd r') == ['remote']
+    assert shell.get_completions('help remote s') == ['show']
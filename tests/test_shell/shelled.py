@@ -0,0 +1,35 @@
+from cliar import Cliar
+
+
+class Remote(Cliar):
+    '''Remote.'''
+
+    def add(self, name: str, verbose=False):
+        print(f'Adding remote {name} as {self.global_args["user"]}')
+
+    def show(self):
+        print('Remotes')
+
+
+class Shelled(Cliar):
+    '''Shelled CLI.'''
+
+    remote = Remote
+
+    def _root(self, user='guest'):
+        return NotImplemented
+
+    def connect(self, host: str):
+        self.connection = host
+
+    def status(self):
+        print(f'Connected to {getattr(self, "connection", None)}')
+
+    def add(self, x: int, y: int):
+        '''Add two numbers.'''
+
+        print(x + y)
+
+
+if __name__ == '__main__':
+    Shelled().parse()
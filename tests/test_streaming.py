@@ -0,0 +1,45 @@
+from subprocess import run, PIPE
+
+
+def _run(command):
+    return run(command, shell=True, stdout=PIPE, stderr=PIPE, universal_newlines=True)
+
+
+def test_generator(datadir):
+    result = _run(f'python {datadir/"streamed.py"} count 3')
+
+    assert result.stdout == '0\n1\n2\n'
+    assert result.stderr == 'closed\n'
+
+
+def test_async_generator(datadir):
+    assert _run(f'python {datadir/"streamed.py"} acount 3').stdout == '0\n1\n2\n'
+
+
+def test_framing(datadir):
+    assert _run(f'python {datadir/"streamed.py"} names').stdout == 'Alice\0Bob\0'
+    assert _run(f'python {datadir/"streamed.py"} rows').stdout == "('a', 1)\n('b', 2)\n"
+    assert _run(f'python {datadir/"streamed.py"} items').stdout == ''
+
+
+def test_broken_pipe(datadir):
+    result = _run(f'python {datadir/"streamed.py"} count 100000000 | head -n 3')
+
+    assert result.stdout == '0\n1\n2\n'
+    assert result.stderr == 'closed\n'
+
+
+def test_batch(datadir):
+    result = run(
+        ['python', str(datadir/'streamed.py'), '--batch', '-'],
+        input='count 2\n{"command": "acount", "args": {"n": 2}}\nacount 1\n',
+        stdout=PIPE,
+        universal_newlines=True
+    )
+
+    assert result.stdout.splitlines() == [
+        '0',
+        '1',
+        '{"status": 0, "result": [0, 1], "stdout": "", "stderr": ""}',
+        '0'
+    ]
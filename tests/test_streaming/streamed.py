@@ -0,0 +1,36 @@
+import asyncio
+import sys
+
+from cliar import Cliar, set_stream_options
+
+
+class Streamed(Cliar):
+    '''Streamed CLI.'''
+
+    def count(self, n: int):
+        try:
+            for number in range(n):
+                yield number
+
+        finally:
+            print('closed', file=sys.stderr)
+
+    async def acount(self, n: int):
+        for number in range(n):
+            await asyncio.sleep(0)
+            yield number
+
+    @set_stream_options(separator='\0')
+    def names(self):
+        yield 'Alice'
+        yield b'Bob'
+
+    def rows(self):
+        return iter([('a', 1), ('b', 2)])
+
+    def items(self):
+        return ['not', 'streamed']
+
+
+if __name__ == '__main__':
+    Streamed().parse()